@@ -0,0 +1,27 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from ...core.config import settings
+from ...core_ai.warmup import warmup_state
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/live")
+async def liveness():
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness():
+    # Load balancers should only route users here once models are warm
+    content = warmup_state.to_dict()
+    if settings.SERVICE_ROLE == "api":
+        # Vision runs in the worker: REST stays in rotation, but an
+        # unreachable or cold worker is reported as degraded
+        from .vision_proxy import worker_readiness
+
+        content["vision"] = await worker_readiness()
+        if not content["vision"].get("ready"):
+            content["status"] = "degraded"
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if warmup_state.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=content,
+    )
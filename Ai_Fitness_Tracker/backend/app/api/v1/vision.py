@@ -0,0 +1,279 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+import json
+from typing import Optional
+import time
+import asyncio
+from ...core.config import settings
+from ...core_ai.executor import configure_vision_executor, shutdown_vision_executor, run_in_vision_executor
+from ...core_ai.processing.batch_classifier import configure_batching
+from ...core_ai.warmup import run_warmup, warmup_state
+from ...core_ai.pose.model_tiers import tier_for_complexity
+from ...core_ai.pose.frame_mailbox import LatestFrameMailbox
+
+router = APIRouter()
+
+# The pose stack (OpenCV, MediaPipe, NumPy) is built on first use, by the
+# warm-up or the first vision socket, so API-only workers never import it
+pose_inference_service = None
+pose_session_pool = None
+_pose_import_failed = False
+
+def get_pose_services():
+    """Returns (inference service, session pool), building them on the first call; (None, None) if unavailable."""
+    global pose_inference_service, pose_session_pool, _pose_import_failed
+    if pose_inference_service is None and not _pose_import_failed:
+        try:
+            from ...core_ai.pose.inference_service import PoseInferenceService, PoseSessionPool
+            pose_inference_service = PoseInferenceService(
+                num_workers=settings.POSE_INFERENCE_WORKERS,
+                max_queue_size=settings.POSE_INFERENCE_QUEUE_SIZE
+            )
+            pose_session_pool = PoseSessionPool(max_sessions=settings.POSE_SESSION_POOL_SIZE)
+        except ImportError:
+            print("Warning: Pose detector import failed.")
+            _pose_import_failed = True
+        except Exception as e:
+            print(f"Warning: Pose detector error: {e}")
+            _pose_import_failed = True
+    return pose_inference_service, pose_session_pool
+
+def close_pose_services():
+    if pose_inference_service is not None:
+        pose_inference_service.stop()
+        pose_session_pool.close()
+
+async def start_vision_services(app):
+    """Startup for any process that serves /ws/vision: the full API (SERVICE_ROLE=all) or the vision worker."""
+    configure_vision_executor(settings.VISION_EXECUTOR, settings.VISION_EXECUTOR_WORKERS)
+    configure_batching(settings.ML_BATCH_MAX_SIZE, settings.ML_BATCH_MAX_WAIT_MS)
+    # Warm-up is what loads the vision stack in this worker; with it off the
+    # pose models are only imported when the first vision socket connects
+    pose_session_pool = get_pose_services()[1] if settings.MODEL_WARMUP else None
+    if pose_session_pool is not None:
+        # Runs in the background; /health/ready reports 503 until it's done
+        app.state.warmup_task = asyncio.create_task(run_warmup(
+            pose_session_pool,
+            sessions=settings.WARMUP_POSE_SESSIONS,
+            frames=settings.WARMUP_FRAMES,
+            strict=settings.MODEL_STRICT_CHECKSUMS
+        ))
+    else:
+        warmup_state.finish("skipped")
+
+async def stop_vision_services(app):
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    close_pose_services()
+    shutdown_vision_executor()
+
+@router.get("/vision/stats")
+async def vision_stats():
+    if pose_inference_service is None:
+        return {"status": "unavailable" if _pose_import_failed else "not_loaded"}
+    return {"status": "ok", **pose_inference_service.stats(), **pose_session_pool.stats()}
+
+async def _open_vision_socket(websocket, pose_session_pool, protocol, vision_complexity):
+    """
+    Accepts a vision socket, acquires its pooled pose session and starts
+    reading frames into a LatestFrameMailbox. Returns (binary, pose_session,
+    mailbox, reader task), or None after telling the client the pool is busy.
+    """
+    from ...core_ai.pose.inference_service import SessionPoolExhausted
+    from ...core_ai.pose.frame_codec import BINARY_SUBPROTOCOL
+
+    # Binary mode is negotiated at connect time, either through the
+    # websocket subprotocol or ?protocol=binary; JSON stays the default.
+    offered = BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    binary = offered or protocol == "binary"
+    await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if offered else None)
+    try:
+        # Pooled sessions are reused, so the tier ceiling is set per connection
+        # from the routine step's vision_complexity (BASIC/NORMAL/ADVANCED)
+        pose_session = await pose_session_pool.acquire(
+            timeout=settings.POSE_SESSION_ACQUIRE_TIMEOUT,
+            max_tier=tier_for_complexity(vision_complexity)
+        )
+    except SessionPoolExhausted:
+        await websocket.send_text(json.dumps({"type": "busy"}))
+        await websocket.close(code=1013)
+        return None
+
+    # Reader keeps only the newest frame; inference always takes that one
+    mailbox = LatestFrameMailbox()
+
+    async def read_frames():
+        try:
+            while True:
+                if binary:
+                    mailbox.put(await websocket.receive_bytes())
+                else:
+                    message = json.loads(await websocket.receive_text())
+                    if message["type"] == "frame":
+                        mailbox.put(message["image"])
+        finally:
+            mailbox.close()
+
+    return binary, pose_session, mailbox, asyncio.create_task(read_frames())
+
+@router.websocket("/ws/vision")
+async def vision_websocket_endpoint(
+    websocket: WebSocket,
+    protocol: str = Query("json"),
+    vision_complexity: Optional[str] = Query(None)
+):
+    pose_inference_service, pose_session_pool = get_pose_services()
+    if pose_inference_service is None:
+        await websocket.accept()
+        await websocket.close(code=1011)
+        return
+    from ...core_ai.pose.inference_service import InferenceQueueFull
+    from ...core_ai.pose.frame_codec import decode_frame_bytes, decode_frame_base64, pack_landmarks
+
+    opened = await _open_vision_socket(websocket, pose_session_pool, protocol, vision_complexity)
+    if opened is None:
+        return
+    binary, pose_session, mailbox, reader = opened
+    frame_id = 0
+    processed = 0
+    try:
+        while True:
+            payload = await mailbox.get()
+            if payload is None:
+                break
+
+            # Decode only the frame that is actually inferred, off the event loop
+            decode = decode_frame_bytes if binary else decode_frame_base64
+            frame = await run_in_vision_executor(decode, payload)
+            if frame is None:
+                continue
+
+            # Detect pose (queued onto the shared worker pool)
+            frame_id += 1
+            started = time.perf_counter()
+            try:
+                landmarks = await pose_inference_service.submit(frame, pose_session)
+            except InferenceQueueFull:
+                await websocket.send_text(json.dumps({"type": "busy"}))
+                continue
+            latency_ms = (time.perf_counter() - started) * 1000
+            processed += 1
+
+            if binary:
+                await websocket.send_bytes(
+                    pack_landmarks(landmarks, frame_id, latency_ms, processed, mailbox.dropped)
+                )
+                continue
+
+            stats = {"processed": processed, "dropped": mailbox.dropped, "tier": pose_session.tiers.tier}
+            if landmarks:
+                # Convert landmarks to serializable format
+                serializable_landmarks = []
+                for lm in landmarks:
+                    serializable_landmarks.append({
+                        "x": float(lm.x),
+                        "y": float(lm.y),
+                        "z": float(lm.z),
+                        "visibility": float(lm.visibility)
+                    })
+                
+                await websocket.send_text(json.dumps({
+                    "type": "landmarks",
+                    "landmarks": serializable_landmarks,
+                    "latency_ms": round(latency_ms, 1),
+                    "stats": stats
+                }))
+            else:
+                await websocket.send_text(json.dumps({
+                    "type": "no_pose",
+                    "stats": stats
+                }))
+
+        # Mailbox closed: surface why the reader stopped
+        await reader
+    except WebSocketDisconnect:
+        print("Vision WS disconnected")
+    except Exception as e:
+        print(f"Vision WS error: {e}")
+        await websocket.close()
+    finally:
+        reader.cancel()
+        pose_session_pool.release(pose_session)
+
+@router.websocket("/ws/session")
+async def session_websocket_endpoint(
+    websocket: WebSocket,
+    exercise: str = Query("squat"),
+    protocol: str = Query("json"),
+    vision_complexity: Optional[str] = Query(None)
+):
+    """
+    Full server-side Pipeline per connection: clients send frames (as on
+    /ws/vision) and get back only what changed in reps, score, class and
+    feedback, instead of 33 landmarks to post-process themselves.
+    """
+    pose_inference_service, pose_session_pool = get_pose_services()
+    if pose_inference_service is None:
+        await websocket.accept()
+        await websocket.close(code=1011)
+        return
+    from ...core_ai.pipeline import Pipeline
+    from ...core_ai.processing.result_delta import ResultDelta
+    from ...core_ai.pose.inference_service import InferenceQueueFull
+    from ...core_ai.pose.frame_codec import decode_frame_bytes, decode_frame_base64
+
+    # Detection uses the pooled session, so the Pipeline never builds a
+    # detector of its own; it keeps this user's smoothing, temporal and
+    # rep state
+    pipeline = Pipeline(
+        exercise, vision_complexity,
+        llm_feedback=settings.SESSION_LLM_FEEDBACK, debug=False
+    )
+    # No classifier: no label/confidence or "Model not loaded" in the updates
+    delta = ResultDelta(ml=pipeline.ml is not None)
+
+    opened = await _open_vision_socket(websocket, pose_session_pool, protocol, vision_complexity)
+    if opened is None:
+        return
+    binary, pose_session, mailbox, reader = opened
+    frame_id = 0
+    try:
+        await websocket.send_text(json.dumps({"type": "session", "exercise": pipeline.spec.name}))
+        while True:
+            payload = await mailbox.get()
+            if payload is None:
+                break
+
+            decode = decode_frame_bytes if binary else decode_frame_base64
+            frame = await run_in_vision_executor(decode, payload)
+            if frame is None:
+                continue
+
+            frame_id += 1
+            timestamp = time.perf_counter()
+            try:
+                landmarks = await pose_inference_service.submit(frame, pose_session)
+            except InferenceQueueFull:
+                await websocket.send_text(json.dumps({"type": "busy"}))
+                continue
+
+            if landmarks:
+                _, result = await pipeline.process_landmarks(landmarks, timestamp)
+                changes = delta.update(result)
+            else:
+                changes = delta.no_pose()
+
+            # Nothing new for the client: send nothing
+            if changes:
+                await websocket.send_text(json.dumps({"type": "update", "frame": frame_id, **changes}))
+
+        await reader
+    except WebSocketDisconnect:
+        print("Session WS disconnected")
+    except Exception as e:
+        print(f"Session WS error: {e}")
+        await websocket.close()
+    finally:
+        reader.cancel()
+        pipeline.close()
+        pose_session_pool.release(pose_session)
@@ -0,0 +1,115 @@
+from fastapi import APIRouter, WebSocket
+import asyncio
+import httpx
+from ...core.config import settings
+
+# Used instead of the vision router when SERVICE_ROLE=api: /ws/vision and
+# /ws/session are relayed to a vision worker (app.vision_worker), so
+# inference never runs in the REST process. VISION_WORKER_URL is either
+# "ws://host:port" or "unix:/path/to/vision.sock".
+router = APIRouter()
+
+def _worker_target():
+    """Returns (unix socket path or None, base ws:// URL) for VISION_WORKER_URL."""
+    url = settings.VISION_WORKER_URL.rstrip("/")
+    if url.startswith("unix:"):
+        return url[len("unix:"):], "ws://vision-worker"
+    return None, url
+
+def _connect_worker(websocket: WebSocket):
+    import websockets
+
+    socket_path, base = _worker_target()
+    uri = f"{base}{websocket.url.path}"
+    if websocket.url.query:
+        uri += f"?{websocket.url.query}"
+    subprotocols = websocket.scope.get("subprotocols") or None
+    # Frames can be large JPEGs; the worker enforces its own limits
+    if socket_path:
+        return websockets.unix_connect(socket_path, uri, subprotocols=subprotocols, max_size=None)
+    return websockets.connect(uri, subprotocols=subprotocols, max_size=None)
+
+def _worker_client():
+    """Returns (httpx client, base http:// URL) for the worker's HTTP routes."""
+    socket_path, base = _worker_target()
+    transport = httpx.AsyncHTTPTransport(uds=socket_path) if socket_path else None
+    url = base.replace("ws://", "http://", 1).replace("wss://", "https://", 1)
+    return httpx.AsyncClient(transport=transport, timeout=2.0), url
+
+async def worker_readiness():
+    """The worker's /health/ready body, with "ready": False if it can't be reached."""
+    client, url = _worker_client()
+    try:
+        async with client:
+            response = await client.get(f"{url}/health/ready")
+            return {"worker": settings.VISION_WORKER_URL, **response.json()}
+    except (httpx.HTTPError, ValueError) as e:
+        return {"status": "unavailable", "ready": False, "worker": settings.VISION_WORKER_URL, "error": str(e)}
+
+@router.get("/vision/stats")
+async def vision_stats_proxy():
+    client, url = _worker_client()
+    try:
+        async with client:
+            response = await client.get(f"{url}{settings.API_V1_STR}/vision/stats")
+            return {"worker": settings.VISION_WORKER_URL, **response.json()}
+    except (httpx.HTTPError, ValueError) as e:
+        return {"status": "unavailable", "worker": settings.VISION_WORKER_URL, "error": str(e)}
+
+@router.websocket("/ws/vision")
+@router.websocket("/ws/session")
+async def vision_websocket_proxy(websocket: WebSocket):
+    try:
+        upstream = await _connect_worker(websocket)
+    except Exception as e:
+        print(f"Vision worker unreachable at {settings.VISION_WORKER_URL}: {e}")
+        await websocket.accept()
+        await websocket.close(code=1011)
+        return
+
+    # Accept with whatever the worker negotiated, so binary clients still
+    # see the binary subprotocol
+    await websocket.accept(subprotocol=upstream.subprotocol)
+
+    async def client_to_worker():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                await upstream.send(message["bytes"])
+            elif message.get("text") is not None:
+                await upstream.send(message["text"])
+
+    async def worker_to_client():
+        async for message in upstream:
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_text(message)
+
+    relays = [asyncio.create_task(client_to_worker()), asyncio.create_task(worker_to_client())]
+    try:
+        done, pending = await asyncio.wait(relays, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        client_relay, worker_relay = relays
+        code = None
+        if worker_relay in done:
+            # Worker hung up (e.g. 1013 busy): pass its close code on; a dropped connection is 1011
+            code = 1011 if worker_relay.exception() else upstream.close_code or 1000
+        elif client_relay.exception():
+            # Sending to the worker failed while the client is still connected
+            print(f"Vision proxy upstream error: {client_relay.exception()}")
+            code = 1011
+        if code is not None:
+            try:
+                await websocket.close(code=code)
+            except RuntimeError:
+                pass
+    except Exception as e:
+        print(f"Vision proxy error: {e}")
+    finally:
+        for task in relays:
+            task.cancel()
+        await upstream.close()
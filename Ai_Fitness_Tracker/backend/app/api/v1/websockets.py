@@ -4,30 +4,16 @@ import json
 from jose import jwt, JWTError
 from ...core.config import settings
 from typing import Optional
-import base64
-import numpy as np
-import cv2
-try:
-    from ...core_ai.pose.pose_detector import detect_pose
-except ImportError:
-    print("Warning: Pose detector import failed.")
-    def detect_pose(*args, **kwargs):
-        return None, None, None
-except Exception as e:
-    print(f"Warning: Pose detector error: {e}")
-    def detect_pose(*args, **kwargs):
-        return None, None, None
-
 from ...db.database import AsyncSessionLocal
 from ...db.models import User, ChatMessage
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from .voice_commands import get_user_context, format_fitness_summary
 try:
-    from ...core_ai.coach.llm_coach import client as llm_client
+    from ...core_ai.coach.llm_coach import get_client as get_llm_client
     from ...core_ai.coach.llm_coach import PERSONA_PROMPTS
 except Exception:
-    llm_client = None
+    get_llm_client = lambda: None
     PERSONA_PROMPTS = {}
 
 router = APIRouter()
@@ -144,49 +130,6 @@ async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = Query(
         except WebSocketDisconnect:
             await manager.disconnect(websocket, user_id_str)
 
-@router.websocket("/ws/vision")
-async def vision_websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    try:
-        while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
-            
-            if message["type"] == "frame":
-                # Decode base64 image
-                img_data = base64.b64decode(message["image"])
-                nparr = np.frombuffer(img_data, np.uint8)
-                frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                
-                if frame is not None:
-                    # Detect pose
-                    _, landmarks = detect_pose(frame)
-                    
-                    if landmarks:
-                        # Convert landmarks to serializable format
-                        serializable_landmarks = []
-                        for lm in landmarks:
-                            serializable_landmarks.append({
-                                "x": float(lm.x),
-                                "y": float(lm.y),
-                                "z": float(lm.z),
-                                "visibility": float(lm.visibility)
-                            })
-                        
-                        await websocket.send_text(json.dumps({
-                            "type": "landmarks",
-                            "landmarks": serializable_landmarks
-                        }))
-                    else:
-                        await websocket.send_text(json.dumps({
-                            "type": "no_pose"
-                        }))
-    except WebSocketDisconnect:
-        print("Vision WS disconnected")
-    except Exception as e:
-        print(f"Vision WS error: {e}")
-        await websocket.close()
-
 @router.websocket("/ws/coach")
 async def coach_websocket_endpoint(websocket: WebSocket, token: Optional[str] = Query(None)):
     await websocket.accept()
@@ -214,6 +157,7 @@ async def coach_websocket_endpoint(websocket: WebSocket, token: Optional[str] =
                     session_context = message.get("session_context") or {}
                     trend_data = await get_user_context(user, db)
                     summary = format_fitness_summary(user, trend_data, session_context)
+                    llm_client = get_llm_client()
                     if llm_client:
                         try:
                             system_prompt = PERSONA_PROMPTS.get(persona, PERSONA_PROMPTS.get("general", "You are a concise coach."))
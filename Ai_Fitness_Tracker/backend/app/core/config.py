@@ -33,6 +33,29 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: Optional[str] = None
     REDIS_DB: int = 0
     
+    # Process role: "all" serves REST and vision in one process; "api" serves
+    # REST only and relays /ws/vision to the worker at VISION_WORKER_URL
+    # (ws://host:port or unix:/path.sock), started with app.vision_worker
+    SERVICE_ROLE: str = "all"  # all, api
+    VISION_WORKER_URL: str = "ws://127.0.0.1:8001"
+
+    # Vision / Pose Inference
+    POSE_INFERENCE_WORKERS: int = 2
+    POSE_INFERENCE_QUEUE_SIZE: int = 64
+    POSE_SESSION_POOL_SIZE: int = 20
+    POSE_SESSION_ACQUIRE_TIMEOUT: float = 5.0
+    VISION_EXECUTOR: str = "thread"  # thread, process
+    VISION_EXECUTOR_WORKERS: int = 4
+    ML_BATCH_MAX_SIZE: int = 32
+    ML_BATCH_MAX_WAIT_MS: float = 2.0
+    MODEL_WARMUP: bool = True
+    MODEL_STRICT_CHECKSUMS: bool = False
+    WARMUP_POSE_SESSIONS: int = 2
+    WARMUP_FRAMES: int = 30
+    # Groq coaching tips on /ws/session updates (one request per low-score
+    # stretch, per connection)
+    SESSION_LLM_FEEDBACK: bool = False
+    
     # Platform
     WEB_BASE_URL: str = "http://localhost:3000"
     
@@ -0,0 +1,19 @@
+import time
+from collections import deque
+
+
+class FpsMeter:
+    """Rate of tick() calls over a sliding window of recent ticks; safe to read from another thread."""
+
+    def __init__(self, window=30):
+        self._ticks = deque(maxlen=window)
+
+    def tick(self, timestamp=None):
+        self._ticks.append(time.perf_counter() if timestamp is None else timestamp)
+
+    @property
+    def fps(self):
+        ticks = tuple(self._ticks)
+        if len(ticks) < 2 or ticks[-1] <= ticks[0]:
+            return 0.0
+        return (len(ticks) - 1) / (ticks[-1] - ticks[0])
@@ -1,4 +1,8 @@
 import cv2
+import threading
+import time
+
+from camera.fps import FpsMeter
 
 
 def open_camera(cam_index=0):
@@ -27,4 +31,62 @@ def read_frame(cap):
 
 
 def release_camera(cap):
-    cap.release()
\ No newline at end of file
+    cap.release()
+
+class FrameGrabber(threading.Thread):
+    """
+    Capture stage: reads the camera as fast as it delivers into a
+    single-slot buffer that always holds the newest frame. Consumers never
+    wait on camera I/O and never process a stale frame; frames nobody took
+    in time are overwritten and counted in `dropped`.
+    """
+
+    def __init__(self, cap):
+        super().__init__(name="capture", daemon=True)
+        self.cap = cap
+        self.running = True
+        self.fps = FpsMeter()
+        self.captured = 0
+        self.taken = 0
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._timestamp = None
+        self._seq = 0
+
+    def run(self):
+        while self.running:
+            ret, frame = read_frame(self.cap)
+            if not ret:
+                break
+            timestamp = time.time()
+            with self._cond:
+                self._frame, self._timestamp = frame, timestamp
+                self._seq += 1
+                self._cond.notify_all()
+            self.captured += 1
+            self.fps.tick()
+
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+
+    def latest(self, after_seq=0, timeout=0.5):
+        """
+        Waits for a frame newer than `after_seq` and returns
+        (seq, frame, capture timestamp), or None on timeout or once the
+        camera has stopped.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > after_seq or not self.running, timeout)
+            if self._seq <= after_seq:
+                return None
+            self.taken += 1
+            return self._seq, self._frame, self._timestamp
+
+    @property
+    def dropped(self):
+        return max(0, self.captured - self.taken)
+
+    def stop(self):
+        self.running = False
@@ -14,7 +14,7 @@ class FitnessTracker:
         self.calories_burned = 0.0
         self.posture_history = []
         self.rep_times = []
-        self.last_rep_time = time.time()
+        self.last_rep_time = None
         
         # MET values (Metabolic Equivalent of Task)
         self.met_values = {
@@ -44,9 +44,12 @@ class FitnessTracker:
         # Let's just store it for the summary.
         self.calories_burned = adjusted_met * weight_kg * duration_hr
 
-    def update_reps(self, reps):
+    def update_reps(self, reps, timestamp=None):
+        """`timestamp`: the frame's capture time, so rep speed follows the video rather than processing delays."""
+        now = time.time() if timestamp is None else timestamp
+        if self.last_rep_time is None:
+            self.last_rep_time = now
         if reps > self.reps:
-            now = time.time()
             self.rep_times.append(now - self.last_rep_time)
             self.last_rep_time = now
         self.reps = reps
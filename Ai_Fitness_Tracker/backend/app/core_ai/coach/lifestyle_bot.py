@@ -1,16 +1,10 @@
 import os
-from groq import AsyncGroq
 from dotenv import load_dotenv
 from typing import AsyncGenerator, Dict, Any
 
-load_dotenv()
+from .llm_coach import get_client
 
-# Initialize Groq client
-try:
-    client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
-except Exception as e:
-    print(f"Groq client init error: {e}")
-    client = None
+load_dotenv()
 
 SYSTEM_PROMPT_TEMPLATE = """
 You are an expert AI Fitness & Lifestyle Coach dedicated to helping {username} achieve their peak potential.
@@ -38,6 +32,7 @@ If the user asks a question unrelated to fitness/health, politely steer them bac
 import json
 
 async def generate_diet_plan(user_context: Dict[str, Any], stats_summary: Dict[str, Any]) -> Dict[str, str]:
+    client = get_client()
     if not client:
         return {
             "pre_workout": "Not available",
@@ -102,6 +97,7 @@ async def generate_diet_plan(user_context: Dict[str, Any], stats_summary: Dict[s
         }
 
 async def ask_lifestyle_bot(user_context: Dict[str, Any], user_message: str) -> str:
+    client = get_client()
     if not client:
         return "I'm currently offline (API Key missing). Please check system configuration."
 
@@ -177,6 +173,7 @@ RULES:
 """
 
 async def ask_coach_formatted(user_context: Dict[str, Any], preds: Dict[str, Any], user_query: str) -> str:
+    client = get_client()
     if not client:
         # Minimal deterministic fallback in case LLM is unavailable
         water_l = preds.get("water", 2.5)
@@ -1,11 +1,22 @@
 import os
-from groq import AsyncGroq
 from dotenv import load_dotenv
 from typing import AsyncGenerator
 
 load_dotenv()
 _API_KEY = os.getenv("GROQ_API_KEY")
-client = AsyncGroq(api_key=_API_KEY) if _API_KEY else None
+_client = None
+
+
+def get_client():
+    """
+    Shared AsyncGroq client, created on first use so API workers that
+    never call the LLM don't import the SDK. None without GROQ_API_KEY.
+    """
+    global _client
+    if _client is None and _API_KEY:
+        from groq import AsyncGroq
+        _client = AsyncGroq(api_key=_API_KEY)
+    return _client
 
 SYSTEM_PROMPT = """
 You are an elite AI fitness coach specializing in biomechanics and long-term performance.
@@ -44,6 +55,7 @@ Rules:
 }
 
 async def ask_llm_async(fitness_summary: str, user_message: str = None, persona: str = "general") -> str:
+    client = get_client()
     if client is None:
         raise RuntimeError("Missing GROQ_API_KEY for LLM client")
     system_prompt = PERSONA_PROMPTS.get(persona, SYSTEM_PROMPT)
@@ -65,6 +77,7 @@ async def ask_llm_async(fitness_summary: str, user_message: str = None, persona:
     return response.choices[0].message.content.strip()
 
 async def stream_llm_async(fitness_summary: str, user_message: str = None, persona: str = "general") -> AsyncGenerator[str, None]:
+    client = get_client()
     if client is None:
         raise RuntimeError("Missing GROQ_API_KEY for LLM client")
     system_prompt = PERSONA_PROMPTS.get(persona, SYSTEM_PROMPT)
@@ -0,0 +1,73 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# "thread": MediaPipe and OpenCV release the GIL, so threads overlap well and
+#           callers can hand their own PoseDetectorSession to the worker.
+# "process": full isolation for decode and drawing; arguments and results
+#            are pickled. Tracked detection still runs on a thread, since a
+#            PoseDetectorSession can't cross into a worker process.
+EXECUTOR_KINDS = ("thread", "process")
+
+_executor = None
+_thread_executor = None
+_kind = "thread"
+_workers = None
+
+
+def configure_vision_executor(kind="thread", workers=None):
+    """Selects the executor used for CPU-bound vision work (decode, detect, draw)."""
+    global _kind, _workers
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f"Unknown vision executor '{kind}', expected one of {EXECUTOR_KINDS}")
+
+    shutdown_vision_executor()
+    _kind = kind
+    _workers = workers
+
+
+def get_vision_executor():
+    global _executor
+    if _executor is None:
+        workers = _workers or min(4, os.cpu_count() or 1)
+        if _kind == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vision")
+    return _executor
+
+
+def get_thread_executor():
+    """
+    Executor for vision work that must stay in this process (live models,
+    per-user sessions): the vision executor in thread mode, otherwise a
+    separate thread pool of the same size.
+    """
+    global _thread_executor
+    if _kind == "thread":
+        return get_vision_executor()
+    if _thread_executor is None:
+        workers = _workers or min(4, os.cpu_count() or 1)
+        _thread_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vision-local")
+    return _thread_executor
+
+
+def vision_executor_is_process():
+    return _kind == "process"
+
+
+async def run_in_vision_executor(fn, *args, **kwargs):
+    """Runs fn(*args, **kwargs) on the vision executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_vision_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_vision_executor():
+    global _executor, _thread_executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    if _thread_executor is not None:
+        _thread_executor.shutdown(wait=False, cancel_futures=True)
+        _thread_executor = None
@@ -0,0 +1,138 @@
+import math
+from collections import deque
+
+
+def _smoothing_factor(dt, cutoff):
+    # Same form as OneEuroFilter.smoothing_factor
+    r = 2 * math.pi * cutoff * dt
+    return r / (r + 1)
+
+
+class RollingStats:
+    """
+    Mean and standard deviation of the values from the last `window`
+    seconds, on the samples' own timestamps, so the window means the same
+    at any frame rate. Running sums keep each push O(1) amortized.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = deque()
+        self.first_at = None
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value, timestamp):
+        if self.first_at is None:
+            self.first_at = timestamp
+        self.samples.append((timestamp, value))
+        self.total += value
+        self.total_sq += value * value
+        while timestamp - self.samples[0][0] > self.window:
+            _, old = self.samples.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+    @property
+    def count(self):
+        return len(self.samples)
+
+    @property
+    def full(self):
+        """True once samples have been pushed for a whole window."""
+        return self.first_at is not None and self.samples[-1][0] - self.first_at >= self.window
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        if not self.count:
+            return 0.0
+        mean = self.mean
+        # Running sums can drift a hair below zero
+        return math.sqrt(max(self.total_sq / self.count - mean * mean, 0.0))
+
+
+class BreathRateEstimator:
+    """
+    Breaths per minute from a breathing signal (e.g. mean shoulder height),
+    one sample at a time, on the samples' real timestamps.
+
+    Each sample goes through a band-pass for the breathing band
+    (`low_hz`..`high_hz`, 6-42 breaths/min by default): a one-pole
+    high-pass, which takes out the running mean and slow posture drift,
+    then a one-pole low-pass against landmark jitter. A breath is counted
+    at each upward zero crossing of the result, with hysteresis scaled to
+    the signal's running amplitude (never below `min_amplitude`, half a
+    pixel at 480p). Crossing times are kept for the last `window` seconds
+    and the rate is taken from their spacing. Every update is O(1).
+    """
+
+    def __init__(self, window=30.0, low_hz=0.1, high_hz=0.7, hysteresis=0.3,
+                 min_amplitude=1e-3, max_gap=1.0):
+        self.window = window
+        self.low_hz = low_hz
+        self.high_hz = high_hz
+        self.hysteresis = hysteresis
+        self.min_amplitude = min_amplitude
+        # A longer gap between samples (person left the frame) restarts the filters
+        self.max_gap = max_gap
+        # Upward crossings at most `high_hz` apart, so it never grows past this
+        self.crossings = deque(maxlen=int(window * high_hz) + 2)
+        self.reset()
+
+    def reset(self):
+        self.t_prev = None
+        self.x_prev = 0.0
+        self.high_pass = 0.0
+        self.band = 0.0
+        self.amplitude = 0.0
+        self.phase = 0  # 1 above +threshold, -1 below -threshold
+        self.crossings.clear()
+
+    def update(self, value, timestamp):
+        """Adds one sample; returns the breath rate (per minute) or None while unknown."""
+        if self.t_prev is not None and timestamp <= self.t_prev:
+            return self.rate(timestamp)  # duplicate frame
+        if self.t_prev is None or timestamp - self.t_prev > self.max_gap:
+            self.reset()
+            self.t_prev = timestamp
+            self.x_prev = value
+            return None
+
+        dt = timestamp - self.t_prev
+        self.t_prev = timestamp
+
+        # High-pass: y[n] = a * (y[n-1] + x[n] - x[n-1]), a = RC / (RC + dt)
+        a = 1 - _smoothing_factor(dt, self.low_hz)
+        self.high_pass = a * (self.high_pass + value - self.x_prev)
+        self.x_prev = value
+        self.band += _smoothing_factor(dt, self.high_hz) * (self.high_pass - self.band)
+
+        # Amplitude follows the band over a few breaths
+        self.amplitude += _smoothing_factor(dt, self.low_hz) * (abs(self.band) - self.amplitude)
+        threshold = max(self.hysteresis * self.amplitude, self.min_amplitude)
+
+        if self.band > threshold:
+            # Faster than `high_hz` is jitter, not a breath
+            if self.phase == -1 and (not self.crossings or timestamp - self.crossings[-1] >= 1 / self.high_hz):
+                self.crossings.append(timestamp)
+            self.phase = 1
+        elif self.band < -threshold:
+            self.phase = -1
+
+        while self.crossings and timestamp - self.crossings[0] > self.window:
+            self.crossings.popleft()
+        return self.rate(timestamp)
+
+    def rate(self, now=None):
+        if len(self.crossings) < 2:
+            return None
+        first, last = self.crossings[0], self.crossings[-1]
+        period = (last - first) / (len(self.crossings) - 1)
+        # No breath for well over a period: the last rate no longer holds
+        if now is not None and now - last > 2 * period:
+            return None
+        return 60.0 / period
@@ -1,17 +1,15 @@
-import time
-
-
 class ChairPose:
     def __init__(self):
         self.start_time = None
         self.time_held = 0.0
         self.feedback = {}
 
-    def update(self, knee_angle):
+    def update(self, pose):
         """
-        Counts time only when chair pose is correct
+        Counts time only when chair pose is correct, on the frame timestamps
         """
         self.feedback = {}
+        knee_angle = pose.angle("left_knee")
         correct = 90 <= knee_angle <= 120
         color = (0, 255, 0) if correct else (0, 0, 255)
         
@@ -20,10 +18,15 @@ class ChairPose:
 
         if correct:
             if self.start_time is None:
-                self.start_time = time.time()
+                self.start_time = pose.timestamp
             else:
-                self.time_held = time.time() - self.start_time
+                self.time_held = pose.timestamp - self.start_time
         else:
             self.start_time = None  # pause timer
 
         return round(self.time_held, 1), self.feedback
+
+    def resume(self, timestamp):
+        """Carries the current hold on after a pause instead of counting the time away."""
+        if self.start_time is not None:
+            self.start_time = timestamp - self.time_held
@@ -4,8 +4,12 @@ class HighKnees:
         self.last_leg = None
         self.feedback = {}
 
-    def update(self, left_knee_up, right_knee_up):
+    def update(self, pose):
         self.feedback = {}
+        # Image y grows downwards: a knee above its hip has the smaller y
+        left_knee_up = pose.y(25) < pose.y(23)
+        right_knee_up = pose.y(26) < pose.y(24)
+
         # Left Knee: 25, Right Knee: 26
         self.feedback[25] = (0, 255, 0) if left_knee_up else (0, 0, 255)
         self.feedback[26] = (0, 255, 0) if right_knee_up else (0, 0, 255)
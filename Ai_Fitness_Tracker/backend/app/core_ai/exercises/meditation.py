@@ -1,27 +1,34 @@
-import time
-import numpy as np
+from .breath_rate import BreathRateEstimator, RollingStats
+
+# Posture score change per second while very still / breathing normally /
+# moving (the old per-frame steps at 30fps)
+STILL_GAIN = 15.0
+CALM_GAIN = 3.0
+MOVING_LOSS = 30.0
+# Longer gaps between frames (person left, paused) count as this much
+MAX_STEP = 0.5
+
 
 class Meditation:
     def __init__(self):
         self.start_time = None
-        self.last_breath_time = time.time()
         self.breath_count = 0
-        self.shoulder_y_history = []
+        # Mean shoulder height drives the breath estimate; its spread over
+        # the last 1/3s measures stillness
+        self.breath = BreathRateEstimator()
+        self.stillness = RollingStats(1 / 3)
+        self.last_timestamp = None
         self.posture_score = 100
         self.is_meditating = False
         self.feedback = "Sit comfortably and breathe deeply."
 
-    def update(self, landmarks):
+    def update(self, pose):
         """
-        landmarks: List of (x, y, z, visibility) from MediaPipe Pose
+        pose: PoseFrame for the current frame
         """
-        # Landmarks: 11 (Left Shoulder), 12 (Right Shoulder), 0 (Nose)
-        l_shoulder = landmarks[11]
-        r_shoulder = landmarks[12]
-        nose = landmarks[0]
-        
+        # Landmarks: 11 (Left Shoulder), 12 (Right Shoulder)
         # 1. Check if user is present and reasonably centered
-        if l_shoulder.visibility < 0.5 or r_shoulder.visibility < 0.5:
+        if pose.visibility(11) < 0.5 or pose.visibility(12) < 0.5:
             self.feedback = "Please sit in front of the camera."
             return {
                 "is_meditating": False,
@@ -31,44 +38,36 @@ class Meditation:
             }
 
         # 2. Track Shoulder Movement for Breath Detection
-        avg_shoulder_y = (l_shoulder.y + r_shoulder.y) / 2
-        self.shoulder_y_history.append(avg_shoulder_y)
-        if len(self.shoulder_y_history) > 30 * 5: # Keep last 5 seconds (assuming ~30fps)
-            self.shoulder_y_history.pop(0)
+        avg_shoulder_y = (pose.y(11) + pose.y(12)) / 2
+        self.stillness.push(avg_shoulder_y, pose.timestamp)
 
-        # Simple Breath Detection: Count peaks in shoulder vertical movement
-        # This is a very rough approximation using variance/oscillation
-        if len(self.shoulder_y_history) > 30:
-            y_data = np.array(self.shoulder_y_history)
-            # Normalize
-            y_data = y_data - np.mean(y_data)
-            # Count zero crossings (approx breaths)
-            zero_crossings = np.where(np.diff(np.sign(y_data)))[0]
-            # Each full cycle (inhale+exhale) has 2 crossings. 
-            # Breath rate per minute = (crossings / 2) * (60 / duration_in_seconds)
-            duration = len(self.shoulder_y_history) / 30 # seconds
-            if duration > 0:
-                self.breath_count = int((len(zero_crossings) / 2) * (60 / duration))
+        # Band-passed shoulder rise and fall, one breath per upward crossing,
+        # timed on the frame timestamps rather than an assumed 30fps
+        rate = self.breath.update(avg_shoulder_y, pose.timestamp)
+        self.breath_count = int(round(rate)) if rate is not None else 0
 
         # 3. Posture/Stillness Check
-        # Calculate standard deviation of nose position to measure stillness
-        if not self.start_time:
-            self.start_time = time.time()
+        # Standard deviation of shoulder height measures stillness
+        if self.start_time is None:
+            self.start_time = pose.timestamp
             
-        current_time = time.time()
-        session_duration = current_time - self.start_time
+        session_duration = pose.timestamp - self.start_time
+
+        # Score moves per second of video, not per frame
+        dt = 0.0 if self.last_timestamp is None else min(max(pose.timestamp - self.last_timestamp, 0.0), MAX_STEP)
+        self.last_timestamp = pose.timestamp
 
         # If movement is low, score is high
-        if len(self.shoulder_y_history) > 10:
-            movement = np.std(self.shoulder_y_history[-10:]) # last ~0.3s
+        if self.stillness.full:
+            movement = self.stillness.std # last ~0.3s
             if movement < 0.002: # Very still
-                self.posture_score = min(100, self.posture_score + 0.5)
+                self.posture_score = min(100, self.posture_score + STILL_GAIN * dt)
                 self.feedback = "Excellent stillness. Focus on your breath."
             elif movement < 0.01: # Normal breathing
-                self.posture_score = min(100, self.posture_score + 0.1)
+                self.posture_score = min(100, self.posture_score + CALM_GAIN * dt)
                 self.feedback = "Good. Breathe deeply."
             else: # Moving too much
-                self.posture_score = max(0, self.posture_score - 1.0)
+                self.posture_score = max(0, self.posture_score - MOVING_LOSS * dt)
                 self.feedback = "Try to remain still."
 
         return {
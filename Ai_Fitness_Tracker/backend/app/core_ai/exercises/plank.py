@@ -1,13 +1,12 @@
-import time
-
 class Plank:
     def __init__(self):
         self.start_time = None
         self.time_held = 0.0
         self.feedback = {}
 
-    def update(self, body_angle):
+    def update(self, pose):
         self.feedback = {}
+        body_angle = pose.angle("left_body")
         # body_angle ≈ shoulder–hip–ankle
         # Shoulder: 11, Hip: 23, Ankle: 27
         
@@ -17,10 +16,15 @@ class Plank:
 
         if body_angle > 160:
             if self.start_time is None:
-                self.start_time = time.time()
+                self.start_time = pose.timestamp
             else:
-                self.time_held = time.time() - self.start_time
+                self.time_held = pose.timestamp - self.start_time
         else:
             self.start_time = None
 
         return round(self.time_held, 1), self.feedback
+
+    def resume(self, timestamp):
+        """Carries the current hold on after a pause instead of counting the time away."""
+        if self.start_time is not None:
+            self.start_time = timestamp - self.time_held
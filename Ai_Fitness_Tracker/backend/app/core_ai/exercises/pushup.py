@@ -4,8 +4,9 @@ class PushUp:
         self.reps = 0
         self.feedback = {}
 
-    def update(self, elbow_angle):
+    def update(self, pose):
         self.feedback = {}
+        elbow_angle = pose.angle("left_elbow")
         color = (0, 255, 0)
         
         # Shoulder: 11, Elbow: 13, Wrist: 15
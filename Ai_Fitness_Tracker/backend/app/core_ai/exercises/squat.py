@@ -4,10 +4,12 @@ class Squat:
         self.reps = 0
         self.feedback = {} # landmark_idx: (B, G, R)
 
-    def update(self, knee_angle):
+    def update(self, pose):
         """
-        Updates squat count based on knee angle
+        Updates squat count based on the left knee angle of a PoseFrame
         """
+        knee_angle = pose.angle("left_knee")
+
         # MediaPipe indices for squat: 
         # Left Hip: 23, Left Knee: 25, Left Ankle: 27
         # Right Hip: 24, Right Knee: 26, Right Ankle: 28
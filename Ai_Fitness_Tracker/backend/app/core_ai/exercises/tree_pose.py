@@ -1,19 +1,19 @@
-import time
-
 class TreePose:
     def __init__(self):
         self.start_time = None
         self.time_held = 0.0
         self.feedback = {}
 
-    def update(self, standing_leg_angle, raised_leg_angle):
+    def update(self, pose):
         self.feedback = {}
-        
+        standing_leg_angle = pose.angle("left_knee")
+        raised_leg_angle = pose.angle(23, 25, 15)
+
         standing_correct = standing_leg_angle > 160
         raised_correct = raised_leg_angle < 120
         
         # Standing leg: Left Hip: 23, Left Knee: 25, Left Ankle: 27
-        # Raised leg (approx): Left Hip: 23, Left Knee: 25, Left Wrist: 15 (as used in main.py)
+        # Raised leg (approx): Left Hip: 23, Left Knee: 25, Left Wrist: 15
         
         standing_color = (0, 255, 0) if standing_correct else (0, 0, 255)
         raised_color = (0, 255, 0) if raised_correct else (0, 0, 255)
@@ -24,10 +24,15 @@ class TreePose:
 
         if standing_correct and raised_correct:
             if self.start_time is None:
-                self.start_time = time.time()
+                self.start_time = pose.timestamp
             else:
-                self.time_held = time.time() - self.start_time
+                self.time_held = pose.timestamp - self.start_time
         else:
             self.start_time = None
 
         return round(self.time_held, 1), self.feedback
+
+    def resume(self, timestamp):
+        """Carries the current hold on after a pause instead of counting the time away."""
+        if self.start_time is not None:
+            self.start_time = timestamp - self.time_held
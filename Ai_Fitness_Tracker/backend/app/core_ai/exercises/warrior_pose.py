@@ -1,14 +1,13 @@
-import numpy as np
-
 class WarriorPose:
     def __init__(self):
         self.hold_time = 0
-        self.correct_pose_time = 0
+        self.correct_pose_time = 0.0
+        self.last_correct_at = None
         self.feedback = {}
 
-    def update(self, landmarks):
+    def update(self, pose):
         """
-        Check Warrior II Pose.
+        Check Warrior II Pose from a PoseFrame.
         Landmarks:
         11-12: Shoulders
         23-24: Hips
@@ -20,26 +19,17 @@ class WarriorPose:
         self.feedback = {}
 
         # 1. Check if arms are horizontal
-        l_sh = landmarks[11]
-        r_sh = landmarks[12]
-        l_el = landmarks[13]
-        r_el = landmarks[14]
-        l_wr = landmarks[15]
-        r_wr = landmarks[16]
-
         arms_ok = True
         # Y-diff between shoulder and wrist should be small
-        if abs(l_sh.y - l_wr.y) > 0.1 or abs(r_sh.y - r_wr.y) > 0.1:
+        if abs(pose.y(11) - pose.y(15)) > 0.1 or abs(pose.y(12) - pose.y(16)) > 0.1:
             arms_ok = False
             self.feedback["arms"] = "Raise arms to shoulder height"
         else:
             self.feedback["arms"] = "Good arm position"
 
         # 2. Check leg stance (wide stance)
-        l_ank = landmarks[27]
-        r_ank = landmarks[28]
-        # Calculate distance between ankles
-        stance_width = np.sqrt((l_ank.x - r_ank.x)**2 + (l_ank.y - r_ank.y)**2)
+        # Distance between ankles
+        stance_width = pose.distance(27, 28)
         
         legs_ok = True
         if stance_width < 0.4: # Arbitrary threshold based on normalized coordinates
@@ -48,23 +38,10 @@ class WarriorPose:
         else:
             self.feedback["legs"] = "Good stance"
 
-        # 3. Check front knee bend (Assuming left knee is front for simplicity or detect which is forward)
-        # Determine which knee is "front" by checking x-coordinate relative to hips
-        l_hip = landmarks[23]
-        r_hip = landmarks[24]
-        l_knee = landmarks[25]
-        r_knee = landmarks[26]
-
-        # Calculate knee angle: Hip -> Knee -> Ankle
-        def get_angle(a, b, c):
-            ba = np.array([a.x - b.x, a.y - b.y])
-            bc = np.array([c.x - b.x, c.y - b.y])
-            cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-            angle = np.arccos(cosine_angle)
-            return np.degrees(angle)
-
-        l_knee_angle = get_angle(l_hip, l_knee, l_ank)
-        r_knee_angle = get_angle(r_hip, r_knee, r_ank)
+        # 3. Check front knee bend: Hip -> Knee -> Ankle on both sides,
+        # since either leg may be the front one
+        l_knee_angle = pose.angle("left_knee")
+        r_knee_angle = pose.angle("right_knee")
 
         # In Warrior II, one knee is ~90 degrees, other is ~180
         knee_ok = False
@@ -77,11 +54,21 @@ class WarriorPose:
 
         is_correct = arms_ok and legs_ok and knee_ok
         
+        # Seconds between consecutive correct frames, from the frame timestamps
         if is_correct:
-            self.correct_pose_time += 1 # Frame count
+            if self.last_correct_at is not None:
+                self.correct_pose_time += pose.timestamp - self.last_correct_at
+            self.last_correct_at = pose.timestamp
+        else:
+            self.last_correct_at = None
+        self.hold_time = self.correct_pose_time
         
         return {
             "is_correct": is_correct,
-            "hold_time": self.correct_pose_time / 30, # Assuming 30fps
+            "hold_time": self.hold_time,
             "feedback": self.feedback
         }
+
+    def resume(self, timestamp):
+        """After a pause the hold continues from the next correct frame."""
+        self.last_correct_at = None
@@ -10,12 +10,15 @@ import requests
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Camera & Pose
-from camera.webcam import open_camera, read_frame, release_camera
-from pose.pose_detector import detect_pose, PoseLandmark
-from pose.angle_calculator import calculate_angle
+from camera.webcam import open_camera, release_camera, FrameGrabber
+from camera.fps import FpsMeter
+from pose.pose_detector import detect_landmarks, draw_landmarks
+from pose.pose_frame import PoseFrame
 
 # Utils
-from utils.helpers import draw_text_with_bg, check_lighting, check_visibility, detect_fatigue, get_wifi_strength
+from utils.helpers import draw_text_with_bg, check_lighting, check_visibility, detect_fatigue
+from system_health import SystemHealthSampler
+from replay import ReplayRecorder, PAUSE_AFTER
 
 # Exercises
 from exercises.squat import Squat
@@ -49,6 +52,201 @@ logging.basicConfig(
     format='%(asctime)s %(levelname)s %(message)s'
 )
 
+
+# -------------------------
+# Inference stage
+# -------------------------
+class InferenceResult:
+    """What the render loop needs to show one processed frame."""
+
+    __slots__ = ['seq', 'frame', 'landmarks', 'joint_colors', 'overlays']
+
+    def __init__(self, seq, frame, landmarks, joint_colors, overlays):
+        self.seq = seq
+        self.frame = frame
+        self.landmarks = landmarks
+        self.joint_colors = joint_colors
+        # draw_text_with_bg() argument tuples, drawn in order
+        self.overlays = overlays
+
+
+class InferenceWorker(threading.Thread):
+    """
+    Inference stage: takes the newest captured frame, runs pose detection,
+    the zone checks and the exercise logic, and publishes the outcome as
+    `result` for the render loop. Exercise and tracker state are only
+    touched from this thread (and the voice thread, as before).
+    """
+
+    def __init__(self, grabber, exercise, tracker, session, health):
+        super().__init__(name="inference", daemon=True)
+        self.grabber = grabber
+        self.health = health
+        self.exercise = exercise
+        self.tracker = tracker
+        self.session = session
+        self.fps = FpsMeter()
+        self.result = None
+
+        self.start_time = time.time()
+        self.angle_sum = 0
+        self.angle_count = 0
+
+        self.joint_colors = {}
+        self.out_of_frame_start = None
+        self.is_paused = False
+        self.last_pose = None
+        # Frame time of the first analyzed pose; calories run on frame
+        # timestamps like the holds, so a replay gives the same numbers
+        self.first_pose_at = None
+        # Poses analyzed this session, saved as the workout's replay_data
+        self.replay = None
+
+    def run(self):
+        seq = 0
+        while self.session.running:
+            latest = self.grabber.latest(seq)
+            if latest is None:
+                if not self.grabber.running:
+                    break
+                continue
+            seq, frame, captured_at = latest
+
+            self.result = self.process(seq, frame, captured_at)
+            self.fps.tick()
+
+    def process(self, seq, frame, captured_at):
+        overlays = []
+        exercise = self.exercise
+
+        # Wi-Fi Signal Awareness (Feature 1): sampled in the background
+        wifi_strength = self.health.snapshot.wifi_strength
+        if wifi_strength is not None and wifi_strength < 40:
+            overlays.append((f"WEAK WI-FI: {wifi_strength}%", 30, 280, 0.6, (255, 255, 255), (0, 0, 150)))
+
+        landmarks = detect_landmarks(frame)
+
+        # Smart Workout Zone Detection
+        lighting_ok = check_lighting(frame)
+        if not lighting_ok:
+            overlays.append(("LOW LIGHTING - Turn on a light", 30, 120, 0.7, (255, 255, 255), (0, 0, 255)))
+
+        if landmarks:
+            visible_ok, msg = check_visibility(landmarks)
+            if not visible_ok:
+                overlays.append((f"ZONE WARNING: {msg}", 30, 160, 0.7, (255, 255, 255), (0, 0, 255)))
+
+            is_fatigued, f_score = detect_fatigue(landmarks)
+            if is_fatigued:
+                overlays.append(("FATIGUE DETECTED - Take a breath!", 30, 200, 0.7, (255, 255, 255), (0, 165, 255)))
+
+        if not landmarks:
+            if self.out_of_frame_start is None:
+                self.out_of_frame_start = captured_at
+
+            elapsed = captured_at - self.out_of_frame_start
+            if elapsed > PAUSE_AFTER: # 2 seconds out of frame
+                self.is_paused = True
+
+            if self.is_paused:
+                overlays.append(("PAUSED - User out of frame", 30, 40, 0.7, (255, 255, 255), (0, 0, 255)))
+        else:
+            self.out_of_frame_start = None
+            if self.is_paused:
+                self.is_paused = False
+                # Time-based exercises carry the hold on, not counting the pause
+                if hasattr(exercise, 'resume'):
+                    exercise.resume(captured_at)
+
+            h, w, _ = frame.shape
+            self.joint_colors = {} # Reset for next frame
+
+            if not self.is_paused:
+                self.analyze(PoseFrame(landmarks, w, h, captured_at), overlays)
+
+        return InferenceResult(seq, frame, landmarks, self.joint_colors, overlays)
+
+    def analyze(self, pose, overlays):
+        exercise = self.exercise
+        tracker = self.tracker
+
+        # Calculate Intensity (Feature 6)
+        intensity = 1.0
+        if self.last_pose is not None:
+            # Measure movement of hips and shoulders
+            displacement = 0
+            for i in [11, 12, 23, 24]:
+                displacement += ((pose.x(i) - self.last_pose.x(i))**2 + (pose.y(i) - self.last_pose.y(i))**2)**0.5
+            
+            # Normalize displacement to intensity (heuristic)
+            intensity = 1.0 + min(displacement * 10, 2.0)
+        
+        self.last_pose = pose
+
+        if self.replay is None:
+            self.replay = ReplayRecorder(ACTIVE_EXERCISE, pose.width, pose.height)
+        self.replay.add(pose)
+        
+        # Update Calories
+        if self.first_pose_at is None:
+            self.first_pose_at = pose.timestamp
+        current_duration = pose.timestamp - self.first_pose_at
+        tracker.update_calories(current_duration, intensity)
+        overlays.append((f"Kcal: {round(tracker.calories_burned, 2)}", 30, 240, 0.7, (255, 255, 255), (100, 50, 0)))
+
+        # -------------------------
+        # EXERCISE LOGIC
+        # -------------------------
+        # Every exercise reads its angles from the shared PoseFrame, which
+        # computes each one at most once per frame.
+
+        # SQUAT
+        if ACTIVE_EXERCISE == "squat":
+            reps, self.joint_colors = exercise.update(pose)
+            tracker.update_reps(reps, pose.timestamp)
+            
+            # Update posture history
+            knee_angle = pose.angle("left_knee")
+            is_good = 70 <= knee_angle <= 160
+            tracker.update_posture_score(1.0 if is_good else 0.0)
+            
+            overlays.append((f"Squats: {reps}", 30, 80))
+
+            self.angle_sum += knee_angle
+            self.angle_count += 1
+
+        # PUSHUPS
+        elif ACTIVE_EXERCISE == "pushup":
+            reps, self.joint_colors = exercise.update(pose)
+            tracker.update_reps(reps, pose.timestamp)
+            tracker.update_posture_score(1.0 if pose.angle("left_elbow") > 60 else 0.0)
+            overlays.append((f"Push-ups: {reps}", 30, 80))
+
+        # HIGH KNEES
+        elif ACTIVE_EXERCISE == "high_knees":
+            reps, self.joint_colors = exercise.update(pose)
+            tracker.update_reps(reps, pose.timestamp)
+            overlays.append((f"High Knees: {reps}", 30, 80))
+
+        # PLANK (TIME BASED)
+        elif ACTIVE_EXERCISE == "plank":
+            seconds, self.joint_colors = exercise.update(pose)
+            tracker.update_time(seconds)
+            overlays.append((f"Plank: {seconds}s", 30, 80))
+
+        # CHAIR POSE (TIME BASED)
+        elif ACTIVE_EXERCISE == "chair_pose":
+            seconds, self.joint_colors = exercise.update(pose)
+            tracker.update_time(seconds)
+            overlays.append((f"Chair Pose: {seconds}s", 30, 80))
+
+        # TREE POSE (TIME BASED)
+        elif ACTIVE_EXERCISE == "tree_pose":
+            seconds, self.joint_colors = exercise.update(pose)
+            tracker.update_time(seconds)
+            overlays.append((f"Tree Pose: {seconds}s", 30, 80))
+
+
 def main():
     logging.info(f"Starting {ACTIVE_EXERCISE} session...")
     print(f"Starting {ACTIVE_EXERCISE} session...")
@@ -101,188 +299,62 @@ def main():
         daemon=True
     ).start()
 
-    start_time = time.time()
-    angle_sum = 0
-    angle_count = 0
-
     # -------------------------
-    # CV Loop
+    # Capture -> Inference -> Render
     # -------------------------
-    joint_colors = {}
-    out_of_frame_start = None
-    is_paused = False
-    last_landmarks = None
-    last_wifi_check = 0
-    wifi_strength = 100
-    
-    while session.running:
-        loop_start = time.time()
-        ret, frame = read_frame(cap)
-        if not ret:
-            break
-
-        # Wi-Fi Signal Awareness (Feature 1)
-        if time.time() - last_wifi_check > 5.0:
-            wifi_strength = get_wifi_strength()
-            last_wifi_check = time.time()
-        
-        if wifi_strength is not None and wifi_strength < 40:
-            draw_text_with_bg(frame, f"WEAK WI-FI: {wifi_strength}%", 30, 280, 0.6, (255, 255, 255), (0, 0, 150))
-
-        frame, landmarks = detect_pose(frame, joint_colors=joint_colors)
-
-        # Smart Workout Zone Detection
-        lighting_ok = check_lighting(frame)
-        if not lighting_ok:
-            draw_text_with_bg(frame, "LOW LIGHTING - Turn on a light", 30, 120, 0.7, (255, 255, 255), (0, 0, 255))
-            
-        if landmarks:
-            visible_ok, msg = check_visibility(landmarks)
-            if not visible_ok:
-                draw_text_with_bg(frame, f"ZONE WARNING: {msg}", 30, 160, 0.7, (255, 255, 255), (0, 0, 255))
-            
-            is_fatigued, f_score = detect_fatigue(landmarks)
-            if is_fatigued:
-                draw_text_with_bg(frame, "FATIGUE DETECTED - Take a breath!", 30, 200, 0.7, (255, 255, 255), (0, 165, 255))
-
-        if not landmarks:
-            if out_of_frame_start is None:
-                out_of_frame_start = time.time()
-            
-            elapsed = time.time() - out_of_frame_start
-            if elapsed > 2.0: # 2 seconds out of frame
-                is_paused = True
-            
-            if is_paused:
-                draw_text_with_bg(frame, "PAUSED - User out of frame", 30, 40, 0.7, (255, 255, 255), (0, 0, 255))
-        else:
-            out_of_frame_start = None
-            if is_paused:
-                is_paused = False
-                # Reset start time for time-based exercises to account for the pause
-                if hasattr(exercise, 'start_time') and exercise.start_time is not None:
-                    exercise.start_time = time.time() - exercise.time_held
-
-            h, w, _ = frame.shape
-            joint_colors = {} # Reset for next frame
-
-            if not is_paused:
-                def pt(lm):
-                    return int(lm.x * w), int(lm.y * h)
-
-                left_hip = landmarks[PoseLandmark.LEFT_HIP.value]
-                left_knee = landmarks[PoseLandmark.LEFT_KNEE.value]
-                left_ankle = landmarks[PoseLandmark.LEFT_ANKLE.value]
-
-                left_shoulder = landmarks[PoseLandmark.LEFT_SHOULDER.value]
-                left_elbow = landmarks[PoseLandmark.LEFT_ELBOW.value]
-                left_wrist = landmarks[PoseLandmark.LEFT_WRIST.value]
-
-                # Calculate Intensity (Feature 6)
-                intensity = 1.0
-                if last_landmarks:
-                    # Measure movement of hips and shoulders
-                    displacement = 0
-                    for i in [11, 12, 23, 24]:
-                        curr = landmarks[i]
-                        prev = last_landmarks[i]
-                        displacement += ((curr.x - prev.x)**2 + (curr.y - prev.y)**2)**0.5
-                    
-                    # Normalize displacement to intensity (heuristic)
-                    intensity = 1.0 + min(displacement * 10, 2.0)
-                
-                last_landmarks = landmarks
-                
-                # Update Calories
-                current_duration = time.time() - start_time
-                tracker.update_calories(current_duration, intensity)
-                draw_text_with_bg(frame, f"Kcal: {round(tracker.calories_burned, 2)}", 30, 240, 0.7, (255, 255, 255), (100, 50, 0))
-
-                # -------------------------
-                # EXERCISE LOGIC
-                # -------------------------
-
-                # SQUAT
-                if ACTIVE_EXERCISE == "squat":
-                    knee_angle = calculate_angle(
-                        pt(left_hip), pt(left_knee), pt(left_ankle)
-                    )
-                    reps, joint_colors = exercise.update(knee_angle)
-                    tracker.update_reps(reps)
-                    
-                    # Update posture history
-                    is_good = 70 <= knee_angle <= 160
-                    tracker.update_posture_score(1.0 if is_good else 0.0)
-                    
-                    draw_text_with_bg(frame, f"Squats: {reps}", 30, 80)
-
-                    angle_sum += knee_angle
-                    angle_count += 1
-
-                # PUSHUPS
-                elif ACTIVE_EXERCISE == "pushup":
-                    elbow_angle = calculate_angle(
-                        pt(left_shoulder), pt(left_elbow), pt(left_wrist)
-                    )
-                    reps, joint_colors = exercise.update(elbow_angle)
-                    tracker.update_reps(reps)
-                    tracker.update_posture_score(1.0 if elbow_angle > 60 else 0.0)
-                    draw_text_with_bg(frame, f"Push-ups: {reps}", 30, 80)
-
-                # HIGH KNEES
-                elif ACTIVE_EXERCISE == "high_knees":
-                    # Better logic for high knees
-                    left_knee_up = left_knee.y < left_hip.y
-                    right_knee = landmarks[PoseLandmark.RIGHT_KNEE.value]
-                    right_hip = landmarks[PoseLandmark.RIGHT_HIP.value]
-                    right_knee_up = right_knee.y < right_hip.y
-                    
-                    reps, joint_colors = exercise.update(left_knee_up, right_knee_up)
-                    tracker.update_reps(reps)
-                    draw_text_with_bg(frame, f"High Knees: {reps}", 30, 80)
-
-                # PLANK (TIME BASED)
-                elif ACTIVE_EXERCISE == "plank":
-                    body_angle = calculate_angle(
-                        pt(left_shoulder), pt(left_hip), pt(left_ankle)
-                    )
-                    seconds, joint_colors = exercise.update(body_angle)
-                    tracker.update_time(seconds)
-                    draw_text_with_bg(frame, f"Plank: {seconds}s", 30, 80)
-
-                # CHAIR POSE (TIME BASED)
-                elif ACTIVE_EXERCISE == "chair_pose":
-                    knee_angle = calculate_angle(
-                        pt(left_hip), pt(left_knee), pt(left_ankle)
-                    )
-                    seconds, joint_colors = exercise.update(knee_angle)
-                    tracker.update_time(seconds)
-                    draw_text_with_bg(frame, f"Chair Pose: {seconds}s", 30, 80)
-
-                # TREE POSE (TIME BASED)
-                elif ACTIVE_EXERCISE == "tree_pose":
-                    standing_leg_angle = calculate_angle(
-                        pt(left_hip), pt(left_knee), pt(left_ankle)
-                    )
-                    raised_leg_angle = calculate_angle(
-                        pt(left_hip), pt(left_knee), pt(left_wrist)
-                    )
-                    seconds, joint_colors = exercise.update(
-                        standing_leg_angle, raised_leg_angle
-                    )
-                    tracker.update_time(seconds)
-                    draw_text_with_bg(frame, f"Tree Pose: {seconds}s", 30, 80)
-
-        cv2.imshow("AI Fitness Trainer", frame)
+    # The camera thread keeps only the newest frame, the inference thread
+    # always works on that one, and this (main) thread shows the newest
+    # result, so camera I/O no longer adds to inference latency.
+    grabber = FrameGrabber(cap)
+    health = SystemHealthSampler()
+    worker = InferenceWorker(grabber, exercise, tracker, session, health)
+
+    render_fps = FpsMeter()
+    health.add_fps_source("capture", grabber.fps)
+    health.add_fps_source("inference", worker.fps)
+    health.add_fps_source("render", render_fps)
+
+    health.start()
+    grabber.start()
+    worker.start()
+    shown_seq = 0
+
+    while session.running and worker.is_alive():
+        result = worker.result
+        if result is not None and result.seq != shown_seq:
+            shown_seq = result.seq
+            frame = result.frame
+            draw_landmarks(frame, result.landmarks, result.joint_colors)
+            for overlay in result.overlays:
+                draw_text_with_bg(frame, *overlay)
+            snapshot = health.snapshot
+            fps = snapshot.fps
+            cpu = f" | CPU {snapshot.cpu_percent:.0f}%" if snapshot.cpu_percent is not None else ""
+            draw_text_with_bg(
+                frame,
+                f"CAM {fps.get('capture', 0):.0f} | AI {fps.get('inference', 0):.0f} | UI {fps.get('render', 0):.0f} FPS{cpu}",
+                30, frame.shape[0] - 20, 0.5, (255, 255, 255), (60, 60, 60), 1
+            )
+            cv2.imshow("AI Fitness Trainer", frame)
+            render_fps.tick()
 
         if cv2.waitKey(1) & 0xFF == ord("q"):
             session.running = False
 
+    grabber.stop()
+    health.stop()
+    worker.join(timeout=2.0)
+    grabber.join(timeout=2.0)
+    logging.info(
+        f"Stage FPS: capture={grabber.fps.fps:.1f} inference={worker.fps.fps:.1f} "
+        f"render={render_fps.fps:.1f}, frames dropped before inference={grabber.dropped}"
+    )
+
     # -------------------------
     # SAVE WORKOUT
     # -------------------------
-    duration = int(time.time() - start_time)
-    avg_angle = angle_sum / max(angle_count, 1)
+    duration = int(time.time() - worker.start_time)
+    avg_angle = worker.angle_sum / max(worker.angle_count, 1)
     reps = exercise.reps if hasattr(exercise, "reps") else tracker.reps
 
     if reps == 0 and duration < 5:
@@ -297,7 +369,8 @@ def main():
                         "reps": int(reps),
                         "duration": int(duration),
                         "avg_angle": float(avg_angle),
-                        "calories": float(tracker.calories_burned)
+                        "calories": float(tracker.calories_burned),
+                        "replay_data": worker.replay.to_json() if worker.replay else None
                     },
                     headers={
                         "Authorization": f"Bearer {USER_TOKEN}"
@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+# Versioned cache: <MODEL_CACHE_DIR>/<asset name>/<version>/<filename>
+MODEL_CACHE_DIR = os.getenv(
+    "MODEL_CACHE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "model_cache"))
+)
+
+# Pinned SHA-256 per asset version, shipped with the code and only changed
+# by `scripts/fetch_models.py pin` on a maintainer's checkout
+LOCKFILE = os.path.join(os.path.dirname(__file__), "model_assets.lock.json")
+
+# Hashes recorded on this host for versions the shipped lockfile doesn't pin
+LOCAL_LOCKFILE = os.path.join(MODEL_CACHE_DIR, "lock.json")
+
+_CHUNK = 1 << 20
+
+
+class AssetChecksumError(Exception):
+    """Raised when a model file does not match its pinned SHA-256."""
+
+
+class ModelAsset:
+    """One versioned model file the server depends on."""
+
+    def __init__(self, name, version, filename, url=None, legacy_dir=None):
+        self.name = name
+        self.version = version
+        self.filename = filename
+        self.url = url
+        # Pre-cache location still honoured, e.g. a .task copied next to the code
+        self.legacy_dir = legacy_dir
+
+    @property
+    def key(self):
+        return f"{self.name}@{self.version}"
+
+    @property
+    def cache_path(self):
+        return os.path.join(MODEL_CACHE_DIR, self.name, self.version, self.filename)
+
+    def local_path(self):
+        """Cached file if present, else the legacy location if present, else None."""
+        if os.path.exists(self.cache_path):
+            return self.cache_path
+        if self.legacy_dir:
+            legacy = os.path.join(self.legacy_dir, self.filename)
+            if os.path.exists(legacy):
+                return legacy
+        return None
+
+
+ASSETS = {}
+
+
+def register_asset(asset):
+    ASSETS[asset.name] = asset
+    return asset
+
+
+def get_asset(name):
+    try:
+        return ASSETS[name]
+    except KeyError:
+        raise KeyError(f"Unknown model asset '{name}', expected one of {sorted(ASSETS)}")
+
+
+def asset_path(name):
+    """Local path of a registered asset, or None if it hasn't been fetched."""
+    return get_asset(name).local_path()
+
+
+# ------------------ CHECKSUMS ------------------
+_lock_mutex = threading.Lock()
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_lock(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_lock(path, lock):
+    with _lock_mutex:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(lock, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, path)
+
+
+def load_lock(strict=False):
+    """
+    Pinned hashes by asset key. The shipped lockfile always wins; with
+    `strict` it is the only source, so hashes recorded on this host
+    don't count.
+    """
+    lock = {} if strict else _read_lock(LOCAL_LOCKFILE)
+    lock.update(_read_lock(LOCKFILE))
+    return lock
+
+
+def save_lock(lock):
+    """Records the hashes the shipped lockfile doesn't have in the cache's lockfile."""
+    pinned = _read_lock(LOCKFILE)
+    _write_lock(LOCAL_LOCKFILE, {k: v for k, v in lock.items() if k not in pinned})
+
+
+def pin_assets(names=None):
+    """
+    Writes the hashes of the locally installed assets into the shipped
+    lockfile, for a maintainer to review and commit. Returns the new pins.
+    """
+    lock = _read_lock(LOCKFILE)
+    pinned = {}
+    for name in names or list(ASSETS):
+        asset = get_asset(name)
+        path = asset.local_path()
+        if path is not None:
+            pinned[asset.key] = lock[asset.key] = sha256_file(path)
+    _write_lock(LOCKFILE, lock)
+    return pinned
+
+
+def verify_asset(name, lock=None, strict=False):
+    """
+    Checks the local file against its pinned hash. Returns "ok",
+    "unpinned" (no hash recorded yet) or "missing"; raises
+    AssetChecksumError on a mismatch, and with `strict` also on a file
+    the shipped lockfile doesn't pin.
+    """
+    asset = get_asset(name)
+    path = asset.local_path()
+    if path is None:
+        return "missing"
+
+    expected = (lock if lock is not None else load_lock(strict)).get(asset.key)
+    if expected is None:
+        if strict:
+            raise AssetChecksumError(f"{asset.key}: {path} has no pinned sha256")
+        return "unpinned"
+
+    actual = sha256_file(path)
+    if actual != expected:
+        raise AssetChecksumError(f"{asset.key}: {path} has sha256 {actual}, expected {expected}")
+    return "ok"
+
+
+# ------------------ INSTALL ------------------
+def _install(asset, src_path, lock, pin):
+    """Checks src_path against the lockfile, then moves it into the cache."""
+    digest = sha256_file(src_path)
+    expected = lock.get(asset.key)
+    if expected is not None and digest != expected:
+        raise AssetChecksumError(f"{asset.key}: got sha256 {digest}, expected {expected}")
+
+    os.makedirs(os.path.dirname(asset.cache_path), exist_ok=True)
+    os.replace(src_path, asset.cache_path)
+
+    if expected is None and pin:
+        lock[asset.key] = digest
+    return digest
+
+
+def fetch_asset(name, force=False, pin=False):
+    """
+    Downloads an asset into the cache and verifies it against the
+    lockfile. A version the lockfile doesn't pin is installed unverified;
+    `pin` trusts this download and records its hash for this host only.
+    Returns the cached path.
+    """
+    import requests
+
+    asset = get_asset(name)
+    if os.path.exists(asset.cache_path) and not force:
+        verify_asset(name)
+        return asset.cache_path
+    if not asset.url:
+        raise ValueError(f"{asset.key} has no download URL; use import_asset()")
+
+    lock = load_lock()
+    os.makedirs(os.path.dirname(asset.cache_path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(asset.cache_path), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f, requests.get(asset.url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(_CHUNK):
+                f.write(chunk)
+        _install(asset, tmp, lock, pin)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    save_lock(lock)
+    return asset.cache_path
+
+
+def import_asset(name, src, pin=False):
+    """Copies a file obtained out of band (air-gapped hosts) into the cache."""
+    asset = get_asset(name)
+    lock = load_lock()
+
+    os.makedirs(os.path.dirname(asset.cache_path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(asset.cache_path), suffix=".part")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        _install(asset, tmp, lock, pin)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    save_lock(lock)
+    return asset.cache_path
+
+
+# ------------------ WARM-UP ------------------
+def warm_models(strict=False):
+    """
+    Verifies every registered asset that is present and loads every
+    exercise classifier into the model registry. Pose landmarkers are
+    built by the session pool's prewarm, which keeps them. With `strict`,
+    a checksum mismatch or an asset the shipped lockfile doesn't pin
+    raises; otherwise the asset is reported and skipped. Returns a
+    status dict.
+    """
+    lock = load_lock(strict)
+    status = {}
+
+    for name in ASSETS:
+        try:
+            status[name] = verify_asset(name, lock, strict)
+        except AssetChecksumError as e:
+            if strict:
+                raise
+            print(f"❌ {e}")
+            status[name] = "checksum_mismatch"
+
+    from .processing.exercise_registry import list_exercises, get_exercise
+    from .processing.model_registry import model_registry
+
+    for exercise in list_exercises():
+        path = get_exercise(exercise).classifier_path
+        if path:
+            status[f"{exercise}_classifier"] = "ok" if model_registry.get(path) else "missing"
+
+    for name, state in status.items():
+        icon = "✅" if state == "ok" else "⚠️"
+        print(f"{icon} Model asset {name}: {state}")
+        if state == "unpinned":
+            print(f"   {name} has no sha256 in {os.path.basename(LOCKFILE)}; run scripts/fetch_models.py pin on a trusted copy")
+    return status
+
+
+# ------------------ REGISTERED ASSETS ------------------
+_POSE_DIR = os.path.join(os.path.dirname(__file__), "pose")
+
+for _tier in ("lite", "full", "heavy"):
+    register_asset(ModelAsset(
+        f"pose_landmarker_{_tier}",
+        version="float16-1",
+        filename=f"pose_landmarker_{_tier}.task",
+        url=(
+            "https://storage.googleapis.com/mediapipe-models/pose_landmarker/"
+            f"pose_landmarker_{_tier}/float16/1/pose_landmarker_{_tier}.task"
+        ),
+        legacy_dir=os.getenv("POSE_MODEL_DIR", _POSE_DIR),
+    ))
@@ -1,15 +1,23 @@
 import os
 from typing import Dict, Any
-from joblib import load
 from .utils import compute_bmi, rule_based_predictions
 
 _MODEL_PATH = os.getenv("PERSONALIZATION_MODEL_PATH", os.path.join(os.path.dirname(__file__), "personalization_model.joblib"))
 _model = None
-try:
-    if os.path.exists(_MODEL_PATH):
-        _model = load(_MODEL_PATH)
-except Exception:
-    _model = None
+_loaded = False
+
+def _get_model():
+    # Unpickling pulls in joblib/sklearn/pandas, so wait for the first prediction
+    global _model, _loaded
+    if not _loaded:
+        _loaded = True
+        try:
+            if os.path.exists(_MODEL_PATH):
+                from joblib import load
+                _model = load(_MODEL_PATH)
+        except Exception:
+            _model = None
+    return _model
 
 def predict(data: Dict[str, Any]) -> Dict[str, Any]:
     gender = str(data.get("gender", "male"))
@@ -21,7 +29,8 @@ def predict(data: Dict[str, Any]) -> Dict[str, Any]:
     workout_type = str(data.get("workout_type", "general"))
     experience_level = str(data.get("experience_level", "Beginner"))
     bmi = compute_bmi(weight_kg, height_cm)
-    if _model is None:
+    model = _get_model()
+    if model is None:
         return rule_based_predictions(gender, age, height_cm, weight_kg, workout_frequency, session_duration, experience_level)
     X = [{
         "Gender": gender,
@@ -35,7 +44,7 @@ def predict(data: Dict[str, Any]) -> Dict[str, Any]:
         "session_duration": session_duration
     }]
     try:
-        y = _model.predict(X)[0]
+        y = model.predict(X)[0]
         return {
             "calories": float(round(y[0], 2)),
             "water": float(round(y[1], 2)),
@@ -2,62 +2,101 @@ import cv2
 import time
 import asyncio
 
-from backend.app.core_ai.pose.pose_detector import detect_pose
-from backend.app.core_ai.processing.smoother import PoseSmoother
-from backend.app.core_ai.processing.feature_extractor import FeatureExtractor
-from backend.app.core_ai.processing.temporal import TemporalProcessor
-from backend.app.core_ai.processing.rep_counter import RepCounter
-from backend.app.core_ai.processing.ml_models import MLModelLayer
-from backend.app.core_ai.processing.scoring import ScoringEngine
+from .executor import run_in_vision_executor, vision_executor_is_process
+from .pose.pose_detector import PoseDetectorSession, detect_landmarks
+from .pose.model_tiers import tier_for_complexity
+from .processing.smoother import PoseSmoother
+from .processing.feature_extractor import FeatureExtractor
+from .processing.temporal import TemporalProcessor
+from .processing.rep_counter import RepCounter
+from .processing.ml_models import MLModelLayer, fallback_result
+from .processing.scoring import ScoringEngine
+from .processing.exercise_registry import get_exercise
 
 
 class Pipeline:
-    def __init__(self, exercise_name="squat"):
+    def __init__(self, exercise_name="squat", vision_complexity=None, llm_feedback=True, debug=True,
+                 pose_session=None):
         self.exercise_name = exercise_name
+        self.llm_feedback = llm_feedback
+        self.debug = debug
+        self.spec = get_exercise(exercise_name)
+
+        # Only exercises with a classifier touch the model registry
+        self.ml = None
+        if self.spec.classifier:
+            self.ml = MLModelLayer(self.spec.classifier_path, exercise=self.spec.name)
+
+        # Compute just what reps, rules and the classifier read
+        model_features = self.ml.feature_cols if self.ml else ()
+        self.feature_extractor = FeatureExtractor(self.spec.required_features(model_features))
 
         self.smoother = PoseSmoother()
-        self.feature_extractor = FeatureExtractor()
         self.temporal = TemporalProcessor()
-        self.ml = MLModelLayer()
         self.scorer = ScoringEngine()
+        # Detector for process_frame_async; callers that detect elsewhere
+        # (the pooled /ws/session socket, the warm-up) never create one
+        self.vision_complexity = vision_complexity
+        self.pose_session = pose_session
 
         self.llm_feedback_buffer = []
         self.last_llm_time = 0
+        self._llm_task = None
 
-        # 🔥 IMPORTANT: use stable metric
-        if exercise_name == "squat":
-            self.rep_counter = RepCounter("knee_avg", 100, 160)
-        elif exercise_name == "pushup":
-            self.rep_counter = RepCounter("left_elbow_angle", 100, 160)
-        else:
-            self.rep_counter = RepCounter("knee_avg", 100, 160)
+        # 🔥 IMPORTANT: use stable metric (None for timed holds)
+        self.rep_counter = RepCounter(*self.spec.rep) if self.spec.rep else None
 
     async def process_frame_async(self, frame):
 
         timestamp = time.perf_counter()
 
         # ------------------ 1. POSE ------------------
-        _, raw_landmarks = detect_pose(frame, draw=False)
+        # Runs on the vision executor so the event loop stays free. The
+        # session holds this user's tracking state and can't be pickled into
+        # a worker process, whose shared default session would mix users, so
+        # with a process pool detection runs on a thread instead.
+        if self.pose_session is None:
+            # BASIC/NORMAL/ADVANCED -> lite/full/heavy ceiling for this session
+            self.pose_session = PoseDetectorSession(max_tier=tier_for_complexity(self.vision_complexity))
+        if vision_executor_is_process():
+            loop = asyncio.get_running_loop()
+            raw_landmarks = await loop.run_in_executor(None, detect_landmarks, frame, self.pose_session)
+        else:
+            raw_landmarks = await run_in_vision_executor(detect_landmarks, frame, self.pose_session)
         if not raw_landmarks:
             return frame, {"error": "No person detected"}
 
+        landmarks, result = await self.process_landmarks(raw_landmarks, timestamp)
+
+        # ------------------ 9. DRAW ------------------
+        frame = await run_in_vision_executor(
+            draw_overlay,
+            frame,
+            self.exercise_name,
+            landmarks,
+            result["reps"],
+            result["score"],
+            result["feedback"],
+            self.spec.landmarks
+        )
+
+        return frame, result
+
+    async def process_landmarks(self, raw_landmarks, timestamp=None):
+        """
+        Runs steps 2-8 on an already detected pose (landmark objects or a
+        (33, 4) array) and returns (smoothed landmarks, result). Used by
+        process_frame_async, and with synthetic poses by the startup warm-up.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
         # ------------------ 2. SMOOTH ------------------
-        landmarks = self.smoother.smooth(raw_landmarks)
+        landmarks = self.smoother.smooth(raw_landmarks, timestamp)
 
         # ------------------ 3. FEATURES ------------------
         features = self.feature_extractor.extract_features(landmarks)
 
-        # 🔥 IMPORTANT: derived features
-        features["knee_avg"] = (
-            features.get("left_knee_angle", 0) +
-            features.get("right_knee_angle", 0)
-        ) / 2
-
-        features["hip_avg"] = (
-            features.get("left_hip_angle", 0) +
-            features.get("right_hip_angle", 0)
-        ) / 2
-
         # ------------------ 4. TEMPORAL ------------------
         vel, acc = self.temporal.update(features, timestamp)
 
@@ -66,26 +105,32 @@ class Pipeline:
             features[f"{k}_vel"] = v
 
         # add temporal stats (VERY IMPORTANT)
-        features.update(self.temporal.get_temporal_features("knee_avg"))
+        if self.spec.rep_metric:
+            features.update(self.temporal.get_temporal_features(self.spec.rep_metric))
 
         # ------------------ 5. ML ------------------
-        ml_result = self.ml.predict(self.exercise_name, features)
+        # Batched with every other session in this process
+        if self.ml:
+            ml_result = await self.ml.predict_async(self.spec.name, features)
+        else:
+            ml_result = fallback_result()
 
         # ------------------ 6. SCORING ------------------
         final_score, rule_feedback = self.scorer.calculate_score(
-            self.exercise_name,
+            self.spec.name,
             features,
-            ml_result
+            ml_result,
+            self.spec.rules
         )
 
         # ------------------ 7. REP COUNT ------------------
-        reps = self.rep_counter.update(features, ml_result)
+        reps = self.rep_counter.update(features, ml_result) if self.rep_counter else 0
 
         # ------------------ 8. LLM FEEDBACK ------------------
         current_time = time.time()
 
-        if final_score < 70 and (current_time - self.last_llm_time > 5):
-            asyncio.create_task(
+        if self.llm_feedback and final_score < 70 and (current_time - self.last_llm_time > 5):
+            self._llm_task = asyncio.create_task(
                 self._fetch_llm_feedback(final_score, rule_feedback, features)
             )
             self.last_llm_time = current_time
@@ -97,25 +142,17 @@ class Pipeline:
             self.llm_feedback_buffer
         )
 
-        # ------------------ 9. DRAW ------------------
-        frame = self.draw_overlay(
-            frame,
-            landmarks,
-            reps,
-            final_score,
-            combined_feedback
-        )
-
         # ------------------ DEBUG ------------------
-        print("\n" + "=" * 50)
-        print(f"🔄 PIPELINE | {self.exercise_name}")
-        print("=" * 50)
-        print(f"Reps: {reps}")
-        print(f"Score: {final_score:.1f}")
-        print(f"Class: {ml_result['label']} ({ml_result['confidence']:.2f})")
-        print("=" * 50)
-
-        return frame, {
+        if self.debug:
+            print("\n" + "=" * 50)
+            print(f"🔄 PIPELINE | {self.exercise_name}")
+            print("=" * 50)
+            print(f"Reps: {reps}")
+            print(f"Score: {final_score:.1f}")
+            print(f"Class: {ml_result['label']} ({ml_result['confidence']:.2f})")
+            print("=" * 50)
+
+        return landmarks, {
             "reps": reps,
             "score": final_score,
             "feedback": combined_feedback,
@@ -137,6 +174,12 @@ class Pipeline:
         except Exception as e:
             print(f"LLM Error: {e}")
 
+    def close(self):
+        """Cancels a pending LLM feedback request; call when the user disconnects."""
+        if self._llm_task is not None:
+            self._llm_task.cancel()
+            self._llm_task = None
+
     def process_frame(self, frame):
         try:
             loop = asyncio.get_event_loop()
@@ -151,43 +194,58 @@ class Pipeline:
 
     # ------------------ DRAW ------------------
     def draw_overlay(self, frame, landmarks, reps, score, feedback):
-        h, w, _ = frame.shape
+        return draw_overlay(frame, self.exercise_name, landmarks, reps, score, feedback, self.spec.landmarks)
 
-        for lm in landmarks:
-            cx, cy = int(lm.x * w), int(lm.y * h)
-            cv2.circle(frame, (cx, cy), 4, (0, 255, 0), -1)
+    def draw_line(self, frame, lm1, lm2, w, h):
+        draw_line(frame, lm1, lm2, w, h)
 
-        # skeleton
-        self.draw_line(frame, landmarks[11], landmarks[12], w, h)
-        self.draw_line(frame, landmarks[11], landmarks[23], w, h)
-        self.draw_line(frame, landmarks[12], landmarks[24], w, h)
-        self.draw_line(frame, landmarks[23], landmarks[24], w, h)
-        self.draw_line(frame, landmarks[23], landmarks[25], w, h)
-        self.draw_line(frame, landmarks[25], landmarks[27], w, h)
-        self.draw_line(frame, landmarks[24], landmarks[26], w, h)
-        self.draw_line(frame, landmarks[26], landmarks[28], w, h)
 
-        # UI
-        cv2.rectangle(frame, (0, 0), (260, 160), (0, 0, 0), -1)
+SKELETON = [
+    (11, 12), (11, 23), (12, 24), (23, 24),
+    (23, 25), (25, 27), (24, 26), (26, 28),
+    (11, 13), (13, 15), (12, 14), (14, 16),
+]
 
-        cv2.putText(frame, f"Exercise: {self.exercise_name}", (10, 25),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
 
-        cv2.putText(frame, f"Reps: {reps}", (10, 55),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+# Module-level so it can be shipped to a process-pool executor
+def draw_overlay(frame, exercise_name, landmarks, reps, score, feedback, joints=None):
+    """Draws `joints` (default: every landmark) and the skeleton edges between them."""
+    h, w, _ = frame.shape
+    joints = range(len(landmarks)) if joints is None else [j for j in joints if j < len(landmarks)]
 
-        cv2.putText(frame, f"Score: {int(score)}", (10, 85),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    for j in joints:
+        lm = landmarks[j]
+        cx, cy = int(lm.x * w), int(lm.y * h)
+        cv2.circle(frame, (cx, cy), 4, (0, 255, 0), -1)
 
-        y = 115
-        for msg in feedback[:3]:  # limit text
-            cv2.putText(frame, msg, (10, y),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            y += 20
+    # skeleton
+    drawn = set(joints)
+    for a, b in SKELETON:
+        if a in drawn and b in drawn:
+            draw_line(frame, landmarks[a], landmarks[b], w, h)
 
-        return frame
+    # UI
+    cv2.rectangle(frame, (0, 0), (260, 160), (0, 0, 0), -1)
 
-    def draw_line(self, frame, lm1, lm2, w, h):
-        x1, y1 = int(lm1.x * w), int(lm1.y * h)
-        x2, y2 = int(lm2.x * w), int(lm2.y * h)
-        cv2.line(frame, (x1, y1), (x2, y2), (255, 255, 255), 2)
\ No newline at end of file
+    cv2.putText(frame, f"Exercise: {exercise_name}", (10, 25),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+    cv2.putText(frame, f"Reps: {reps}", (10, 55),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+    cv2.putText(frame, f"Score: {int(score)}", (10, 85),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+    y = 115
+    for msg in feedback[:3]:  # limit text
+        cv2.putText(frame, msg, (10, y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+        y += 20
+
+    return frame
+
+
+def draw_line(frame, lm1, lm2, w, h):
+    x1, y1 = int(lm1.x * w), int(lm1.y * h)
+    x2, y2 = int(lm2.x * w), int(lm2.y * h)
+    cv2.line(frame, (x1, y1), (x2, y2), (255, 255, 255), 2)
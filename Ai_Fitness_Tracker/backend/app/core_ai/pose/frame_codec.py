@@ -0,0 +1,76 @@
+import base64
+import struct
+
+import cv2
+import numpy as np
+
+from .landmark_array import landmarks_to_array
+
+# Binary vision protocol
+# ----------------------
+# Client -> server: one websocket binary message per frame holding the raw
+# JPEG/WebP bytes (no base64, no JSON envelope).
+# Server -> client: a fixed little-endian header followed by the landmarks as
+# a packed float32 array of shape (n_landmarks, 4) = x, y, z, visibility.
+#
+#   magic       2s   b"PL"
+#   version     u8   2
+#   flags       u8   bit 0 set when a pose was detected
+#   n_landmarks u16  0 when no pose, otherwise 33
+#   frame_id    u32  per-connection frame counter
+#   latency_ms  f32  server-side inference latency
+#   processed   u32  frames run through inference on this connection
+#   dropped     u32  frames superseded by a newer one before inference
+BINARY_SUBPROTOCOL = "pose-binary.v2"
+BINARY_MAGIC = b"PL"
+BINARY_VERSION = 2
+FLAG_POSE = 0x01
+
+HEADER = struct.Struct("<2sBBHIfII")
+
+
+def decode_frame_bytes(data):
+    """Decodes encoded image bytes (JPEG/WebP/PNG) into a BGR frame, or None."""
+    if not data:
+        return None
+    nparr = np.frombuffer(data, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+
+def decode_frame_base64(image_b64):
+    return decode_frame_bytes(base64.b64decode(image_b64))
+
+
+def pack_landmarks(landmarks, frame_id=0, latency_ms=0.0, processed=0, dropped=0):
+    """Packs a pose (or None) into one binary protocol message."""
+    if landmarks is None or len(landmarks) == 0:
+        return HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, 0, frame_id, latency_ms, processed, dropped)
+
+    arr = landmarks_to_array(landmarks).astype('<f4', copy=False)
+    header = HEADER.pack(
+        BINARY_MAGIC, BINARY_VERSION, FLAG_POSE, arr.shape[0], frame_id, latency_ms, processed, dropped
+    )
+    return header + arr.tobytes()
+
+
+def unpack_landmarks(message):
+    """
+    Inverse of pack_landmarks.
+    Returns (array or None, meta) where meta holds frame_id, latency_ms,
+    processed and dropped.
+    """
+    magic, version, flags, count, frame_id, latency_ms, processed, dropped = HEADER.unpack_from(message)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError(f"Unsupported pose message (magic={magic!r}, version={version})")
+
+    meta = {
+        "frame_id": frame_id,
+        "latency_ms": latency_ms,
+        "processed": processed,
+        "dropped": dropped,
+    }
+    if not flags & FLAG_POSE:
+        return None, meta
+
+    arr = np.frombuffer(message, dtype='<f4', count=count * 4, offset=HEADER.size)
+    return arr.reshape(count, 4), meta
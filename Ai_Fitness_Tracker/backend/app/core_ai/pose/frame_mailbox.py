@@ -0,0 +1,39 @@
+import asyncio
+
+
+class LatestFrameMailbox:
+    """
+    Single-slot, latest-frame-wins mailbox between a socket reader and an
+    inference loop. A frame that arrives while another is still pending
+    replaces it, so the consumer always works on the newest frame and
+    feedback latency stays bounded however fast the client uploads.
+    """
+
+    def __init__(self):
+        self._frame = None
+        self._ready = asyncio.Event()
+        self._closed = False
+
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, frame):
+        if self._closed:
+            return
+        self.received += 1
+        if self._frame is not None:
+            self.dropped += 1  # previous frame was never consumed
+        self._frame = frame
+        self._ready.set()
+
+    async def get(self):
+        """Waits for the newest frame. Returns None once the mailbox is closed and drained."""
+        await self._ready.wait()
+        frame, self._frame = self._frame, None
+        if not self._closed:
+            self._ready.clear()
+        return frame
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
@@ -0,0 +1,304 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+import numpy as np
+
+from .pose_detector import PoseDetectorSession
+from .model_tiers import DEFAULT_TIER, ceiling_tier, warm_tiers
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the shared frame queue is saturated."""
+
+
+class SessionPoolExhausted(Exception):
+    """Raised when no pose session frees up before the acquire timeout."""
+
+
+class PoseSessionPool:
+    """
+    Bounded pool of PoseDetectorSessions handed out one per connection.
+
+    Released sessions are reset, so no tracking, ROI or tier state carries
+    over to the next user, and rebuilt at their tier ceiling, both on an
+    executor thread. Only then does the session go back to the idle list
+    and its slot free up, so no connection can get a session that is
+    still being recycled. acquire() hands out the most recently released session built
+    for the requested ceiling, so a new connection usually skips graph
+    construction entirely.
+    """
+
+    def __init__(self, max_sessions=20):
+        self.max_sessions = max_sessions
+        self._idle = []
+        self._in_use = 0
+        self._recycling = 0
+        self._closed = False
+        self._slots = asyncio.Semaphore(max_sessions)
+
+    async def acquire(self, timeout=None, max_tier=None):
+        """
+        Waits for a free slot and returns a session capped at `max_tier`
+        (default DEFAULT_TIER), preferring an idle one already built at
+        that ceiling.
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise SessionPoolExhausted(f"All {self.max_sessions} pose sessions are in use")
+
+        self._in_use += 1
+        max_tier = max_tier or DEFAULT_TIER
+        session = self._take_idle(ceiling_tier(max_tier))
+        if session is None:
+            return PoseDetectorSession(max_tier=max_tier)
+        # Same resolved ceiling keeps the built landmarker; otherwise it's rebuilt on the first frame
+        session.set_max_tier(max_tier)
+        return session
+
+    def _take_idle(self, tier):
+        for i in range(len(self._idle) - 1, -1, -1):
+            if self._idle[i].max_tier == tier:
+                return self._idle.pop(i)
+        return self._idle.pop() if self._idle else None
+
+    async def prewarm(self, count, tiers=None):
+        """
+        Adds up to `count` idle sessions with their landmarkers already
+        built and run once, so the first connections skip graph init.
+        Sessions are spread round-robin over `tiers` (default: every
+        installed tier), so connections at any vision_complexity find one.
+        A tier that fails to build is reported and skipped. Returns the
+        sessions added per tier and the errors per tier.
+        """
+        loop = asyncio.get_running_loop()
+        count = max(0, min(count, self.max_sessions - self._in_use - self._recycling - len(self._idle)))
+        tiers = list(tiers or warm_tiers())
+        added, errors = {}, {}
+        for i in range(count):
+            tier = tiers[i % len(tiers)]
+            if tier in errors:
+                continue
+            session = PoseDetectorSession(max_tier=tier)
+            try:
+                await loop.run_in_executor(None, session.warm)
+            except Exception as e:
+                print(f"❌ Failed to prewarm a '{tier}' pose session: {e}")
+                session.close()
+                errors[tier] = str(e)
+                continue
+            self._idle.append(session)
+            added[tier] = added.get(tier, 0) + 1
+        return {"added": added, "errors": errors}
+
+    def release(self, session):
+        """
+        Hands a session back. Reset and rebuild run on an executor thread,
+        since reset() can wait on the session lock behind a detect() still
+        in flight; the slot frees up once they're done.
+        """
+        self._in_use -= 1
+        self._recycling += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to hand off to; the landmarker is built on first detect()
+            self._recycled(session, _reset(session))
+            return
+        future = loop.run_in_executor(None, _recycle, session)
+        future.add_done_callback(lambda f: self._recycled(session, not f.cancelled() and f.result()))
+
+    def _recycled(self, session, ok):
+        self._recycling -= 1
+        if ok and not self._closed:
+            self._idle.append(session)
+        else:
+            session.close()
+        self._slots.release()
+
+    @asynccontextmanager
+    async def session(self, timeout=None):
+        session = await self.acquire(timeout)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def close(self):
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for session in idle:
+            session.close()
+
+    def stats(self):
+        return {
+            "max_sessions": self.max_sessions,
+            "sessions_in_use": self._in_use,
+            "sessions_recycling": self._recycling,
+            "sessions_idle": len(self._idle),
+        }
+
+
+def _reset(session):
+    """Resets a released session; False if it's unusable and should be dropped."""
+    try:
+        session.reset()
+        return True
+    except Exception as e:
+        print(f"⚠️ Failed to reset released pose session: {e}")
+        return False
+
+
+def _recycle(session):
+    """Executor side of release(): reset, then rebuild the landmarker and run one blank frame."""
+    if not _reset(session):
+        return False
+    try:
+        session.warm()
+    except Exception as e:
+        # Still usable: the landmarker is built on first detect() instead
+        print(f"⚠️ Failed to rebuild released pose session: {e}")
+    return True
+
+
+class _PoseJob:
+    __slots__ = ['frame', 'session', 'future', 'loop', 'enqueued_at']
+
+    def __init__(self, frame, session, future, loop):
+        self.frame = frame
+        self.session = session
+        self.future = future
+        self.loop = loop
+        self.enqueued_at = time.perf_counter()
+
+
+class _PoseWorker(threading.Thread):
+    """
+    One inference thread. Jobs normally carry the connection's own session;
+    the worker keeps a private session for callers that don't have one.
+    """
+
+    def __init__(self, service, index):
+        super().__init__(name=f"pose-worker-{index}", daemon=True)
+        self.service = service
+        self.session = PoseDetectorSession()
+
+    def run(self):
+        while True:
+            job = self.service._jobs.get()
+            if job is None:
+                break
+
+            if job.future.cancelled():
+                continue
+
+            try:
+                session = job.session or self.session
+                result = session.detect(job.frame)
+                error = None
+            except Exception as e:
+                result, error = None, e
+
+            self.service._record_latency(time.perf_counter() - job.enqueued_at)
+            job.loop.call_soon_threadsafe(_resolve, job.future, result, error)
+
+        self.session.close()
+
+
+def _resolve(future, result, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class PoseInferenceService:
+    """
+    Shared pose inference for every vision socket.
+
+    Frames from all connections go into one bounded queue that a pool of
+    worker threads drains. Each frame runs on its connection's own
+    PoseDetectorSession, so sessions no longer serialize on a single
+    PoseLandmarker or on the event loop.
+    """
+
+    def __init__(self, num_workers=2, max_queue_size=64, latency_window=256):
+        self.num_workers = max(1, num_workers)
+        self.max_queue_size = max_queue_size
+
+        self._jobs = queue.Queue(maxsize=max_queue_size)
+        self._workers = []
+        self._lock = threading.Lock()
+
+        self._latencies = deque(maxlen=latency_window)
+        self._processed = 0
+        self._rejected = 0
+
+    # ------------------ LIFECYCLE ------------------
+    def start(self):
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.num_workers):
+                worker = _PoseWorker(self, i)
+                worker.start()
+                self._workers.append(worker)
+
+    def stop(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._jobs.put(None)
+        for worker in workers:
+            worker.join(timeout=5)
+
+    # ------------------ INFERENCE ------------------
+    async def submit(self, frame, session=None):
+        """
+        Queues a BGR frame and waits for its landmarks (None if no pose).
+        Pass the connection's PoseDetectorSession to keep its tracking state.
+        Raises InferenceQueueFull instead of letting the backlog grow.
+        """
+        if not self._workers:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        job = _PoseJob(frame, session, loop.create_future(), loop)
+
+        try:
+            self._jobs.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise InferenceQueueFull(f"Pose queue is full ({self.max_queue_size} frames)")
+
+        return await job.future
+
+    # ------------------ METRICS ------------------
+    def _record_latency(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds * 1000)
+            self._processed += 1
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=np.float32)
+            processed = self._processed
+            rejected = self._rejected
+
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._jobs.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "processed": processed,
+            "rejected": rejected,
+            "latency_ms_avg": float(latencies.mean()) if latencies.size else 0.0,
+            "latency_ms_p95": float(np.percentile(latencies, 95)) if latencies.size else 0.0,
+            "latency_ms_last": float(latencies[-1]) if latencies.size else 0.0,
+        }
@@ -0,0 +1,40 @@
+from operator import attrgetter
+
+import numpy as np
+
+NUM_LANDMARKS = 33
+LANDMARK_FIELDS = ('x', 'y', 'z', 'visibility')
+
+_get_fields = attrgetter(*LANDMARK_FIELDS)
+
+
+def landmarks_to_array(landmarks, dtype=np.float32):
+    """
+    Converts MediaPipe-style landmark objects into one (33, 4) array of
+    x, y, z, visibility. Arrays are passed through untouched.
+    """
+    if landmarks is None:
+        return None
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+
+    return np.array(list(map(_get_fields, landmarks)), dtype=dtype).reshape(-1, 4)
+
+
+def joint_angles(points, a_idx, b_idx, c_idx):
+    """
+    Angles (degrees) at vertex b for many (a, b, c) triplets at once.
+    `points` is an (N, >=2) array; only the first two columns (x, y) are used.
+    Degenerate triplets (zero-length arm) come back as 0.0.
+    """
+    b = points[b_idx, :2]
+    ba = points[a_idx, :2] - b
+    bc = points[c_idx, :2] - b
+
+    norms = np.sqrt((ba * ba).sum(axis=1) * (bc * bc).sum(axis=1))
+    dots = (ba * bc).sum(axis=1)
+
+    valid = norms > 0
+    cosine = np.divide(dots, norms, out=np.zeros_like(dots), where=valid)
+    angles = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+    return np.where(valid, angles, 0.0)
@@ -0,0 +1,184 @@
+import os
+
+try:
+    from ..model_assets import asset_path
+except ImportError:
+    # pose/ is imported as a top-level package by the local kiosk loop
+    from model_assets import asset_path
+
+# Cheapest to most accurate
+MODEL_TIERS = ("lite", "full", "heavy")
+
+# Routine / RoutineStep.vision_complexity -> highest tier a session may use
+VISION_COMPLEXITY_TIERS = {
+    "BASIC": "lite",
+    "NORMAL": "full",
+    "ADVANCED": "heavy",
+}
+
+# Model files come from the asset cache (scripts/fetch_models.py) or, for
+# older installs, from this directory; nothing is downloaded at runtime
+MODEL_DIR = os.getenv("POSE_MODEL_DIR", os.path.dirname(__file__))
+DEFAULT_TIER = os.getenv("POSE_MODEL_TIER", "heavy")
+LATENCY_BUDGET_MS = float(os.getenv("POSE_LATENCY_BUDGET_MS", "66"))
+
+_warned = set()
+
+
+def model_filename(tier):
+    return f"pose_landmarker_{tier}.task"
+
+
+def model_path(tier, model_dir=None):
+    if model_dir is None:
+        cached = asset_path(f"pose_landmarker_{tier}")
+        if cached:
+            return cached
+    return os.path.join(model_dir or MODEL_DIR, model_filename(tier))
+
+
+def available_tiers(model_dir=None):
+    return [tier for tier in MODEL_TIERS if os.path.exists(model_path(tier, model_dir))]
+
+
+def tier_for_complexity(vision_complexity):
+    """Maps BASIC/NORMAL/ADVANCED (any case) to a tier; None or unknown gives DEFAULT_TIER."""
+    return VISION_COMPLEXITY_TIERS.get(str(vision_complexity or "").upper(), DEFAULT_TIER)
+
+
+def resolve_tier(tier, model_dir=None):
+    """
+    Returns `tier` if its file is present, otherwise the closest tier that
+    is (preferring the cheaper one on a tie). Raises FileNotFoundError if
+    no pose model is installed.
+    """
+    if tier not in MODEL_TIERS:
+        raise ValueError(f"Unknown pose model tier '{tier}', expected one of {MODEL_TIERS}")
+
+    installed = available_tiers(model_dir)
+    if tier in installed:
+        return tier
+    if not installed:
+        raise FileNotFoundError(
+            f"No pose landmarker model installed (cache or {model_dir or MODEL_DIR}); "
+            f"run scripts/fetch_models.py to fetch {[model_filename(t) for t in MODEL_TIERS]}"
+        )
+
+    wanted = MODEL_TIERS.index(tier)
+    fallback = min(installed, key=lambda t: (abs(MODEL_TIERS.index(t) - wanted), MODEL_TIERS.index(t)))
+    if (tier, fallback) not in _warned:
+        _warned.add((tier, fallback))
+        print(f"⚠️ Pose model '{tier}' not installed, using '{fallback}'")
+    return fallback
+
+
+def ceiling_tier(tier):
+    """The tier a session capped at `tier` actually runs: resolve_tier(), or `tier` itself while nothing is installed."""
+    try:
+        return resolve_tier(tier)
+    except FileNotFoundError:
+        # Nothing installed yet; create_landmarker() reports it on first use
+        return tier
+
+
+def warm_tiers():
+    """Installed tiers to prewarm sessions at, the one DEFAULT_TIER resolves to first."""
+    default = ceiling_tier(DEFAULT_TIER)
+    return sorted(available_tiers(), key=lambda t: t != default) or [DEFAULT_TIER]
+
+
+class TierController:
+    """
+    Picks the landmarker tier for one session from measured latency.
+
+    Starts at `max_tier` (the ceiling, e.g. from vision_complexity). When
+    the smoothed per-frame latency goes over `budget_ms`, it steps down
+    one tier. After `upgrade_after` frames in a row under `headroom` x
+    budget, it steps back up, never past max_tier. Each switch is followed
+    by `cooldown` frames without decisions, so the new model's warm-up
+    frames don't trigger another switch.
+    """
+
+    def __init__(self, max_tier=None, budget_ms=None, headroom=0.5, upgrade_after=90, cooldown=30, alpha=0.1):
+        self.budget_ms = LATENCY_BUDGET_MS if budget_ms is None else budget_ms
+        self.headroom = headroom
+        self.upgrade_after = upgrade_after
+        self.cooldown = cooldown
+        self.alpha = alpha
+
+        self.set_max_tier(max_tier or DEFAULT_TIER)
+
+    def set_max_tier(self, tier):
+        self.requested_tier = tier
+        self.installed = available_tiers()
+        self.max_tier = self._resolve_max()
+        self.tier = self.max_tier
+        self._reset()
+
+    def _resolve_max(self):
+        return ceiling_tier(self.requested_tier)
+
+    def refresh(self):
+        """
+        Re-reads which tiers are installed, so a model fetched while the
+        server runs (scripts/fetch_models.py) is picked up by long-lived
+        sessions. Called whenever the landmarker is rebuilt.
+        """
+        self.installed = available_tiers()
+        max_tier = self._resolve_max()
+        if max_tier != self.max_tier:
+            self.max_tier = max_tier
+            # Stay on the current tier if still allowed; upgrades happen as usual
+            if self.tier not in self.installed or MODEL_TIERS.index(self.tier) > MODEL_TIERS.index(max_tier):
+                self.tier = max_tier
+
+    def _reset(self):
+        self.latency_ms = None
+        self._fast_frames = 0
+        self._cooldown_left = self.cooldown
+
+    def _step(self, delta):
+        # A stepping decision is also when a newly installed tier can come in
+        self.refresh()
+        allowed = [t for t in self.installed if MODEL_TIERS.index(t) <= MODEL_TIERS.index(self.max_tier)]
+        if self.tier not in allowed:
+            return False
+        i = allowed.index(self.tier) + delta
+        if 0 <= i < len(allowed):
+            self.tier = allowed[i]
+            self._reset()
+            return True
+        return False
+
+    def record(self, latency_ms):
+        """Feeds one frame's detection latency; returns True if the tier changed."""
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += self.alpha * (latency_ms - self.latency_ms)
+
+        if self._cooldown_left > 0:
+            self._cooldown_left -= 1
+            return False
+
+        if self.budget_ms <= 0:
+            return False
+
+        if self.latency_ms > self.budget_ms:
+            return self._step(-1)
+
+        if self.latency_ms < self.budget_ms * self.headroom:
+            self._fast_frames += 1
+            if self._fast_frames >= self.upgrade_after:
+                return self._step(+1)
+        else:
+            self._fast_frames = 0
+        return False
+
+    def stats(self):
+        return {
+            "tier": self.tier,
+            "max_tier": self.max_tier,
+            "latency_ms_ema": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "budget_ms": self.budget_ms,
+        }
@@ -2,17 +2,20 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import os
+import threading
 import time
-import requests
 from enum import Enum
 
 # Tasks API
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
-# Constants
-MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_heavy/float16/1/pose_landmarker_heavy.task"
-MODEL_FILENAME = "pose_landmarker_heavy.task"
+from .roi_tracker import RoiTracker
+from .model_tiers import TierController, model_path, resolve_tier, DEFAULT_TIER
+
+# Crop around the previous pose instead of detecting on the full frame.
+# Off by default: every crop change costs a landmarker rebuild
+ROI_TRACKING = os.getenv("POSE_ROI_TRACKING", "0").lower() in ("1", "true", "yes")
 
 # Define PoseLandmark Enum (0-32)
 class PoseLandmark(Enum):
@@ -60,86 +63,242 @@ POSE_CONNECTIONS = [
 ]
 
 # Initialize Landmarker
-model_path = os.path.join(os.path.dirname(__file__), MODEL_FILENAME)
-
 BaseOptions = mp.tasks.BaseOptions
 PoseLandmarker = mp.tasks.vision.PoseLandmarker
 PoseLandmarkerOptions = mp.tasks.vision.PoseLandmarkerOptions
 VisionRunningMode = mp.tasks.vision.RunningMode
 
-# Global state
-landmarker = None
-last_timestamp_ms = 0
-
-def download_model():
-    if not os.path.exists(model_path):
-        print(f"Downloading pose model from {MODEL_URL}...")
-        try:
-            response = requests.get(MODEL_URL)
-            with open(model_path, "wb") as f:
-                f.write(response.content)
-            print("Model downloaded successfully.")
-        except Exception as e:
-            print(f"Failed to download model: {e}")
-            raise e
+# Default session used by detect_pose() when the caller doesn't own one
+_default_session = None
+
+def create_landmarker(tier=DEFAULT_TIER):
+    """
+    Builds a new VIDEO-mode PoseLandmarker with its own tracking state from
+    the local model file for `tier` (or the closest installed tier).
+    """
+    options = PoseLandmarkerOptions(
+        base_options=BaseOptions(model_asset_path=model_path(resolve_tier(tier))),
+        running_mode=VisionRunningMode.VIDEO
+    )
+    return PoseLandmarker.create_from_options(options)
+
+class PoseDetectorSession:
+    """
+    One user's pose tracker: its own VIDEO-mode landmarker and its own
+    monotonic clock, so MediaPipe's tracking state is never shared between
+    interleaved users.
+
+    With ROI tracking on, frames are cropped around the previous pose.
+    MediaPipe's VIDEO mode tracks in the previous image's coordinates, so
+    crops go through a second landmarker that only ever sees one fixed
+    box; it is rebuilt whenever the box moves. The full-frame landmarker
+    keeps its own timeline: it finds the pose when there is no box, and
+    retries a frame whose crop missed or came back low-confidence.
+
+    The model tier starts at `max_tier` and is stepped down/up by a
+    TierController from measured detection latency; the landmarker is
+    rebuilt on the detecting thread when the tier changes.
+    """
+
+    def __init__(self, roi_tracking=None, max_tier=None, latency_budget_ms=None):
+        self.landmarker = None
+        self.landmarker_tier = None
+        # ROI tracking only: the crop landmarker and the box it has seen
+        self.crop_landmarker = None
+        self.crop_roi = None
+        self.last_timestamp_ms = -1
+        self.frames = 0
+
+        self._max_tier = max_tier
+        self.tiers = TierController(max_tier, latency_budget_ms)
+
+        if roi_tracking is None:
+            roi_tracking = ROI_TRACKING
+        self.roi = RoiTracker() if roi_tracking else None
+
+        self._clock_origin = time.monotonic()
+        self._lock = threading.Lock()  # landmarker is not safe for concurrent calls
+
+    def next_timestamp_ms(self):
+        # VIDEO mode requires strictly increasing timestamps
+        timestamp_ms = int((time.monotonic() - self._clock_origin) * 1000)
+        if timestamp_ms <= self.last_timestamp_ms:
+            timestamp_ms = self.last_timestamp_ms + 1
+        self.last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+
+    @property
+    def max_tier(self):
+        """The tier ceiling as resolved against the installed models."""
+        return self.tiers.max_tier
+
+    def set_max_tier(self, tier):
+        """
+        Sets the tier ceiling (e.g. from vision_complexity); applied on the
+        next frame and kept across reset().
+        """
+        # detect() may be running on an inference thread
+        with self._lock:
+            self._max_tier = tier
+            self.tiers.set_max_tier(tier)
+
+    def reset(self):
+        """
+        Forgets the current user: closes the landmarker (MediaPipe's VIDEO
+        tracking state can't be cleared otherwise) and resets the clock,
+        the ROI tracker and the tier history. The next detect() or warm()
+        builds a fresh landmarker.
+        """
+        with self._lock:
+            self._close_landmarkers()
+            self.last_timestamp_ms = -1
+            self.frames = 0
+            self._clock_origin = time.monotonic()
+            if self.roi is not None:
+                self.roi = RoiTracker()
+            self.tiers = TierController(self._max_tier, self.tiers.budget_ms)
+
+    def _ensure_landmarker(self):
+        if self.landmarker is None or self.landmarker_tier != self.tiers.tier:
+            # Pick up tiers installed since the last build
+            self.tiers.refresh()
+            if self.landmarker is not None:
+                self._close_landmarkers()
+                # New model, new tracking: restart from the full frame
+                if self.roi is not None:
+                    self.roi.reset()
+            self.landmarker = create_landmarker(self.tiers.tier)
+            self.landmarker_tier = self.tiers.tier
+
+    def warm(self, size=(256, 256)):
+        """
+        Builds the landmarker and runs one blank frame through it, so the
+        first real frame doesn't pay for graph and delegate init. The
+        latency isn't recorded, so it can't move the tier.
+        """
+        with self._lock:
+            self._ensure_landmarker()
+            blank = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+            run_detection(self.landmarker, blank, self.next_timestamp_ms())
+
+    def detect(self, frame):
+        """Returns the first detected pose in a BGR frame, or None."""
+        with self._lock:
+            self._ensure_landmarker()
+            self.frames += 1
+
+            started = time.perf_counter()
+            landmarks = self._detect(frame)
+            self.tiers.record((time.perf_counter() - started) * 1000)
+            return landmarks
+
+    def _detect(self, frame):
+        if self.roi is None:
+            return run_detection(self.landmarker, frame, self.next_timestamp_ms())
+
+        image, roi = self.roi.crop(frame)
+        if roi is None:
+            landmarks = run_detection(self.landmarker, image, self.next_timestamp_ms())
+        else:
+            if roi != self.crop_roi:
+                # A new box is a new image space: start its tracking afresh
+                self._close_crop_landmarker()
+                self.crop_landmarker = create_landmarker(self.landmarker_tier)
+                self.crop_roi = roi
+            landmarks = self.roi.to_frame(
+                run_detection(self.crop_landmarker, image, self.next_timestamp_ms()), roi, frame.shape
+            )
+            if not self.roi.confident(landmarks):
+                # Lost the user in the crop: retry on the full-frame timeline
+                self.roi.reset()
+                image, _ = self.roi.crop(frame)
+                landmarks = run_detection(self.landmarker, image, self.next_timestamp_ms())
+
+        self.roi.update(landmarks, frame.shape)
+        return landmarks
+
+    def _close_crop_landmarker(self):
+        if self.crop_landmarker is not None:
+            self.crop_landmarker.close()
+            self.crop_landmarker = None
+        self.crop_roi = None
+
+    def _close_landmarkers(self):
+        self._close_crop_landmarker()
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
+            self.landmarker_tier = None
+
+    def close(self):
+        with self._lock:
+            self._close_landmarkers()
+
+    def stats(self):
+        return {"frames": self.frames, **self.tiers.stats()}
+
+def get_default_session():
+    global _default_session
+    if _default_session is None:
+        _default_session = PoseDetectorSession()
+    return _default_session
 
 def get_landmarker():
-    global landmarker
-    if landmarker is None:
-        if not os.path.exists(model_path):
-             download_model()
-            
-        options = PoseLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=model_path),
-            running_mode=VisionRunningMode.VIDEO
-        )
-        landmarker = PoseLandmarker.create_from_options(options)
-    return landmarker
-
-def detect_pose(frame, draw=True, joint_colors=None):
-    global last_timestamp_ms
-    detector = get_landmarker()
-    
-    # Convert to RGB and mp Image
+    session = get_default_session()
+    with session._lock:
+        session._ensure_landmarker()
+    return session.landmarker
+
+def run_detection(detector, frame, timestamp_ms):
+    """Runs one BGR frame through `detector` and returns the first pose (or None)."""
     rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-    
-    # Detect (VIDEO mode requires strictly increasing timestamp)
-    timestamp_ms = int(time.time() * 1000)
-    if timestamp_ms <= last_timestamp_ms:
-        timestamp_ms = last_timestamp_ms + 1
-    last_timestamp_ms = timestamp_ms
-    
+
     detection_result = detector.detect_for_video(mp_image, timestamp_ms)
-    
     landmarks_list = detection_result.pose_landmarks
+    return landmarks_list[0] if landmarks_list else None
+
+def detect_landmarks(frame, session=None):
+    """Detection only, no drawing; returns just the landmarks so executor results stay small."""
+    if session is None:
+        session = get_default_session()
+    return session.detect(frame)
+
+def detect_pose(frame, draw=True, joint_colors=None, session=None):
+    if session is None:
+        session = get_default_session()
+
+    landmarks = session.detect(frame)
     
-    landmarks = None
-    if landmarks_list:
-        landmarks = landmarks_list[0] # First person
+    if landmarks and draw:
+        draw_landmarks(frame, landmarks, joint_colors)
+
+    return frame, landmarks
+
+def draw_landmarks(frame, landmarks, joint_colors=None):
+    """Draws the skeleton in place; joints in `joint_colors` get that color and a ring."""
+    if landmarks:
+        h, w, _ = frame.shape
         
-        if draw:
-            h, w, _ = frame.shape
+        # Draw Connections
+        for start_idx, end_idx in POSE_CONNECTIONS:
+            if start_idx < len(landmarks) and end_idx < len(landmarks):
+                lm1 = landmarks[start_idx]
+                lm2 = landmarks[end_idx]
+                x1, y1 = int(lm1.x * w), int(lm1.y * h)
+                x2, y2 = int(lm2.x * w), int(lm2.y * h)
+                cv2.line(frame, (x1, y1), (x2, y2), (255, 255, 255), 2)
+        
+        # Draw Landmarks
+        for idx, lm in enumerate(landmarks):
+            cx, cy = int(lm.x * w), int(lm.y * h)
+            color = (0, 255, 0)
+            if joint_colors and idx in joint_colors:
+                color = joint_colors[idx]
             
-            # Draw Connections
-            for start_idx, end_idx in POSE_CONNECTIONS:
-                if start_idx < len(landmarks) and end_idx < len(landmarks):
-                    lm1 = landmarks[start_idx]
-                    lm2 = landmarks[end_idx]
-                    x1, y1 = int(lm1.x * w), int(lm1.y * h)
-                    x2, y2 = int(lm2.x * w), int(lm2.y * h)
-                    cv2.line(frame, (x1, y1), (x2, y2), (255, 255, 255), 2)
+            cv2.circle(frame, (cx, cy), 4, color, -1)
             
-            # Draw Landmarks
-            for idx, lm in enumerate(landmarks):
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                color = (0, 255, 0)
-                if joint_colors and idx in joint_colors:
-                    color = joint_colors[idx]
-                
-                cv2.circle(frame, (cx, cy), 4, color, -1)
-                
-                if joint_colors and idx in joint_colors:
-                     cv2.circle(frame, (cx, cy), 10, color, 2)
+            if joint_colors and idx in joint_colors:
+                 cv2.circle(frame, (cx, cy), 10, color, 2)
 
-    return frame, landmarks
+    return frame
@@ -0,0 +1,78 @@
+import math
+import time
+
+from .landmark_array import landmarks_to_array
+
+# Named joint angles as (a, vertex, c) landmark indices
+JOINT_ANGLES = {
+    "left_elbow": (11, 13, 15),
+    "right_elbow": (12, 14, 16),
+    "left_hip": (11, 23, 25),
+    "right_hip": (12, 24, 26),
+    "left_knee": (23, 25, 27),
+    "right_knee": (24, 26, 28),
+    # Shoulder-hip-ankle line, straight (~180) in a plank
+    "left_body": (11, 23, 27),
+    "right_body": (12, 24, 28),
+}
+
+
+class PoseFrame:
+    """
+    One frame's pose, shared by every exercise evaluator: a (33, 4) array
+    of normalized x, y, z, visibility plus the frame size and capture
+    timestamp.
+
+    Joint angles are measured in pixels, so a 16:9 frame doesn't skew
+    them, and cached per frame: however many consumers ask for the left
+    knee, it is computed once.
+    """
+
+    __slots__ = ['points', 'width', 'height', 'timestamp', '_pixels', '_angles']
+
+    def __init__(self, landmarks, width=1, height=1, timestamp=None):
+        self.points = landmarks_to_array(landmarks)
+        self.width = width
+        self.height = height
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._pixels = None
+        self._angles = {}
+
+    def x(self, idx):
+        return float(self.points[idx, 0])
+
+    def y(self, idx):
+        return float(self.points[idx, 1])
+
+    def visibility(self, idx):
+        return float(self.points[idx, 3])
+
+    def distance(self, i, j):
+        """Distance between two landmarks in normalized coordinates."""
+        return math.hypot(self.x(i) - self.x(j), self.y(i) - self.y(j))
+
+    def angle(self, joint, b=None, c=None):
+        """
+        Angle in degrees at the vertex of a named joint from JOINT_ANGLES,
+        or of an explicit `angle(a, b, c)` index triplet. A zero-length arm
+        gives 0.0.
+        """
+        key = JOINT_ANGLES[joint] if b is None else (joint, b, c)
+        cached = self._angles.get(key)
+        if cached is None:
+            cached = self._angles[key] = self._angle(*key)
+        return cached
+
+    def _angle(self, a, b, c):
+        if self._pixels is None:
+            # One conversion per frame; the angle math below is plain floats
+            self._pixels = (self.points[:, :2] * (self.width, self.height)).tolist()
+        (ax, ay), (bx, by), (cx, cy) = self._pixels[a], self._pixels[b], self._pixels[c]
+        bax, bay = ax - bx, ay - by
+        bcx, bcy = cx - bx, cy - by
+
+        norms = math.hypot(bax, bay) * math.hypot(bcx, bcy)
+        if norms == 0:
+            return 0.0
+        cosine = max(-1.0, min(1.0, (bax * bcx + bay * bcy) / norms))
+        return math.degrees(math.acos(cosine))
@@ -0,0 +1,143 @@
+import cv2
+import numpy as np
+
+
+class RoiLandmark:
+    """A landmark mapped back from crop to full-frame normalized coordinates."""
+
+    __slots__ = ['x', 'y', 'z', 'visibility', 'presence']
+
+    def __init__(self, x, y, z, visibility, presence):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.visibility = visibility
+        self.presence = presence
+
+
+class RoiTracker:
+    """
+    Crops each frame around the pose found in the previous one.
+
+    The landmark bounding box (visible landmarks only) is padded by
+    `margin` on every side and reused for following frames until the body
+    leaves its inner part, so the crop stays steady while the user moves
+    a little. Crops are downscaled so their longer side is at most
+    `max_side`. The detector then works on a small image in which the user
+    fills most of the frame. That is cheaper, and more accurate for users
+    far from the camera.
+
+    The tracker resets, and the next detection runs on the full frame,
+    when no pose is found or mean visibility drops below `min_visibility`.
+    It also resets when the box would cover most of the frame anyway.
+    """
+
+    def __init__(self, margin=0.25, max_side=512, min_visibility=0.5, max_coverage=0.8):
+        self.margin = margin
+        self.max_side = max_side
+        self.min_visibility = min_visibility
+        self.max_coverage = max_coverage
+
+        self.roi = None  # (x0, y0, x1, y1) in full-frame pixels
+
+        self.crops = 0
+        self.full_frames = 0
+
+    def reset(self):
+        self.roi = None
+
+    # ------------------ CROP ------------------
+    def crop(self, frame):
+        """
+        Returns (image, roi) to detect on: the downscaled crop and its box,
+        or the full frame and None when there is nothing to track.
+        """
+        if self.roi is None:
+            self.full_frames += 1
+            return frame, None
+
+        x0, y0, x1, y1 = self.roi
+        image = frame[y0:y1, x0:x1]
+
+        scale = self.max_side / max(x1 - x0, y1 - y0)
+        if scale < 1.0:
+            size = (max(1, int((x1 - x0) * scale)), max(1, int((y1 - y0) * scale)))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        else:
+            # MediaPipe wants a contiguous buffer, which a slice isn't
+            image = np.ascontiguousarray(image)
+
+        self.crops += 1
+        return image, self.roi
+
+    def to_frame(self, landmarks, roi, frame_shape):
+        """Maps landmarks normalized to the crop `roi` back to the full frame."""
+        if roi is None or landmarks is None:
+            return landmarks
+
+        h, w = frame_shape[:2]
+        x0, y0, x1, y1 = roi
+        sx, sy = (x1 - x0) / w, (y1 - y0) / h
+        ox, oy = x0 / w, y0 / h
+
+        # z shares x's scale in MediaPipe's normalized output
+        return [
+            RoiLandmark(
+                ox + lm.x * sx,
+                oy + lm.y * sy,
+                lm.z * sx,
+                getattr(lm, "visibility", 1.0),
+                getattr(lm, "presence", 1.0),
+            )
+            for lm in landmarks
+        ]
+
+    # ------------------ TRACK ------------------
+    def confident(self, landmarks):
+        if not landmarks:
+            return False
+        visibility = [getattr(lm, "visibility", 1.0) or 0.0 for lm in landmarks]
+        return float(np.mean(visibility)) >= self.min_visibility
+
+    def update(self, landmarks, frame_shape):
+        """Chooses the crop for the next frame from this frame's full-frame landmarks."""
+        if not self.confident(landmarks):
+            self.roi = None
+            return
+
+        h, w = frame_shape[:2]
+        pts = np.array([(lm.x, lm.y, getattr(lm, "visibility", 1.0) or 0.0) for lm in landmarks])
+        visible = pts[pts[:, 2] >= self.min_visibility]
+        if len(visible) < 2:
+            visible = pts
+
+        bx0, by0 = visible[:, 0].min() * w, visible[:, 1].min() * h
+        bx1, by1 = visible[:, 0].max() * w, visible[:, 1].max() * h
+
+        # Keep the current crop while the body stays inside its inner part
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            # Half of the padding on each side is slack before the crop moves
+            slack = self.margin / (1 + 2 * self.margin) / 2
+            ix, iy = (x1 - x0) * slack, (y1 - y0) * slack
+            if bx0 >= x0 + ix and by0 >= y0 + iy and bx1 <= x1 - ix and by1 <= y1 - iy:
+                return
+
+        pad_x = (bx1 - bx0) * self.margin
+        pad_y = (by1 - by0) * self.margin
+        x0 = int(max(0, bx0 - pad_x))
+        y0 = int(max(0, by0 - pad_y))
+        x1 = int(min(w, bx1 + pad_x))
+        y1 = int(min(h, by1 + pad_y))
+
+        if x1 - x0 < 16 or y1 - y0 < 16 or (x1 - x0) * (y1 - y0) > self.max_coverage * w * h:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+
+    def stats(self):
+        return {
+            "roi": self.roi,
+            "crops": self.crops,
+            "full_frames": self.full_frames,
+        }
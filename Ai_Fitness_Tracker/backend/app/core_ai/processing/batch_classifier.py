@@ -0,0 +1,163 @@
+import asyncio
+import threading
+
+# Defaults; the API overrides them from Settings at startup
+_max_batch_size = 32
+_max_wait_ms = 2.0
+
+_batchers = {}
+_lock = threading.Lock()
+
+
+def configure_batching(max_batch_size=32, max_wait_ms=2.0):
+    """Sets the batch limits used by classifiers created or reconfigured from now on."""
+    global _max_batch_size, _max_wait_ms
+    _max_batch_size = max(1, int(max_batch_size))
+    _max_wait_ms = max(0.0, float(max_wait_ms))
+
+    with _lock:
+        for batcher in _batchers.values():
+            batcher.max_batch_size = _max_batch_size
+            batcher.max_wait_ms = _max_wait_ms
+
+
+def get_batch_classifier(key, model):
+    """
+    Returns the process-wide BatchClassifier for `key` (normally the model
+    path), so every session using that model shares one batch. A new model
+    object for the same key (e.g. after a reload) replaces the old one.
+    """
+    with _lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = BatchClassifier(model, _max_batch_size, _max_wait_ms)
+            _batchers[key] = batcher
+        elif batcher.model is not model:
+            # Rows already queued were built for the old model's columns
+            batcher._flush()
+            batcher.model = model
+        return batcher
+
+
+class BatchClassifier:
+    """
+    Micro-batches predict_proba calls from many sessions.
+
+    submit() parks a feature row with its future and event loop. The batch
+    is flushed as soon as it holds max_batch_size rows, or max_wait_ms
+    after its first row arrived, with a single predict_proba over the
+    stacked rows on a vision thread (never on an event loop); each caller's
+    future is then resolved on its own loop. Tree ensembles cost far less
+    per row in a batch, so throughput scales with concurrent sessions while
+    a lone session waits at most max_wait_ms extra.
+
+    Pending rows may come from several loops and threads, so they are only
+    touched under a lock.
+    """
+
+    def __init__(self, model, max_batch_size=32, max_wait_ms=2.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._lock = threading.Lock()
+        self._pending = []  # (row, future, loop)
+        # Bumped on every flush; a timer armed for an earlier batch does nothing
+        self._generation = 0
+        self._timer_loops = set()  # loops with a timer armed for this batch
+
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, row):
+        """Queues one feature row (1-D, in model column order) and awaits its probabilities."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        with self._lock:
+            self._pending.append((row, future, loop))
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take_batch()
+            else:
+                batch = None
+                # Each loop arms its own timer, so its rows never depend on
+                # another loop staying alive
+                if loop not in self._timer_loops:
+                    self._timer_loops.add(loop)
+                    loop.call_later(self.max_wait_ms / 1000, self._on_timer, self._generation)
+
+        if batch is not None:
+            self._dispatch(*batch)
+        return await future
+
+    def _on_timer(self, generation):
+        with self._lock:
+            if generation != self._generation:
+                return  # that batch already went out full
+            batch = self._take_batch()
+        self._dispatch(*batch)
+
+    def _take_batch(self):
+        # Caller holds self._lock
+        pending, self._pending = self._pending, []
+        self._generation += 1
+        self._timer_loops = set()
+        return self.model, pending
+
+    def _flush(self):
+        """Sends whatever is pending now, e.g. before the model is swapped."""
+        with self._lock:
+            batch = self._take_batch()
+        self._dispatch(*batch)
+
+    def _dispatch(self, model, pending):
+        if not pending:
+            return
+        from ..executor import get_thread_executor
+
+        try:
+            get_thread_executor().submit(self._predict, model, pending)
+        except RuntimeError:
+            # Executor shut down (server stopping): answer inline
+            self._predict(model, pending)
+
+    def _predict(self, model, pending):
+        # The API imports this module for configure_batching(); NumPy is
+        # only needed once a session actually classifies
+        import numpy as np
+
+        with self._lock:
+            self.batches += 1
+            self.rows += len(pending)
+
+        try:
+            probs = model.predict_proba(np.vstack([row for row, _, _ in pending]))
+            results = [(p, None) for p in probs]
+        except Exception as e:
+            results = [(None, e)] * len(pending)
+
+        for (_, future, loop), (p, error) in zip(pending, results):
+            try:
+                loop.call_soon_threadsafe(_settle, future, p, error)
+            except RuntimeError:
+                pass  # that loop is closed; nobody is waiting
+
+    def stats(self):
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "rows": self.rows,
+                "avg_batch_size": self.rows / self.batches if self.batches else 0.0,
+                "pending": len(self._pending),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+
+def _settle(future, result, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
@@ -0,0 +1,188 @@
+import os
+
+from .feature_extractor import FEATURE_NAMES, resolve_features
+from .scoring import ScoringRule, SQUAT_RULES
+
+MODEL_DIR = os.path.dirname(__file__)
+
+
+class ExerciseSpec:
+    """
+    Everything the Pipeline needs to know about one exercise.
+
+    name        canonical name (also what the classifier is trained for)
+    landmarks   MediaPipe indices the exercise relies on; drawn on the overlay
+    features    features to compute every frame (rep metric, rule and
+                classifier inputs are added automatically)
+    rep         (metric, down_threshold, up_threshold) for RepCounter, or
+                None for timed holds
+    classifier  model file in core_ai/processing, or None for rules only
+    rules       ScoringRules applied on top of the classifier
+    """
+
+    def __init__(self, name, landmarks, features=(), rep=None, classifier=None, rules=(), aliases=()):
+        self.name = name
+        self.landmarks = tuple(landmarks)
+        self.features = tuple(features)
+        self.rep = rep
+        self.classifier = classifier
+        self.rules = list(rules)
+        self.aliases = tuple(aliases)
+
+    @property
+    def rep_metric(self):
+        return self.rep[0] if self.rep else None
+
+    @property
+    def classifier_path(self):
+        return os.path.join(MODEL_DIR, self.classifier) if self.classifier else None
+
+    def required_features(self, extra=()):
+        """Extractor features for this exercise: declared, rep metric, rules and `extra`."""
+        names = list(self.features) + list(extra)
+        if self.rep_metric:
+            names.append(self.rep_metric)
+        for rule in self.rules:
+            names.extend(rule.features)
+        return resolve_features(names)
+
+
+_EXERCISES = {}
+_ALIASES = {}
+
+
+def register_exercise(spec):
+    _EXERCISES[spec.name] = spec
+    for alias in (spec.name,) + spec.aliases:
+        _ALIASES[_normalize(alias)] = spec.name
+    return spec
+
+
+def get_exercise(name):
+    """Looks up a spec by name or alias; unknown names get the generic spec."""
+    key = _ALIASES.get(_normalize(name or ""))
+    return _EXERCISES[key] if key else GENERIC
+
+
+def list_exercises():
+    return list(_EXERCISES)
+
+
+def _normalize(name):
+    return name.strip().lower().replace("-", "_").replace(" ", "_")
+
+
+# ----------- LANDMARK GROUPS -----------
+SHOULDERS = (11, 12)
+ARMS = (13, 14, 15, 16)
+HIPS = (23, 24)
+LEGS = (25, 26, 27, 28)
+
+
+# ----------- EXERCISES -----------
+register_exercise(ExerciseSpec(
+    "squat",
+    landmarks=SHOULDERS + HIPS + LEGS,
+    features=('knee_avg', 'hip_avg'),
+    rep=('knee_avg', 100, 160),
+    classifier="squat_classifier.pkl",
+    rules=SQUAT_RULES,
+    aliases=("squats",),
+))
+
+register_exercise(ExerciseSpec(
+    "pushup",
+    landmarks=SHOULDERS + ARMS + HIPS + LEGS,
+    features=('left_elbow_angle', 'right_elbow_angle'),
+    rep=('left_elbow_angle', 100, 160),
+    rules=[
+        ScoringRule(
+            "Keep your body in a straight line", 15, ('left_body_angle',),
+            lambda f: f.get('left_body_angle', 180) < 160
+        ),
+    ],
+    aliases=("pushups", "push_up", "push_ups"),
+))
+
+register_exercise(ExerciseSpec(
+    "plank",
+    landmarks=SHOULDERS + HIPS + (27, 28),
+    rules=[
+        ScoringRule(
+            "Keep hips in line with shoulders", 20, ('left_body_angle',),
+            lambda f: f.get('left_body_angle', 180) < 160
+        ),
+    ],
+))
+
+register_exercise(ExerciseSpec(
+    "chair_pose",
+    landmarks=HIPS + LEGS,
+    rules=[
+        ScoringRule(
+            "Bend your knees to 90-120 degrees", 15, ('knee_avg',),
+            lambda f: not 90 <= f.get('knee_avg', 180) <= 120
+        ),
+    ],
+    aliases=("chair",),
+))
+
+register_exercise(ExerciseSpec(
+    "tree_pose",
+    landmarks=HIPS + LEGS,
+    rules=[
+        ScoringRule(
+            "Straighten your standing leg", 15, ('left_knee_angle',),
+            lambda f: f.get('left_knee_angle', 180) < 160
+        ),
+        ScoringRule(
+            "Raise your other knee higher", 15, ('right_knee_angle',),
+            lambda f: f.get('right_knee_angle', 180) > 120
+        ),
+    ],
+    aliases=("tree",),
+))
+
+register_exercise(ExerciseSpec(
+    "warrior_pose",
+    landmarks=SHOULDERS + ARMS + HIPS + LEGS,
+    rules=[
+        ScoringRule(
+            "Bend front knee to 90 degrees", 15, ('left_knee_angle', 'right_knee_angle'),
+            lambda f: min(f.get('left_knee_angle', 180), f.get('right_knee_angle', 180)) > 110
+        ),
+        ScoringRule(
+            "Straighten your back leg", 10, ('left_knee_angle', 'right_knee_angle'),
+            lambda f: max(f.get('left_knee_angle', 180), f.get('right_knee_angle', 180)) < 160
+        ),
+    ],
+    aliases=("warrior", "warrior_2", "warrior_ii"),
+))
+
+register_exercise(ExerciseSpec(
+    "high_knees",
+    landmarks=SHOULDERS + HIPS + LEGS,
+    # One rep per left-knee drive
+    rep=('left_hip_angle', 100, 160),
+    aliases=("high_knee",),
+))
+
+register_exercise(ExerciseSpec(
+    "meditation",
+    landmarks=SHOULDERS + HIPS,
+    rules=[
+        ScoringRule(
+            "Sit up straight", 10, ('spine_angle',),
+            lambda f: f.get('spine_angle', 0) > 20
+        ),
+    ],
+))
+
+# Unknown exercises: every feature, knee-driven reps, squat rules, no classifier
+GENERIC = ExerciseSpec(
+    "generic",
+    landmarks=range(33),
+    features=FEATURE_NAMES,
+    rep=('knee_avg', 100, 160),
+    rules=SQUAT_RULES,
+)
@@ -1,8 +1,106 @@
 import numpy as np
 
+from ..pose.landmark_array import NUM_LANDMARKS, landmarks_to_array, joint_angles
+
+# ----------- DECLARATIVE FEATURE TABLES -----------
+# (feature, point a, vertex b, point c) -> angle at b
+JOINT_ANGLES = [
+    ('left_knee_angle', 23, 25, 27),
+    ('right_knee_angle', 24, 26, 28),
+    ('left_hip_angle', 11, 23, 25),
+    ('right_hip_angle', 12, 24, 26),
+    ('left_elbow_angle', 11, 13, 15),
+    ('right_elbow_angle', 12, 14, 16),
+    ('left_body_angle', 11, 23, 27),    # shoulder-hip-ankle line
+    ('right_body_angle', 12, 24, 28),
+]
+
+# (feature, landmark a, landmark b) -> euclidean distance in x/y
+DISTANCES = [
+    ('shoulder_width', 11, 12),
+    ('hip_width', 23, 24),
+    ('torso_length', 11, 23),
+]
+
+# Fixed order of extract_feature_vector()
+FEATURE_NAMES = (
+    [name for name, *_ in JOINT_ANGLES] +
+    ['knee_avg', 'hip_avg'] +
+    [name for name, *_ in DISTANCES] +
+    ['spine_angle', 'torso_lean',
+     'left_knee_lateral', 'right_knee_lateral',
+     'symmetry_score', 'hip_depth']
+)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Landmarks read by the features outside the tables above. On a landmark
+# list shorter than 33, a feature reading a missing landmark is 0.0, as in
+# the per-landmark extractor; the tables get the same treatment by index.
+FEATURE_LANDMARKS = {
+    'spine_angle': (11, 23),
+    'left_knee_lateral': (25, 27),
+    'right_knee_lateral': (26, 28),
+    'hip_depth': (23, 25),
+}
+
+# Derived feature -> features it is computed from
+DEPENDENCIES = {
+    'knee_avg': ('left_knee_angle', 'right_knee_angle'),
+    'hip_avg': ('left_hip_angle', 'right_hip_angle'),
+    'torso_lean': ('spine_angle',),
+    'left_knee_lateral': ('torso_length',),
+    'right_knee_lateral': ('torso_length',),
+    'symmetry_score': ('left_knee_angle', 'right_knee_angle'),
+    'hip_depth': ('torso_length',),
+}
+
+
+def _present(feature, count):
+    """True if a list of `count` landmarks has every landmark `feature` reads."""
+    return count > max(FEATURE_LANDMARKS[feature])
+
+
+def resolve_features(names):
+    """
+    Returns the features needed to produce `names`, dependencies included,
+    in FEATURE_NAMES order. A velocity column `X_vel` needs `X`, which the
+    temporal stage differentiates. Other names this extractor doesn't
+    compute (temporal stats or model-only columns) are ignored.
+    """
+    needed = set()
+    names = [n[:-len('_vel')] if n.endswith('_vel') else n for n in names]
+    pending = [n for n in names if n in FEATURE_INDEX]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(DEPENDENCIES.get(name, ()))
+    return [name for name in FEATURE_NAMES if name in needed]
+
+
 class FeatureExtractor:
-    def __init__(self):
-        pass
+    """
+    Computes pose features from a landmark list. By default every feature
+    in FEATURE_NAMES is produced; pass `features` to compute only those
+    (plus what they depend on) and skip the rest of the per-frame work.
+    """
+
+    def __init__(self, features=None):
+        self.feature_names = list(FEATURE_NAMES) if features is None else resolve_features(features)
+        self.feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        self.num_features = len(self.feature_names)
+
+        idx = self.feature_index
+        angles = [row for row in JOINT_ANGLES if row[0] in idx]
+        self._angle_a = np.array([a for _, a, _, _ in angles], dtype=np.intp)
+        self._angle_b = np.array([b for _, _, b, _ in angles], dtype=np.intp)
+        self._angle_c = np.array([c for _, _, _, c in angles], dtype=np.intp)
+        self._angle_slots = np.array([idx[name] for name, *_ in angles], dtype=np.intp)
+
+        dists = [row for row in DISTANCES if row[0] in idx]
+        self._dist_a = np.array([a for _, a, _ in dists], dtype=np.intp)
+        self._dist_b = np.array([b for _, _, b in dists], dtype=np.intp)
+        self._dist_slots = np.array([idx[name] for name, *_ in dists], dtype=np.intp)
 
     def to_np(self, lm):
         return np.array([lm.x, lm.y]) if lm else None
@@ -11,95 +109,90 @@ class FeatureExtractor:
         if a is None or b is None or c is None:
             return 0.0
 
-        a, b, c = self.to_np(a), self.to_np(b), self.to_np(c)
-
-        ba = a - b
-        bc = c - b
-
-        norm_ba = np.linalg.norm(ba)
-        norm_bc = np.linalg.norm(bc)
-
-        if norm_ba == 0 or norm_bc == 0:
-            return 0.0
-
-        cosine = np.dot(ba, bc) / (norm_ba * norm_bc)
-        cosine = np.clip(cosine, -1.0, 1.0)
-
-        return np.degrees(np.arccos(cosine))
-
-    def extract_features(self, landmarks):
-        if not landmarks:
-            return {}
-
-        def get_lm(idx):
-            return landmarks[idx] if idx < len(landmarks) else None
-
-        features = {}
+        points = np.array([self.to_np(a), self.to_np(b), self.to_np(c)])
+        return float(joint_angles(points, [0], [1], [2])[0])
+
+    def to_array(self, landmarks):
+        """(33, 4) float64 array; missing trailing landmarks are zero rows."""
+        arr = landmarks_to_array(landmarks, dtype=np.float64)
+        if arr.shape[0] < NUM_LANDMARKS:
+            arr = np.vstack([arr, np.zeros((NUM_LANDMARKS - arr.shape[0], arr.shape[1]))])
+        return arr
+
+    def extract_feature_vector(self, landmarks, out=None):
+        """
+        The selected features as one float64 vector in feature_names order,
+        computed with batched array ops over the full landmark array.
+        """
+        vec = out if out is not None else np.zeros(self.num_features)
+        if landmarks is None or len(landmarks) == 0:
+            vec[:] = 0.0
+            return vec
+
+        count = len(landmarks)
+        xy = self.to_array(landmarks)[:, :2]
+        i = self.feature_index
 
         # ----------- JOINT ANGLES -----------
-        l_sh, r_sh = get_lm(11), get_lm(12)
-        l_hip, r_hip = get_lm(23), get_lm(24)
-        l_knee, r_knee = get_lm(25), get_lm(26)
-        l_ankle, r_ankle = get_lm(27), get_lm(28)
-
-        features['left_knee_angle'] = self.calculate_angle(l_hip, l_knee, l_ankle)
-        features['right_knee_angle'] = self.calculate_angle(r_hip, r_knee, r_ankle)
-
-        features['left_hip_angle'] = self.calculate_angle(l_sh, l_hip, l_knee)
-        features['right_hip_angle'] = self.calculate_angle(r_sh, r_hip, r_knee)
+        if self._angle_slots.size:
+            angles = joint_angles(xy, self._angle_a, self._angle_b, self._angle_c)
+            if count < NUM_LANDMARKS:
+                # Absent landmarks give 0.0, as before
+                angles[(self._angle_a >= count) | (self._angle_b >= count) | (self._angle_c >= count)] = 0.0
+            vec[self._angle_slots] = angles
 
         # ----------- AGGREGATED (IMPORTANT FOR ML) -----------
-        features['knee_avg'] = (features['left_knee_angle'] + features['right_knee_angle']) / 2
-        features['hip_avg'] = (features['left_hip_angle'] + features['right_hip_angle']) / 2
+        if 'knee_avg' in i:
+            vec[i['knee_avg']] = (vec[i['left_knee_angle']] + vec[i['right_knee_angle']]) / 2
+        if 'hip_avg' in i:
+            vec[i['hip_avg']] = (vec[i['left_hip_angle']] + vec[i['right_hip_angle']]) / 2
 
         # ----------- BODY NORMALIZATION -----------
-        def dist(a, b):
-            if a is None or b is None:
-                return 0.0
-            return np.linalg.norm(self.to_np(a) - self.to_np(b))
-
-        shoulder_width = dist(l_sh, r_sh)
-        hip_width = dist(l_hip, r_hip)
-        torso_length = dist(l_sh, l_hip)
-
-        features['shoulder_width'] = shoulder_width
-        features['hip_width'] = hip_width
-        features['torso_length'] = torso_length
-
+        if self._dist_slots.size:
+            diff = xy[self._dist_a] - xy[self._dist_b]
+            dists = np.sqrt((diff * diff).sum(axis=1))
+            if count < NUM_LANDMARKS:
+                dists[(self._dist_a >= count) | (self._dist_b >= count)] = 0.0
+            vec[self._dist_slots] = dists
+
+        torso_length = vec[i['torso_length']] if 'torso_length' in i else 0.0
         # Avoid divide-by-zero
         norm_factor = torso_length if torso_length > 0 else 1.0
 
         # ----------- SPINE / POSTURE -----------
-        if l_sh and l_hip:
-            spine_vec = self.to_np(l_sh) - self.to_np(l_hip)
-            vertical = np.array([0, -1])
-            cosine = np.dot(spine_vec, vertical) / (np.linalg.norm(spine_vec) + 1e-6)
-            cosine = np.clip(cosine, -1.0, 1.0)
-            spine_angle = np.degrees(np.arccos(cosine))
-        else:
+        if 'spine_angle' in i:
             spine_angle = 0.0
-
-        features['spine_angle'] = spine_angle
-        features['torso_lean'] = spine_angle / 90.0  # normalized
+            if _present('spine_angle', count):
+                spine_vec = xy[11] - xy[23]
+                cosine = -spine_vec[1] / (np.sqrt(spine_vec @ spine_vec) + 1e-6)  # dot with (0, -1)
+                spine_angle = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+            vec[i['spine_angle']] = spine_angle
+            if 'torso_lean' in i:
+                vec[i['torso_lean']] = spine_angle / 90.0  # normalized
 
         # ----------- KNEE ALIGNMENT -----------
-        if l_knee and l_ankle:
-            features['left_knee_lateral'] = (l_knee.x - l_ankle.x) / norm_factor
-        else:
-            features['left_knee_lateral'] = 0.0
-
-        if r_knee and r_ankle:
-            features['right_knee_lateral'] = (r_knee.x - r_ankle.x) / norm_factor
-        else:
-            features['right_knee_lateral'] = 0.0
+        x, y = xy[:, 0], xy[:, 1]
+        if 'left_knee_lateral' in i:
+            vec[i['left_knee_lateral']] = (
+                (x[25] - x[27]) / norm_factor if _present('left_knee_lateral', count) else 0.0
+            )
+        if 'right_knee_lateral' in i:
+            vec[i['right_knee_lateral']] = (
+                (x[26] - x[28]) / norm_factor if _present('right_knee_lateral', count) else 0.0
+            )
 
         # ----------- SYMMETRY -----------
-        features['symmetry_score'] = abs(features['left_knee_angle'] - features['right_knee_angle'])
+        if 'symmetry_score' in i:
+            vec[i['symmetry_score']] = abs(vec[i['left_knee_angle']] - vec[i['right_knee_angle']])
 
         # ----------- HIP DEPTH (CRITICAL FOR SQUATS) -----------
-        if l_hip and l_knee:
-            features['hip_depth'] = (l_hip.y - l_knee.y) / norm_factor
-        else:
-            features['hip_depth'] = 0.0
+        if 'hip_depth' in i:
+            vec[i['hip_depth']] = (y[23] - y[25]) / norm_factor if _present('hip_depth', count) else 0.0
+
+        return vec
+
+    def extract_features(self, landmarks):
+        if not landmarks:
+            return {}
 
-        return features
\ No newline at end of file
+        return dict(zip(self.feature_names, self.extract_feature_vector(landmarks).tolist()))
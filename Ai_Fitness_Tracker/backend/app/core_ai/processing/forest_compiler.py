@@ -0,0 +1,158 @@
+import numpy as np
+
+
+class CompiledForest:
+    """
+    A fitted sklearn forest classifier flattened into contiguous arrays.
+
+    Every tree's nodes are concatenated into one set of arrays (feature,
+    threshold, left, right, value), with child indices rewritten to global
+    node ids. Leaves point back at themselves, so all trees can be walked
+    together for a fixed number of steps: each step is one gather and one
+    comparison over a (rows x trees) matrix of node ids, with no Python
+    loop over trees or rows. Batches of rows from many sessions cost
+    little more than a single row.
+
+    Exposes the small part of the sklearn interface the ML layer uses:
+    classes_, n_features_in_, predict_proba() and predict().
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth, classes, feature_names=None):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+
+        # children[2 * node + went_left]: one gather per step instead of np.where
+        self._children = np.stack([self.right, self.left], axis=1).ravel()
+
+        self.classes_ = np.asarray(classes)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.n_features_in_ = int(self.feature.max()) + 1 if self.feature.size else 0
+        if self.feature_names is not None:
+            self.n_features_in_ = max(self.n_features_in_, len(self.feature_names))
+
+    # ------------------ BUILD ------------------
+    @classmethod
+    def from_sklearn(cls, model):
+        """Flattens a fitted RandomForestClassifier / ExtraTreesClassifier."""
+        estimators = getattr(model, "estimators_", None)
+        if not estimators:
+            raise ValueError("Model is not a fitted tree ensemble")
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Multi-output forests are not supported")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for est in estimators:
+            tree = est.tree_
+            n = tree.node_count
+            node_ids = np.arange(n, dtype=np.int64) + offset
+            is_leaf = tree.children_left < 0
+
+            left = np.where(is_leaf, node_ids, tree.children_left + offset)
+            right = np.where(is_leaf, node_ids, tree.children_right + offset)
+
+            # Leaves compare feature 0 against +inf and step to themselves
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(left)
+            rights.append(right)
+
+            # Per-node class distribution, normalized the way predict_proba does
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            values.append(value / totals)
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        names = getattr(model, "feature_names_in_", None)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.array(roots),
+            max_depth=max_depth,
+            classes=model.classes_,
+            feature_names=[str(n) for n in names] if names is not None else None,
+        )
+
+    # ------------------ PERSISTENCE ------------------
+    def save(self, path):
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            max_depth=np.array(self.max_depth),
+            classes=self.classes_,
+            feature_names=np.array(self.feature_names if self.feature_names is not None else [], dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            names = data["feature_names"]
+            return cls(
+                feature=data["feature"],
+                threshold=data["threshold"],
+                left=data["left"],
+                right=data["right"],
+                value=data["value"],
+                roots=data["roots"],
+                max_depth=int(data["max_depth"]),
+                classes=data["classes"],
+                feature_names=[str(n) for n in names] if names.size else None,
+            )
+
+    # ------------------ INFERENCE ------------------
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """Returns the leaf node id reached in every tree, shape (rows, trees)."""
+        # sklearn evaluates trees on float32 input against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        n_rows, n_cols = X.shape
+        flat = np.ascontiguousarray(X).ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_cols)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.n_trees))
+
+        for _ in range(self.max_depth):
+            go_left = flat[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self._children[2 * nodes + go_left]
+
+        return nodes
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        return self.value[leaves].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def compile_forest(model):
+    """Returns a CompiledForest for tree ensembles, or None if the model isn't one."""
+    try:
+        return CompiledForest.from_sklearn(model)
+    except (AttributeError, ValueError):
+        return None
@@ -1,24 +1,46 @@
-import pickle
 import numpy as np
 import os
-import pandas as pd
+
+from .batch_classifier import get_batch_classifier
+from .model_registry import model_registry
+
+
+def fallback_result():
+    """Neutral result for exercises (or sessions) without a classifier."""
+    return {
+        "class": 0,
+        "label": "Fallback",
+        "confidence": 1.0,
+        "score": 85.0,
+        "feedback": "Model not loaded"
+    }
+
 
 class MLModelLayer:
-    def __init__(self, model_path=None):
-        self.model = None
+    # Column order for artifacts that don't record their own
+    DEFAULT_FEATURES = [
+        'knee_avg',
+        'hip_avg',
+        'spine_angle',
+        'torso_lean',
+        'symmetry_score',
+        'hip_depth',
+        'left_knee_lateral',
+        'right_knee_lateral'
+    ]
+
+    def __init__(self, model_path=None, debug=None, exercise="squat"):
+        # The only exercise this model's labels describe
+        self.exercise = exercise
+
+        # Per-frame debug dump is opt-in (ML_DEBUG=1 or debug=True)
+        if debug is None:
+            debug = os.getenv("ML_DEBUG", "0").lower() in ("1", "true", "yes")
+        self.debug = debug
 
         if model_path is None:
             model_path = os.path.join(os.path.dirname(__file__), "squat_classifier.pkl")
-
-        if os.path.exists(model_path):
-            try:
-                with open(model_path, 'rb') as f:
-                    self.model = pickle.load(f)
-                print(f"✅ ML Model loaded from {model_path}")
-            except Exception as e:
-                print(f"❌ Failed to load ML model: {e}")
-        else:
-            print(f"❌ Model not found at {model_path}")
+        self.model_path = os.path.abspath(model_path)
 
         # -------- LABEL MAP --------
         self.label_map = {
@@ -50,17 +72,26 @@ class MLModelLayer:
             5: 65
         }
 
-        # -------- IMPORTANT: UPDATED FEATURE SET --------
-        self.feature_cols = [
-            'knee_avg',
-            'hip_avg',
-            'spine_angle',
-            'torso_lean',
-            'symmetry_score',
-            'hip_depth',
-            'left_knee_lateral',
-            'right_knee_lateral'
-        ]
+        # The model itself is loaded once per process and shared
+        self._entry = None
+        self._bind(model_registry.get(self.model_path, self.DEFAULT_FEATURES))
+
+    def _bind(self, entry):
+        """
+        Points this layer at a registry entry (None if no model) and that
+        model's column order.
+        """
+        self._entry = entry
+        self.model = entry.model if entry else None
+        self.forest = entry.forest if entry else None
+        self.classes = entry.classes if entry else None
+        self.feature_cols = entry.feature_cols if entry else list(self.DEFAULT_FEATURES)
+
+    def _refresh(self):
+        # Cheap unless the file changed: picks up hot reloads from the registry
+        entry = model_registry.get(self.model_path, self.DEFAULT_FEATURES)
+        if entry is not self._entry:
+            self._bind(entry)
 
     def predict(self, exercise_name, features):
         """
@@ -70,35 +101,67 @@ class MLModelLayer:
         }
         """
 
-        if not self.model or exercise_name != "squat":
-            return {
-                "class": 0,
-                "label": "Fallback",
-                "confidence": 1.0,
-                "score": 85.0,
-                "feedback": "Model not loaded"
-            }
+        self._refresh()
+        if not self.model or exercise_name != self.exercise:
+            return self._fallback()
 
         try:
             # -------- BUILD INPUT --------
-            row_data = [features.get(col, 0) for col in self.feature_cols]
-            X = pd.DataFrame([row_data], columns=self.feature_cols).astype(np.float32)
+            # Own row per call: predict() runs on executor threads concurrently
+            row = np.fromiter(
+                (features.get(col, 0) for col in self.feature_cols),
+                dtype=np.float32,
+                count=len(self.feature_cols)
+            )
 
             # -------- PREDICTION --------
-            probs = self.model.predict_proba(X)[0]
-            pred_class = int(self.model.predict(X)[0])
-            confidence = float(np.max(probs))
+            # One forest pass: the class is the argmax of predict_proba
+            probs = self._entry.estimator.predict_proba(row[None, :])[0]
+            return self._to_result(probs, row)
 
-            # -------- MAP OUTPUT --------
-            label = self.label_map.get(pred_class, "Unknown")
-            feedback = self.feedback_map.get(pred_class, "Adjust your form")
-            base_score = self.score_map.get(pred_class, 60)
+        except Exception as e:
+            return self._error(e)
 
-            # -------- SMART SCORING --------
-            score = base_score * confidence + (1 - confidence) * 50
-            score = max(0, min(100, score))
+    async def predict_async(self, exercise_name, features):
+        """
+        Same result as predict(), but the row joins the process-wide batch
+        for this model, so concurrent sessions share one predict_proba.
+        """
+        self._refresh()
+        if not self.model or exercise_name != self.exercise:
+            return self._fallback()
 
-            # -------- DEBUG LOG --------
+        try:
+            # Own row per call: it sits in the batch until the flush
+            row = np.fromiter(
+                (features.get(col, 0) for col in self.feature_cols),
+                dtype=np.float32,
+                count=len(self.feature_cols)
+            )
+
+            batcher = get_batch_classifier(self.model_path, self._entry.estimator)
+            probs = await batcher.submit(row)
+            return self._to_result(probs, row)
+
+        except Exception as e:
+            return self._error(e)
+
+    def _to_result(self, probs, row):
+        best = int(np.argmax(probs))
+        pred_class = int(self.classes[best]) if self.classes is not None else best
+        confidence = float(probs[best])
+
+        # -------- MAP OUTPUT --------
+        label = self.label_map.get(pred_class, "Unknown")
+        feedback = self.feedback_map.get(pred_class, "Adjust your form")
+        base_score = self.score_map.get(pred_class, 60)
+
+        # -------- SMART SCORING --------
+        score = base_score * confidence + (1 - confidence) * 50
+        score = max(0, min(100, score))
+
+        # -------- DEBUG LOG --------
+        if self.debug:
             print("\n" + "="*50)
             print(" 🤖 ML INFERENCE (FINAL)")
             print("="*50)
@@ -106,27 +169,30 @@ class MLModelLayer:
             print(f" Confidence: {confidence:.2f}")
             print(f" Score: {score:.2f}")
             print("- Features:")
-            for col, val in zip(self.feature_cols, row_data):
+            for col, val in zip(self.feature_cols, row):
                 print(f"   {col}: {val:.2f}")
             print("="*50 + "\n")
 
-            return {
-                "class": pred_class,
-                "label": label,
-                "confidence": confidence,
-                "score": score,
-                "feedback": feedback
-            }
+        return {
+            "class": pred_class,
+            "label": label,
+            "confidence": confidence,
+            "score": score,
+            "feedback": feedback
+        }
 
-        except Exception as e:
-            print(f"❌ Prediction error: {e}")
-            return {
-                "class": 0,
-                "label": "Error",
-                "confidence": 0.0,
-                "score": 80.0,
-                "feedback": "Prediction failed"
-            }
+    def _fallback(self):
+        return fallback_result()
+
+    def _error(self, e):
+        print(f"❌ Prediction error: {e}")
+        return {
+            "class": 0,
+            "label": "Error",
+            "confidence": 0.0,
+            "score": 80.0,
+            "feedback": "Prediction failed"
+        }
 
     # -------- OPTIONAL: LIGHTWEIGHT EXERCISE DETECTION --------
     def predict_exercise(self, features):
@@ -0,0 +1,143 @@
+import os
+import pickle
+import threading
+import time
+
+from .forest_compiler import CompiledForest, compile_forest
+
+
+class LoadedModel:
+    """
+    One loaded classifier artifact, shared read-only by every session.
+    A reload produces a new LoadedModel; existing ones are never mutated.
+    """
+
+    __slots__ = ['path', 'mtime', 'model', 'forest', 'feature_cols', 'classes']
+
+    def __init__(self, path, mtime, model, feature_cols):
+        self.path = path
+        self.mtime = mtime
+        self.model = model
+        self.feature_cols = feature_cols
+
+        # Tree ensembles are evaluated through the flat-array forest
+        self.forest = model if isinstance(model, CompiledForest) else compile_forest(model)
+        self.classes = getattr(model, "classes_", None)
+
+    @property
+    def estimator(self):
+        return self.forest or self.model
+
+
+def load_model_file(path, default_features=None):
+    """
+    Reads a classifier artifact and returns (model, feature_cols).
+
+    Accepts an exported CompiledForest (.npz), a bare pickled estimator, or
+    the {"model": ..., "features": [...]} dict train_squat_model.py writes.
+    Column order is the artifact's own when it records one.
+    """
+    if path.endswith(".npz"):
+        model = CompiledForest.load(path)
+        return model, model.feature_names or list(default_features or [])
+
+    with open(path, 'rb') as f:
+        obj = pickle.load(f)
+
+    features = None
+    if isinstance(obj, dict):
+        model = obj["model"]
+        features = obj.get("features")
+    else:
+        model = obj
+
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None:
+        features = [str(n) for n in names]
+        # Rows are built in this order, so sklearn's per-call name check
+        # (and its warning for plain arrays) is redundant
+        del model.feature_names_in_
+
+    # Single rows and small batches: no joblib fan-out
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = 1
+
+    return model, list(features or default_features or [])
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of classifier artifacts keyed by absolute path.
+
+    Each file is unpickled once, on first use, and shared by every
+    MLModelLayer in the process. get() stats the file at most every
+    `check_interval` seconds and swaps in a fresh LoadedModel when its
+    mtime changes, so a retrained model is picked up without a restart.
+    Loads are serialized per path; readers of other models never wait.
+    """
+
+    def __init__(self, check_interval=2.0):
+        self.check_interval = check_interval
+
+        self._entries = {}
+        self._checked_at = {}
+        self._failed = {}  # path -> mtime (or None if missing) last reported
+        self._path_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, default_features=None):
+        """Returns the LoadedModel for path, or None if it is missing or fails to load."""
+        path = os.path.abspath(path)
+        entry = self._entries.get(path)
+
+        now = time.monotonic()
+        checked_at = self._checked_at.get(path)
+        if checked_at is not None and now - checked_at < self.check_interval:
+            return entry
+
+        with self._lock_for(path):
+            entry = self._entries.get(path)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                if entry is None and self._failed.get(path, 0) is not None:
+                    print(f"❌ Model not found at {path}")
+                    self._failed[path] = None
+                self._checked_at[path] = now
+                return entry
+
+            stale = entry is None or entry.mtime != mtime
+            if stale and self._failed.get(path, 0) != mtime:
+                try:
+                    model, features = load_model_file(path, default_features)
+                    entry = LoadedModel(path, mtime, model, features)
+                    self._entries[path] = entry
+                    self._failed.pop(path, None)
+                    print(f"✅ ML Model loaded from {path}")
+                except Exception as e:
+                    # Keep serving the previous version; retry once the file changes again
+                    self._failed[path] = mtime
+                    print(f"❌ Failed to load ML model: {e}")
+
+            self._checked_at[path] = now
+            return entry
+
+    def _lock_for(self, path):
+        with self._lock:
+            lock = self._path_locks.get(path)
+            if lock is None:
+                lock = self._path_locks[path] = threading.Lock()
+            return lock
+
+    def evict(self, path):
+        path = os.path.abspath(path)
+        with self._lock:
+            self._entries.pop(path, None)
+            self._checked_at.pop(path, None)
+            self._failed.pop(path, None)
+
+    def loaded(self):
+        return {path: entry.mtime for path, entry in self._entries.items()}
+
+
+model_registry = ModelRegistry()
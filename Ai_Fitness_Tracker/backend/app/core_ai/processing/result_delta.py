@@ -0,0 +1,65 @@
+class ResultDelta:
+    """
+    Turns per-frame Pipeline results into compact updates holding only what
+    changed since the last one sent.
+
+    Values are quantized before comparing (score to whole points,
+    confidence to `confidence_step`), so jitter that a client wouldn't
+    display doesn't cause a message. Feedback is sent as the messages
+    added and removed since the last update, not the whole list.
+
+    With `ml` off (exercises without a classifier) the label, confidence
+    and the classifier's feedback are left out entirely.
+    """
+
+    def __init__(self, confidence_step=0.05, ml=True):
+        self.confidence_step = confidence_step
+        self.ml = ml
+        self.fields = {}
+        self.feedback = []
+        self.has_pose = None
+
+    def _quantize(self, result):
+        fields = {
+            "reps": int(result.get("reps") or 0),
+            "score": int(round(result.get("score") or 0)),
+        }
+        if self.ml:
+            ml = result.get("ml") or {}
+            confidence = ml.get("confidence")
+            if confidence is not None:
+                confidence = round(round(confidence / self.confidence_step) * self.confidence_step, 2)
+            fields["label"] = ml.get("label")
+            fields["confidence"] = confidence
+        return fields
+
+    def update(self, result):
+        """Returns the changed fields for one frame's result, or {} if nothing changed."""
+        delta = {}
+        if self.has_pose is not True:
+            self.has_pose = True
+            delta["pose"] = True
+
+        for key, value in self._quantize(result).items():
+            if self.fields.get(key, object()) != value:
+                self.fields[key] = value
+                delta[key] = value
+
+        # Order-preserving, without blanks (e.g. no ML feedback) or repeats
+        skip = None if self.ml else (result.get("ml") or {}).get("feedback")
+        feedback = list(dict.fromkeys(msg for msg in result.get("feedback") or () if msg and msg != skip))
+        added = [msg for msg in feedback if msg not in self.feedback]
+        removed = [msg for msg in self.feedback if msg not in feedback]
+        if added:
+            delta["feedback_add"] = added
+        if removed:
+            delta["feedback_remove"] = removed
+        self.feedback = feedback
+        return delta
+
+    def no_pose(self):
+        """Delta for a frame without a person: sent once when the pose is lost."""
+        if self.has_pose is False:
+            return {}
+        self.has_pose = False
+        return {"pose": False}
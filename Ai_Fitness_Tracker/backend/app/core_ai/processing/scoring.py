@@ -1,3 +1,41 @@
+class ScoringRule:
+    """
+    One rule-based check: `test(features)` is True when the form is off,
+    which costs `penalty` points and adds `message` to the feedback.
+    `features` lists what the test reads, so only those get computed.
+    """
+
+    def __init__(self, message, penalty, features, test):
+        self.message = message
+        self.penalty = penalty
+        self.features = tuple(features)
+        self.test = test
+
+
+SQUAT_RULES = [
+    # 🔹 Depth check (CRITICAL)
+    ScoringRule(
+        "Go deeper in squat", 10, ('left_knee_angle', 'right_knee_angle'),
+        lambda f: (f.get('left_knee_angle', 180) + f.get('right_knee_angle', 180)) / 2 > 120
+    ),
+    # 🔹 Torso lean
+    ScoringRule(
+        "Keep chest up", 10, ('torso_lean',),
+        lambda f: f.get('torso_lean', 0) > 40
+    ),
+    # 🔹 Knee alignment
+    ScoringRule(
+        "Push knees outward", 10, ('left_knee_lateral', 'right_knee_lateral'),
+        lambda f: abs(f.get('left_knee_lateral', 0)) + abs(f.get('right_knee_lateral', 0)) > 0.15
+    ),
+    # 🔹 Symmetry
+    ScoringRule(
+        "Maintain balance", 10, ('symmetry_score',),
+        lambda f: f.get('symmetry_score', 1.0) < 0.7
+    ),
+]
+
+
 class ScoringEngine:
     def __init__(self):
         self.feedback_cooldown = 3.0
@@ -13,9 +51,9 @@ class ScoringEngine:
             5: 20   # asymmetry
         }
 
-    def calculate_score(self, exercise_name, features, ml_result):
+    def calculate_score(self, exercise_name, features, ml_result, rules=None):
         """
-        Hybrid scoring: ML + Rules
+        Hybrid scoring: ML + Rules (the squat rules unless `rules` is given)
         """
 
         score = 100.0
@@ -37,34 +75,10 @@ class ScoringEngine:
         # ---------------------------
         # 2. RULE-BASED VALIDATION
         # ---------------------------
-
-        # 🔹 Depth check (CRITICAL)
-        knee_avg = (features.get('left_knee_angle', 180) +
-                    features.get('right_knee_angle', 180)) / 2
-
-        if knee_avg > 120:
-            score -= 10
-            feedback.append("Go deeper in squat")
-
-        # 🔹 Torso lean
-        torso_lean = features.get('torso_lean', 0)
-        if torso_lean > 40:
-            score -= 10
-            feedback.append("Keep chest up")
-
-        # 🔹 Knee alignment
-        knee_lat = abs(features.get('left_knee_lateral', 0)) + \
-                   abs(features.get('right_knee_lateral', 0))
-
-        if knee_lat > 0.15:
-            score -= 10
-            feedback.append("Push knees outward")
-
-        # 🔹 Symmetry
-        symmetry = features.get('symmetry_score', 1.0)
-        if symmetry < 0.7:
-            score -= 10
-            feedback.append("Maintain balance")
+        for rule in (SQUAT_RULES if rules is None else rules):
+            if rule.test(features):
+                score -= rule.penalty
+                feedback.append(rule.message)
 
         # ---------------------------
         # FINAL SCORE
@@ -1,6 +1,10 @@
 import math
 import time
 
+import numpy as np
+
+from ..pose.landmark_array import landmarks_to_array
+
 # ---------- One Euro Filter ----------
 class OneEuroFilter:
     def __init__(self, min_cutoff=0.1, beta=10.0, d_cutoff=1.0):
@@ -42,6 +46,73 @@ class OneEuroFilter:
         return x_hat
 
 
+# ---------- Vectorized One Euro Filter ----------
+class VectorOneEuroFilter:
+    """
+    One Euro filter over a whole (rows, cols) array at once, e.g. a pose as
+    (33, 4) = x, y, z, visibility. Each row keeps its own last timestamp so
+    rows can be skipped (masked out) independently, exactly like a grid of
+    scalar OneEuroFilters that only see some of the samples.
+    """
+
+    def __init__(self, shape=(33, 4), min_cutoff=0.1, beta=10.0, d_cutoff=1.0):
+        self.shape = shape
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x_prev = np.zeros(self.shape)
+        self.dx_prev = np.zeros(self.shape)
+        self.t_prev = np.zeros(self.shape[0])
+        self.seen = np.zeros(self.shape[0], dtype=bool)
+
+    @staticmethod
+    def smoothing_factor(t_e, cutoff):
+        r = 2 * math.pi * cutoff * t_e
+        return r / (r + 1)
+
+    def filter(self, t, x, mask=None):
+        """
+        Filters sample `x` taken at time `t` (seconds). Rows where `mask` is
+        False pass through unchanged and leave their state untouched.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if mask is None:
+            mask = np.ones(self.shape[0], dtype=bool)
+
+        # Same math as OneEuroFilter.filter, for every element at once
+        t_e = np.maximum(t - self.t_prev, 1e-6)[:, None]
+
+        dx = (x - self.x_prev) / t_e
+        a_d = self.smoothing_factor(t_e, self.d_cutoff)
+        dx_hat = a_d * dx + (1 - a_d) * self.dx_prev
+
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        a = self.smoothing_factor(t_e, cutoff)
+        x_hat = a * x + (1 - a) * self.x_prev
+
+        upd = mask & self.seen
+        if upd.all():
+            self.x_prev = x_hat
+            self.dx_prev = dx_hat
+            self.t_prev.fill(t)
+            return x_hat.copy()
+
+        # Rows seen for the first time start from the raw sample
+        first = mask & ~self.seen
+        upd_col = upd[:, None]
+        out = np.where(upd_col, x_hat, x)
+
+        self.x_prev = np.where(upd_col, x_hat, np.where(first[:, None], x, self.x_prev))
+        self.dx_prev = np.where(upd_col, dx_hat, self.dx_prev)
+        self.t_prev[mask] = t
+        self.seen |= mask
+
+        return out
+
+
 # ---------- Smoothed Landmark ----------
 class SmoothedLandmark:
     __slots__ = ['x', 'y', 'z', 'visibility']  # 🔥 memory optimization
@@ -57,7 +128,6 @@ class SmoothedLandmark:
 class PoseSmoother:
     def __init__(self, num_landmarks=33, min_cutoff=0.1, beta=10.0, d_cutoff=1.0):
         self.num_landmarks = num_landmarks
-        self.filters = {}
 
         self.config = {
             'min_cutoff': min_cutoff,
@@ -65,40 +135,35 @@ class PoseSmoother:
             'd_cutoff': d_cutoff
         }
 
+        # x, y, z, visibility of every landmark filtered in one array
+        self.filter = VectorOneEuroFilter((num_landmarks, 4), **self.config)
+
         self.prev_time = None
 
-    def smooth(self, landmarks):
-        if not landmarks:
-            return []
+    def smooth_array(self, landmarks, timestamp=None):
+        """
+        Smooths a pose and returns it as a (33, 4) array.
+        `timestamp` is the frame time in seconds; pass the capture/replay time
+        so results don't depend on processing speed.
+        """
+        if landmarks is None or len(landmarks) == 0:
+            return None
 
         # 🔥 Stable time delta (better than time.time jitter)
-        current_time = time.perf_counter()
-
-        smoothed = []
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        self.prev_time = timestamp
 
-        for i, lm in enumerate(landmarks):
+        raw = landmarks_to_array(landmarks, dtype=np.float64)
 
-            # Skip low confidence points
-            if lm.visibility < 0.5:
-                smoothed.append(lm)
-                continue
+        # Skip low confidence points
+        visible = raw[:, 3] >= 0.5
 
-            # Create filters once
-            if i not in self.filters:
-                self.filters[i] = {
-                    'x': OneEuroFilter(**self.config),
-                    'y': OneEuroFilter(**self.config),
-                    'z': OneEuroFilter(**self.config),
-                    'v': OneEuroFilter(**self.config)
-                }
+        return self.filter.filter(timestamp, raw, visible)
 
-            f = self.filters[i]
-
-            s_x = f['x'].filter(current_time, lm.x)
-            s_y = f['y'].filter(current_time, lm.y)
-            s_z = f['z'].filter(current_time, lm.z)
-            s_v = f['v'].filter(current_time, lm.visibility)
-
-            smoothed.append(SmoothedLandmark(s_x, s_y, s_z, s_v))
+    def smooth(self, landmarks, timestamp=None):
+        smoothed = self.smooth_array(landmarks, timestamp)
+        if smoothed is None:
+            return []
 
-        return smoothed
\ No newline at end of file
+        return [SmoothedLandmark(x, y, z, v) for x, y, z, v in smoothed.tolist()]
@@ -1,19 +1,144 @@
-import numpy as np
 from collections import deque
 
+import numpy as np
+
+
 class TemporalProcessor:
+    """
+    Rolling temporal statistics over the last `buffer_size` feature frames.
+
+    Frames live in a preallocated (window x n_features) ring buffer with
+    running sums and sums of squares, so per-frame velocity and the rolling
+    mean/std/trend of any feature cost O(1) instead of rebuilding lists from
+    a deque of dicts. Rolling min/max use a pair of monotonic deques per
+    feature, kept from the first get_temporal_features() call for it, so
+    they are O(1) amortized per frame too. Feature columns are registered
+    the first time a key is seen; a key missing from a frame counts as 0.
+    """
+
+    # Recompute running sums from the buffer this often to shed float drift
+    RESYNC_INTERVAL = 1000
+
     def __init__(self, buffer_size=30, smooth_window=5):
         self.buffer_size = buffer_size
         self.smooth_window = smooth_window
 
-        self.history = deque(maxlen=buffer_size)
-        self.vel_history = deque(maxlen=buffer_size)
+        self.keys = []
+        self.key_index = {}
+
+        self._values = np.zeros((buffer_size, 0))
+        self._sum = np.zeros(0)
+        self._sumsq = np.zeros(0)
+        self._count = 0
+        self._head = 0  # next write slot
+        self._pushes = 0
+
+        # col -> (min deque, max deque) of (push number, value), monotonic
+        self._extrema = {}
+
+        self._vel = np.zeros((buffer_size, 0))
+        self._vel_sum = np.zeros(0)
+        self._vel_count = 0
+        self._vel_head = 0
+
+        self._updates = 0
 
         self.velocities = {}
         self.accelerations = {}
 
         self.prev_time = None
 
+    # ----------- BUFFER HELPERS ----------- #
+    def _register(self, features):
+        new_keys = [k for k in features if k not in self.key_index]
+        if not new_keys:
+            return
+
+        for key in new_keys:
+            self.key_index[key] = len(self.keys)
+            self.keys.append(key)
+
+        grow = ((0, 0), (0, len(new_keys)))
+        self._values = np.pad(self._values, grow)
+        self._vel = np.pad(self._vel, grow)
+        self._sum = np.pad(self._sum, (0, len(new_keys)))
+        self._sumsq = np.pad(self._sumsq, (0, len(new_keys)))
+        self._vel_sum = np.pad(self._vel_sum, (0, len(new_keys)))
+
+    def _to_row(self, features):
+        row = np.zeros(len(self.keys))
+        cols = [self.key_index[k] for k in features]
+        row[cols] = [features[k] for k in features]
+        return row, cols
+
+    def _oldest_slot(self):
+        return self._head if self._count == self.buffer_size else 0
+
+    def _newest_slot(self):
+        return (self._head - 1) % self.buffer_size
+
+    def _push(self, row):
+        slot = self._head
+        if self._count == self.buffer_size:
+            evicted = self._values[slot]
+            self._sum -= evicted
+            self._sumsq -= evicted * evicted
+        else:
+            self._count += 1
+
+        self._values[slot] = row
+        self._sum += row
+        self._sumsq += row * row
+        self._head = (slot + 1) % self.buffer_size
+
+        seq = self._pushes
+        self._pushes += 1
+        for col, (lows, highs) in self._extrema.items():
+            self._push_extrema(lows, highs, seq, row[col])
+
+    def _push_extrema(self, lows, highs, seq, value):
+        while lows and lows[-1][1] >= value:
+            lows.pop()
+        lows.append((seq, value))
+        while highs and highs[-1][1] <= value:
+            highs.pop()
+        highs.append((seq, value))
+
+        # Drop what has left the window
+        oldest = seq - self.buffer_size
+        while lows[0][0] <= oldest:
+            lows.popleft()
+        while highs[0][0] <= oldest:
+            highs.popleft()
+
+    def _track_extrema(self, col):
+        """Starts min/max deques for `col` from the frames already buffered."""
+        lows, highs = deque(), deque()
+        first = self._pushes - self._count
+        for i in range(self._count):
+            slot = (self._oldest_slot() + i) % self.buffer_size
+            self._push_extrema(lows, highs, first + i, self._values[slot, col])
+        self._extrema[col] = (lows, highs)
+        return lows, highs
+
+    def _push_velocity(self, vel):
+        slot = self._vel_head
+        if self._vel_count == self.buffer_size:
+            self._vel_sum -= self._vel[slot]
+        else:
+            self._vel_count += 1
+
+        self._vel[slot] = vel
+        self._vel_sum += vel
+        self._vel_head = (slot + 1) % self.buffer_size
+
+    def _resync(self):
+        filled = self._values[:self._count]
+        self._sum = filled.sum(axis=0)
+        self._sumsq = (filled * filled).sum(axis=0)
+        self._vel_sum = self._vel[:self._vel_count].sum(axis=0)
+
+    # ----------- UPDATE ----------- #
     def update(self, features, timestamp):
         if not features:
             return {}, {}
@@ -26,39 +151,37 @@ class TemporalProcessor:
             dt = max(timestamp - self.prev_time, 1e-3)
             self.prev_time = timestamp
 
-        self.history.append(features)
+        self._register(features)
+        row, cols = self._to_row(features)
+        self._push(row)
+
+        self._updates += 1
+        if self._updates % self.RESYNC_INTERVAL == 0:
+            self._resync()
 
-        if len(self.history) < self.smooth_window:
+        if self._count < self.smooth_window:
             return {}, {}
 
         # ----------- VELOCITY (WINDOW BASED) ----------- #
-        velocities = {}
+        # Only keys present in this frame get a velocity, as before
+        vel = np.zeros(len(self.keys))
+        vel[cols] = (row[cols] - self._values[self._oldest_slot(), cols]) / dt
 
-        old = self.history[0]
-        new = self.history[-1]
-
-        for key in features:
-            dv = new.get(key, 0) - old.get(key, 0)
-            velocities[key] = dv / dt
-
-        self.vel_history.append(velocities)
+        prev_vel = self._vel[(self._vel_head - 1) % self.buffer_size] if self._vel_count else None
+        self._push_velocity(vel)
 
         # ----------- SMOOTH VELOCITY ----------- #
-        smoothed_vel = {}
-        for key in velocities:
-            vals = [v.get(key, 0) for v in self.vel_history]
-            smoothed_vel[key] = np.mean(vals)
+        smoothed = self._vel_sum[cols] / self._vel_count
 
         # ----------- ACCELERATION ----------- #
-        accelerations = {}
-        if len(self.vel_history) >= 2:
-            prev = self.vel_history[-2]
-
-            for key in smoothed_vel:
-                dv = smoothed_vel[key] - prev.get(key, 0)
-                accelerations[key] = dv / dt
+        if prev_vel is not None:
+            acc = (smoothed - prev_vel[cols]) / dt
         else:
-            accelerations = {k: 0.0 for k in smoothed_vel}
+            acc = np.zeros(len(cols))
+
+        names = [self.keys[c] for c in cols]
+        smoothed_vel = dict(zip(names, smoothed.tolist()))
+        accelerations = dict(zip(names, acc.tolist()))
 
         self.velocities = smoothed_vel
         self.accelerations = accelerations
@@ -70,20 +193,30 @@ class TemporalProcessor:
         """
         Returns ML-ready temporal features
         """
-        if len(self.history) < 5:
+        if self._count < 5:
             return {}
 
-        values = [f.get(feature_name, 0) for f in self.history]
+        col = self.key_index.get(feature_name)
+        if col is None:
+            mean = var = 0.0
+            first = last = 0.0
+            lo = hi = 0.0
+        else:
+            mean = self._sum[col] / self._count
+            var = max(self._sumsq[col] / self._count - mean * mean, 0.0)
+            first = self._values[self._oldest_slot(), col]
+            last = self._values[self._newest_slot(), col]
 
-        arr = np.array(values, dtype=np.float32)
+            extrema = self._extrema.get(col) or self._track_extrema(col)
+            lo, hi = float(extrema[0][0][1]), float(extrema[1][0][1])
 
         return {
-            f"{feature_name}_mean": float(arr.mean()),
-            f"{feature_name}_std": float(arr.std()),
-            f"{feature_name}_min": float(arr.min()),
-            f"{feature_name}_max": float(arr.max()),
-            f"{feature_name}_range": float(arr.max() - arr.min()),
-            f"{feature_name}_trend": float(arr[-1] - arr[0])  # 🔥 motion direction
+            f"{feature_name}_mean": float(mean),
+            f"{feature_name}_std": float(np.sqrt(var)),
+            f"{feature_name}_min": lo,
+            f"{feature_name}_max": hi,
+            f"{feature_name}_range": hi - lo,
+            f"{feature_name}_trend": float(last - first)  # 🔥 motion direction
         }
 
     # ----------- 🔥 PHASE DETECTION ----------- #
@@ -104,4 +237,4 @@ class TemporalProcessor:
         return self.velocities.get(feature_name, 0.0)
 
     def get_acceleration(self, feature_name):
-        return self.accelerations.get(feature_name, 0.0)
\ No newline at end of file
+        return self.accelerations.get(feature_name, 0.0)
@@ -0,0 +1,188 @@
+import base64
+import json
+import zlib
+
+import numpy as np
+
+try:
+    from .pose.pose_frame import PoseFrame
+    from .exercises.squat import Squat
+    from .exercises.pushup import PushUp
+    from .exercises.plank import Plank
+    from .exercises.tree_pose import TreePose
+    from .exercises.chair_pose import ChairPose
+    from .exercises.high_knees import HighKnees
+    from .exercises.warrior_pose import WarriorPose
+    from .exercises.meditation import Meditation
+except ImportError:
+    # Imported as a top-level module by the local kiosk loop
+    from pose.pose_frame import PoseFrame
+    from exercises.squat import Squat
+    from exercises.pushup import PushUp
+    from exercises.plank import Plank
+    from exercises.tree_pose import TreePose
+    from exercises.chair_pose import ChairPose
+    from exercises.high_knees import HighKnees
+    from exercises.warrior_pose import WarriorPose
+    from exercises.meditation import Meditation
+
+# 1: per-frame JSON lists, sampled; 2: every frame, delta-coded int16 (still read: 1)
+REPLAY_VERSION = 2
+
+# Landmark x, y and visibility are stored as int16 in 1e-4 steps
+REPLAY_SCALE = 10000
+
+# Landmarks any exercise evaluator reads: nose, arms, hips and legs
+REPLAY_LANDMARKS = (0, 11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28)
+
+EVALUATORS = {
+    "squat": Squat,
+    "pushup": PushUp,
+    "plank": Plank,
+    "tree_pose": TreePose,
+    "chair_pose": ChairPose,
+    "high_knees": HighKnees,
+    "warrior_pose": WarriorPose,
+    "meditation": Meditation,
+}
+
+# update() returns (seconds held, colors) rather than (reps, colors)
+TIMED_EXERCISES = ("plank", "tree_pose", "chair_pose")
+
+# Out of frame this long pauses the session; holds resume afterwards
+PAUSE_AFTER = 2.0
+
+
+# ------------------ RECORD ------------------
+class ReplayRecorder:
+    """
+    Collects every analyzed PoseFrame of a session into the `replay_data`
+    stored with a workout: per frame, the milliseconds since the first
+    frame and x, y, visibility of REPLAY_LANDMARKS in 1e-4 steps. Each
+    column is delta-coded against the previous frame and deflated, so a
+    10 minute session at 30fps stays around 1 MB of JSON.
+    """
+
+    def __init__(self, exercise, width, height):
+        self.exercise = exercise
+        self.width = width
+        self.height = height
+        self.times = []
+        self.rows = []
+        self.started_at = None
+
+    def add(self, pose):
+        if self.started_at is None:
+            self.started_at = pose.timestamp
+        self.times.append(round((pose.timestamp - self.started_at) * 1000))
+
+        values = pose.points[list(REPLAY_LANDMARKS)][:, (0, 1, 3)].ravel()
+        self.rows.append(np.clip(np.rint(values * REPLAY_SCALE), -32768, 32767).astype(np.int16))
+
+    def to_json(self):
+        times = np.asarray(self.times, dtype=np.int32)
+        rows = np.asarray(self.rows, dtype=np.int16).reshape(len(self.rows), len(REPLAY_LANDMARKS) * 3)
+        return json.dumps({
+            "version": REPLAY_VERSION,
+            "exercise": self.exercise,
+            "width": self.width,
+            "height": self.height,
+            "landmarks": list(REPLAY_LANDMARKS),
+            "count": len(self.times),
+            "times": _pack(np.diff(times, prepend=0)),
+            # Column-major, so each landmark coordinate's small deltas sit together
+            "frames": _pack(np.diff(rows, axis=0, prepend=np.zeros((1, rows.shape[1]), np.int16)).T),
+        }, separators=(",", ":"))
+
+
+def _pack(array):
+    return base64.b64encode(zlib.compress(np.ascontiguousarray(array).tobytes(), 6)).decode("ascii")
+
+
+def _unpack(text, dtype):
+    return np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=dtype)
+
+
+# ------------------ REPLAY ------------------
+def load_replay(replay_data):
+    """Parses stored replay_data (a JSON string or dict); raises ValueError if it isn't a replay."""
+    replay = json.loads(replay_data) if isinstance(replay_data, (str, bytes)) else replay_data
+    if not isinstance(replay, dict) or replay.get("version") not in (1, REPLAY_VERSION):
+        raise ValueError("Unsupported replay_data format")
+    return replay
+
+
+def _decoded_frames(replay):
+    """(seconds since start, (n, 3) x/y/visibility) per recorded frame, for either version."""
+    if replay["version"] == 1:
+        for frame in replay["frames"]:
+            yield frame[0], np.asarray(frame[1:], dtype=np.float32).reshape(-1, 3)
+        return
+
+    count, columns = replay["count"], len(replay["landmarks"]) * 3
+    times = np.cumsum(_unpack(replay["times"], np.int32), dtype=np.int64) / 1000
+    # int16 deltas wrap around, and so does their int16 running sum
+    deltas = _unpack(replay["frames"], np.int16).reshape(columns, count).T
+    values = np.cumsum(deltas, axis=0, dtype=np.int16).astype(np.float32) / REPLAY_SCALE
+    for t, row in zip(times.tolist(), values):
+        yield t, row.reshape(-1, 3)
+
+
+def replay_frames(replay):
+    """Yields a PoseFrame per recorded frame, timestamped from the start of the session."""
+    indices = replay["landmarks"]
+    width, height = replay["width"], replay["height"]
+    for timestamp, values in _decoded_frames(replay):
+        # z is not recorded; landmarks that weren't recorded stay invisible
+        points = np.zeros((33, 4), dtype=np.float32)
+        points[indices, 0] = values[:, 0]
+        points[indices, 1] = values[:, 1]
+        points[indices, 3] = values[:, 2]
+        yield PoseFrame(points, width, height, timestamp)
+
+
+def rescore(replay_data, exercise=None):
+    """
+    Runs a stored session back through the current exercise evaluator as
+    fast as the CPU allows, timers on the recorded timestamps. Replays
+    hold every analyzed frame, so with unchanged evaluators the result is
+    the live one up to the 1e-4 rounding of the landmarks and 1 ms of
+    the timestamps; version 1 replays were sampled at 5 frames/s and can
+    miss fast reps. Returns a summary dict.
+    """
+    replay = load_replay(replay_data)
+    exercise = exercise or replay["exercise"]
+    if exercise not in EVALUATORS:
+        raise ValueError(f"No evaluator for exercise '{exercise}'")
+
+    evaluator = EVALUATORS[exercise]()
+    summary = {"exercise": exercise, "frames": 0, "duration": 0.0}
+    timed = exercise in TIMED_EXERCISES
+    best_hold = 0.0
+    output = None
+    last_timestamp = None
+    for pose in replay_frames(replay):
+        # Frames aren't recorded while paused, so a long gap is a pause
+        if last_timestamp is not None and pose.timestamp - last_timestamp > PAUSE_AFTER \
+                and hasattr(evaluator, "resume"):
+            evaluator.resume(pose.timestamp)
+        last_timestamp = pose.timestamp
+
+        output = evaluator.update(pose)
+        summary["frames"] += 1
+        summary["duration"] = pose.timestamp
+        if timed:
+            best_hold = max(best_hold, output[0])
+
+    if output is None:
+        return summary
+    if isinstance(output, dict):
+        # WarriorPose / Meditation report a dict of their own; the replay's
+        # own duration (float seconds) is kept over Meditation's int one
+        summary.update({k: v for k, v in output.items() if k not in ("feedback", "duration")})
+    elif timed:
+        summary["seconds"] = output[0]
+        summary["best_hold"] = best_hold
+    else:
+        summary["reps"] = output[0]
+    return summary
@@ -0,0 +1,182 @@
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# ------------------ NETWORK PROVIDERS ------------------
+# Each returns Wi-Fi signal strength 0-100, or None when there is no
+# wireless link or the platform can't tell.
+
+def _wifi_linux():
+    # Inter-| sta-|   Quality        |   Discarded packets ...
+    #  face | tus | link level noise |  nwid  crypt   frag ...
+    # wlan0: 0000   54.  -56.  -256        0      0      0 ...
+    try:
+        with open("/proc/net/wireless") as f:
+            lines = f.readlines()[2:]
+    except OSError:
+        return None
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 3:
+            # Link quality is out of 70 on most drivers
+            return max(0, min(100, int(float(fields[2].rstrip(".")) * 100 / 70)))
+    return None
+
+
+def _wifi_windows():
+    try:
+        output = subprocess.run(
+            ["netsh", "wlan", "show", "interfaces"],
+            capture_output=True, text=True, timeout=3,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"Signal\s*:\s*(\d+)%", output)
+    return int(match.group(1)) if match else None
+
+
+_AIRPORT = "/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport"
+
+
+def _wifi_macos():
+    try:
+        output = subprocess.run([_AIRPORT, "-I"], capture_output=True, text=True, timeout=3).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"agrCtlRSSI:\s*(-?\d+)", output)
+    if not match:
+        return None
+    # -100 dBm (unusable) .. -50 dBm (excellent)
+    return max(0, min(100, 2 * (int(match.group(1)) + 100)))
+
+
+def wifi_provider(platform=None):
+    platform = platform or sys.platform
+    if platform.startswith("linux"):
+        return _wifi_linux
+    if platform.startswith("win"):
+        return _wifi_windows
+    if platform == "darwin":
+        return _wifi_macos
+    return lambda: None
+
+
+# ------------------ CPU PROVIDERS ------------------
+class _ProcStatCpu:
+    """CPU busy % between calls, from the aggregate line of /proc/stat."""
+
+    def __init__(self):
+        self._last = None
+
+    def __call__(self):
+        try:
+            with open("/proc/stat") as f:
+                fields = [int(v) for v in f.readline().split()[1:]]
+        except (OSError, ValueError):
+            return None
+        idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+        total = sum(fields)
+
+        last, self._last = self._last, (idle, total)
+        if last is None or total == last[1]:
+            return None
+        return round(100.0 * (1 - (idle - last[0]) / (total - last[1])), 1)
+
+
+def _cpu_loadavg():
+    # 1-minute load as % of all cores; rough, but never blocks
+    try:
+        return round(100.0 * os.getloadavg()[0] / (os.cpu_count() or 1), 1)
+    except (AttributeError, OSError):
+        return None
+
+
+def cpu_provider(platform=None):
+    if psutil is not None:
+        # Non-blocking: usage since the previous call
+        return lambda: psutil.cpu_percent(interval=None)
+    platform = platform or sys.platform
+    if platform.startswith("linux"):
+        return _ProcStatCpu()
+    return _cpu_loadavg
+
+
+# ------------------ SAMPLER ------------------
+class HealthSnapshot:
+    """One reading of every signal; replaced whole, never mutated."""
+
+    __slots__ = ['timestamp', 'wifi_strength', 'cpu_percent', 'fps']
+
+    def __init__(self, timestamp, wifi_strength, cpu_percent, fps):
+        self.timestamp = timestamp
+        self.wifi_strength = wifi_strength
+        self.cpu_percent = cpu_percent
+        self.fps = fps
+
+    def to_dict(self):
+        return {
+            "timestamp": self.timestamp,
+            "wifi_strength": self.wifi_strength,
+            "cpu_percent": self.cpu_percent,
+            "fps": dict(self.fps),
+        }
+
+
+class SystemHealthSampler(threading.Thread):
+    """
+    Background thread that gathers network, CPU and frame-rate signals and
+    publishes the newest HealthSnapshot as `snapshot`. Readers just read
+    the attribute, so a slow provider (e.g. netsh) never blocks the
+    frame loop.
+
+    Frame rates come from `fps_sources`, a name -> object-with-`fps` map
+    (e.g. the FpsMeters of the capture and inference stages), which can
+    also be filled in after start with add_fps_source().
+    """
+
+    def __init__(self, interval=1.0, network_interval=5.0, fps_sources=None,
+                 wifi=None, cpu=None):
+        super().__init__(name="system-health", daemon=True)
+        self.interval = interval
+        self.network_interval = network_interval
+        self.fps_sources = dict(fps_sources or {})
+        self._wifi = wifi or wifi_provider()
+        self._cpu = cpu or cpu_provider()
+        self._stopped = threading.Event()
+
+        self._wifi_strength = None
+        self._last_network = 0.0
+        self.snapshot = HealthSnapshot(time.time(), None, None, {})
+
+    def add_fps_source(self, name, source):
+        self.fps_sources = {**self.fps_sources, name: source}
+
+    def sample(self):
+        now = time.time()
+        if now - self._last_network >= self.network_interval:
+            self._last_network = now
+            self._wifi_strength = self._wifi()
+
+        fps = {name: round(source.fps, 1) for name, source in self.fps_sources.items()}
+        self.snapshot = HealthSnapshot(now, self._wifi_strength, self._cpu(), fps)
+        return self.snapshot
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠️ System health sample failed: {e}")
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
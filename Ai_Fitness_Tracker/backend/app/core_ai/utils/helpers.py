@@ -1,21 +1,4 @@
 import cv2
-import subprocess
-import re
-
-def get_wifi_strength():
-    """
-    Returns Wi-Fi signal strength percentage (0-100) on Windows.
-    Returns None if not available or not on Windows.
-    """
-    try:
-        cmd = "netsh wlan show interfaces"
-        output = subprocess.check_output(cmd, shell=True).decode('utf-8')
-        match = re.search(r"Signal\s*:\s*(\d+)%", output)
-        if match:
-            return int(match.group(1))
-    except:
-        pass
-    return None
 
 def draw_text_with_bg(frame, text, x, y,
                       font_scale=1,
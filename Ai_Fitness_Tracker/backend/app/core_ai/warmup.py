@@ -0,0 +1,138 @@
+import asyncio
+import math
+import time
+
+# Imported by the API for warmup_state; NumPy and the vision stack are
+# only loaded once run_warmup() starts
+
+
+class WarmupState:
+    """Progress of the startup warm-up, reported by /health/ready."""
+
+    def __init__(self):
+        self.status = "pending"  # pending, warming, ready, failed, skipped
+        self.started_at = None
+        self.finished_at = None
+        self.steps = {}
+        self.error = None
+
+    @property
+    def ready(self):
+        return self.status in ("ready", "skipped")
+
+    def begin(self):
+        self.status = "warming"
+        self.started_at = time.time()
+
+    def record(self, step, seconds, result=None):
+        self.steps[step] = {"seconds": round(seconds, 3), "result": result}
+
+    def finish(self, status="ready", error=None):
+        self.status = status
+        self.error = error
+        self.finished_at = time.time()
+
+    def to_dict(self):
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "status": self.status,
+            "ready": self.ready,
+            "elapsed_s": elapsed,
+            "steps": self.steps,
+            "error": self.error,
+        }
+
+
+warmup_state = WarmupState()
+
+
+# ------------------ SYNTHETIC POSES ------------------
+def synthetic_pose(depth):
+    """
+    A (33, 4) pose standing (depth=0) to fully squatted (depth=1), with
+    arms bent the same amount, so every joint angle, the rep counters and
+    the classifiers see realistic values.
+    """
+    import numpy as np
+    from .pose.landmark_array import NUM_LANDMARKS
+
+    pose = np.full((NUM_LANDMARKS, 4), [0.5, 0.5, 0.0, 0.9])
+    for side, dx in ((0, -0.05), (1, 0.05)):
+        hip_y = 0.5 + 0.2 * depth
+        pose[11 + side, :2] = (0.5 + dx, hip_y - 0.3)                  # shoulder
+        pose[13 + side, :2] = (0.5 + 2 * dx, hip_y - 0.15)             # elbow
+        pose[15 + side, :2] = (0.5 + 2 * dx + 0.1 * depth, hip_y - 0.3 + 0.15 * (1 - depth))  # wrist
+        pose[23 + side, :2] = (0.5 + dx - 0.1 * depth, hip_y)          # hip
+        pose[25 + side, :2] = (0.5 + dx + 0.1 * depth, 0.7)            # knee
+        pose[27 + side, :2] = (0.5 + dx, 0.9)                          # ankle
+    return pose
+
+
+async def warm_pipelines(frames=30, fps=30.0):
+    """
+    Feeds `frames` synthetic frames (one squat cycle) through a Pipeline
+    per registered exercise: smoothing, features, temporal stats, batched
+    classification, scoring and reps, plus one overlay draw.
+    """
+    import numpy as np
+    from .executor import run_in_vision_executor
+    from .pipeline import Pipeline, draw_overlay
+    from .processing.exercise_registry import list_exercises
+
+    results = {}
+    for exercise in list_exercises():
+        pipeline = Pipeline(exercise, llm_feedback=False, debug=False)
+        started = time.perf_counter()
+        landmarks, result = None, None
+        for i in range(frames):
+            depth = 0.5 - 0.5 * math.cos(2 * math.pi * i / frames)
+            landmarks, result = await pipeline.process_landmarks(synthetic_pose(depth), started + i / fps)
+        if landmarks:
+            blank = np.zeros((480, 640, 3), dtype=np.uint8)
+            await run_in_vision_executor(
+                draw_overlay, blank, exercise, landmarks,
+                result["reps"], result["score"], result["feedback"], pipeline.spec.landmarks
+            )
+        results[exercise] = result["ml"]["label"] if result else None
+    return results
+
+
+# ------------------ RUN ------------------
+async def _step(name, fn):
+    started = time.perf_counter()
+    result = await fn()
+    warmup_state.record(name, time.perf_counter() - started, result)
+    print(f"🔥 Warm-up {name}: {time.perf_counter() - started:.2f}s")
+    return result
+
+
+async def run_warmup(session_pool=None, sessions=2, frames=30, strict=False):
+    """
+    Verifies and loads every model, prewarms `sessions` pooled pose
+    sessions (at least one) and runs synthetic frames through each
+    exercise's Pipeline, updating `warmup_state` as it goes. Ends
+    "failed" if no pose landmarker could be built at any tier. Never
+    raises; a failure is kept on the state so /health/ready keeps
+    reporting not ready.
+    """
+    from .model_assets import warm_models
+
+    loop = asyncio.get_running_loop()
+    warmup_state.begin()
+    try:
+        await _step("models", lambda: loop.run_in_executor(None, warm_models, strict))
+        if session_pool is not None:
+            prewarmed = await _step("pose_sessions", lambda: session_pool.prewarm(max(1, sessions)))
+            if not prewarmed["added"]:
+                raise RuntimeError(f"No pose landmarker could be built: {prewarmed['errors']}")
+        await _step("pipelines", lambda: warm_pipelines(frames))
+    except Exception as e:
+        print(f"❌ Warm-up failed: {e}")
+        warmup_state.finish("failed", str(e))
+        return warmup_state
+
+    warmup_state.finish()
+    print(f"✅ Warm-up finished in {warmup_state.to_dict()['elapsed_s']}s")
+    return warmup_state
@@ -23,6 +23,12 @@ from .api.v1.stats import router as stats_router
 from .api.v1.dashboard import router as dashboard_router
 from .api.v1.voice_commands import router as voice_router
 from .api.v1.websockets import router as ws_router
+from .api.v1.health import router as health_router
+from .core_ai.warmup import warmup_state
+if settings.SERVICE_ROLE == "api":
+    from .api.v1.vision_proxy import router as vision_router
+else:
+    from .api.v1.vision import router as vision_router, start_vision_services, stop_vision_services
 from .api.v1.water import router as water_router
 from .api.v1.chatbot import router as chatbot_router
 from .api.v1.ai import router as ai_router
@@ -102,10 +108,17 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to create database tables: {e}")
     await redis_service.connect()
+    if settings.SERVICE_ROLE == "api":
+        # Vision runs in app.vision_worker; nothing to load or warm here
+        warmup_state.finish("skipped")
+    else:
+        await start_vision_services(app)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     await redis_service.disconnect()
+    if settings.SERVICE_ROLE != "api":
+        await stop_vision_services(app)
 
 # Security headers middleware
 # @app.middleware("http")
@@ -127,6 +140,8 @@ app.include_router(stats_router, prefix=settings.API_V1_STR)
 app.include_router(dashboard_router, prefix=settings.API_V1_STR)
 app.include_router(voice_router, prefix=settings.API_V1_STR)
 app.include_router(ws_router, prefix=settings.API_V1_STR)
+app.include_router(vision_router, prefix=settings.API_V1_STR)
+app.include_router(health_router)
 app.include_router(water_router, prefix=settings.API_V1_STR)
 app.include_router(chatbot_router, prefix=settings.API_V1_STR)
 app.include_router(ai_router, prefix=settings.API_V1_STR)
@@ -0,0 +1,53 @@
+"""
+Vision worker: serves only /ws/vision and /ws/session (pose pipeline),
+their stats and the health checks, so inference can be scaled separately
+from the REST API.
+
+    uvicorn app.vision_worker:app --port 8001
+    uvicorn app.vision_worker:app --uds /run/fitvision/vision.sock
+    python -m app.vision_worker --workers 4
+
+Run the API with SERVICE_ROLE=api and VISION_WORKER_URL pointing here
+(ws://127.0.0.1:8001 or unix:/run/fitvision/vision.sock) and it relays
+vision and session sockets to this process instead of running inference itself.
+"""
+import argparse
+import logging
+
+from fastapi import FastAPI
+
+from .core.config import settings
+from .api.v1.health import router as health_router
+from .api.v1.vision import router as vision_router, start_vision_services, stop_vision_services
+
+logging.basicConfig(level=logging.INFO)
+
+app = FastAPI(title=f"{settings.PROJECT_NAME} Vision Worker")
+
+@app.on_event("startup")
+async def startup_event():
+    await start_vision_services(app)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await stop_vision_services(app)
+
+# Same paths as the API, so the proxy forwards them unchanged
+app.include_router(vision_router, prefix=settings.API_V1_STR)
+app.include_router(health_router)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the pose inference worker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--uds", default=None, help="serve on a Unix socket instead of host:port")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes, e.g. one per core")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "app.vision_worker:app",
+        host=args.host, port=args.port, uds=args.uds, workers=args.workers,
+    )
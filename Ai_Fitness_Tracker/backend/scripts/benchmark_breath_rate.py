@@ -0,0 +1,74 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from backend.app.core_ai.exercises.breath_rate import BreathRateEstimator
+
+
+def synthetic_breathing(bpm, seconds, fps, rng, amplitude=0.004, noise=0.0015, drift=0.01):
+    """
+    Mean shoulder height for someone breathing at `bpm`: a sine plus slow
+    posture drift and landmark jitter, sampled at a jittery `fps`.
+    """
+    dt = rng.uniform(0.6, 1.4, size=int(seconds * fps)) / fps
+    t = np.cumsum(dt)
+    y = (0.5 + amplitude * np.sin(2 * np.pi * bpm / 60 * t)
+         + drift * t / seconds + rng.normal(0, noise, size=len(t)))
+    return t, y
+
+
+def legacy_rate(history):
+    """The previous Meditation estimate: zero crossings of the mean-removed last 150 samples at an assumed 30fps."""
+    y_data = np.array(history)
+    y_data = y_data - np.mean(y_data)
+    zero_crossings = np.where(np.diff(np.sign(y_data)))[0]
+    duration = len(history) / 30
+    return (len(zero_crossings) / 2) * (60 / duration)
+
+
+def run_legacy(t, y):
+    history, rate = [], 0
+    start = time.perf_counter()
+    for value in y:
+        history.append(value)
+        if len(history) > 30 * 5:
+            history.pop(0)
+        if len(history) > 30:
+            rate = legacy_rate(history)
+    return rate, (time.perf_counter() - start) / len(y) * 1e6
+
+
+def run_streaming(t, y):
+    estimator, rate = BreathRateEstimator(), None
+    start = time.perf_counter()
+    for ts, value in zip(t.tolist(), y.tolist()):
+        rate = estimator.update(value, ts)
+    return rate, (time.perf_counter() - start) / len(y) * 1e6
+
+
+def run(seconds, fps, seed):
+    rng = np.random.default_rng(seed)
+    print(f"{seconds:.0f}s of synthetic breathing at ~{fps:.0f}fps (jittered)\n")
+    print(f"{'true bpm':>9} {'legacy bpm':>11} {'stream bpm':>11} {'legacy µs':>10} {'stream µs':>10}")
+    for bpm in (6, 10, 12, 16, 20, 30):
+        t, y = synthetic_breathing(bpm, seconds, fps, rng)
+        legacy, legacy_us = run_legacy(t, y)
+        stream, stream_us = run_streaming(t, y)
+        stream_text = f"{stream:.1f}" if stream is not None else "-"
+        print(f"{bpm:>9} {legacy:>11.1f} {stream_text:>11} {legacy_us:>10.1f} {stream_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the streaming breath-rate estimator with the old list-based one")
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--fps", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.seconds, args.fps, args.seed)
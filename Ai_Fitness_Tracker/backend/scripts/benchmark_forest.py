@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from backend.app.core_ai.processing.forest_compiler import CompiledForest
+from export_squat_forest import DEFAULT_MODEL, load_model
+
+
+def synthetic_model(n_features=8, n_classes=6, n_estimators=200, max_depth=12):
+    """Stand-in with the training script's shape when no squat_classifier.pkl is present."""
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(42)
+    X = rng.uniform(0, 180, size=(4000, n_features))
+    y = rng.integers(0, n_classes, size=4000)
+    model = RandomForestClassifier(
+        n_estimators=n_estimators, max_depth=max_depth,
+        min_samples_split=5, min_samples_leaf=3, random_state=42,
+    )
+    return model.fit(X, y)
+
+
+def time_per_row(fn, X, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(X)
+    return (time.perf_counter() - start) / (repeats * len(X)) * 1e6
+
+
+def check_parity(model, forest, X):
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    max_err = float(np.abs(expected - actual).max())
+    same_class = bool(np.array_equal(model.predict(X), forest.predict(X)))
+
+    print(f"Parity on {len(X)} rows: max |Δproba| = {max_err:.2e}, same classes: {same_class}")
+    assert max_err < 1e-9 and same_class, "Compiled forest disagrees with sklearn"
+
+
+def run(model_path, rows, repeats):
+    if os.path.exists(model_path):
+        model = load_model(model_path)
+        print(f"Model: {model_path}")
+    else:
+        model = synthetic_model()
+        print("Model: synthetic 200-tree forest (no pickle found)")
+
+    model.n_jobs = 1
+    forest = CompiledForest.from_sklearn(model)
+    print(f"Trees: {forest.n_trees}  Nodes: {len(forest.feature)}  Max depth: {forest.max_depth}\n")
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 180, size=(rows, model.n_features_in_)).astype(np.float32)
+    check_parity(model, forest, X)
+
+    print(f"\n{'batch':>6} {'sklearn µs/row':>16} {'compiled µs/row':>16} {'speedup':>8}")
+    for batch in (1, 8, 32, 128):
+        Xb = X[:batch]
+        n = max(1, repeats // batch)
+        sk = time_per_row(model.predict_proba, Xb, n)
+        cf = time_per_row(forest.predict_proba, Xb, n)
+        print(f"{batch:>6} {sk:>16.1f} {cf:>16.1f} {sk / cf:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and time the compiled forest against sklearn")
+    parser.add_argument("model", nargs="?", default=DEFAULT_MODEL)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.model, args.rows, args.repeats)
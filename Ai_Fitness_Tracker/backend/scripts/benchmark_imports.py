@@ -0,0 +1,74 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Runs from backend/, where the app is imported as `app`
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules an API-only worker should not load at import time
+HEAVY_MODULES = ("cv2", "mediapipe", "numpy", "pandas", "sklearn", "joblib", "groq")
+
+
+def import_times(module, env=None):
+    """
+    Imports `module` in a fresh interpreter under `python -X importtime` and
+    returns [(name, self_us, cumulative_us)] in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env={**os.environ, **(env or {})},
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run(module, top, env):
+    rows = import_times(module, env)
+    by_name = {name: cumulative for name, _, cumulative in rows}
+    total = by_name.get(module, sum(self_us for _, self_us, _ in rows))
+
+    print(f"import {module}: {total / 1000:.1f} ms cold, {len(rows)} modules\n")
+
+    print("Heavy modules:")
+    for name in HEAVY_MODULES:
+        state = f"{by_name[name] / 1000:8.1f} ms" if name in by_name else "  not loaded"
+        print(f"  {name:<12}{state}")
+
+    print(f"\nTop {top} by cumulative time:")
+    top_level = [r for r in rows if "." not in r[0] or r[0].startswith("app.")]
+    for name, _, cumulative in sorted(top_level, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    return [name for name in HEAVY_MODULES if name in by_name]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import cost with python -X importtime")
+    parser.add_argument("module", nargs="?", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the child interpreter, e.g. MODEL_WARMUP=false")
+    parser.add_argument("--fail-on-heavy", action="store_true",
+                        help="exit 1 if any heavy module is imported (for CI)")
+    args = parser.parse_args()
+
+    env = dict(item.split("=", 1) for item in args.env)
+    try:
+        loaded = run(args.module, args.top, env)
+    except RuntimeError as e:
+        # A failed import would otherwise read as "nothing heavy loaded"
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.fail_on_heavy and loaded:
+        print(f"\n❌ Heavy modules imported at startup: {', '.join(loaded)}")
+        sys.exit(1)
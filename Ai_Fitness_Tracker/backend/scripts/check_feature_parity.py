@@ -0,0 +1,105 @@
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from backend.app.core_ai.processing.feature_extractor import FeatureExtractor, FEATURE_NAMES
+
+
+class Landmark:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.z = 0.0
+        self.visibility = 0.9
+
+
+# ------------------ REFERENCE ------------------
+# The per-landmark extractor the vectorized one replaced, kept here as the
+# reference: a feature that reads a landmark past the end of the list is 0.0
+def _angle(a, b, c):
+    if a is None or b is None or c is None:
+        return 0.0
+    ba = (a.x - b.x, a.y - b.y)
+    bc = (c.x - b.x, c.y - b.y)
+    norms = math.hypot(*ba) * math.hypot(*bc)
+    if norms == 0:
+        return 0.0
+    return math.degrees(math.acos(max(-1.0, min(1.0, (ba[0] * bc[0] + ba[1] * bc[1]) / norms))))
+
+
+def _dist(a, b):
+    return 0.0 if a is None or b is None else math.hypot(a.x - b.x, a.y - b.y)
+
+
+def reference_features(landmarks):
+    lm = lambda idx: landmarks[idx] if idx < len(landmarks) else None
+    f = {
+        'left_knee_angle': _angle(lm(23), lm(25), lm(27)),
+        'right_knee_angle': _angle(lm(24), lm(26), lm(28)),
+        'left_hip_angle': _angle(lm(11), lm(23), lm(25)),
+        'right_hip_angle': _angle(lm(12), lm(24), lm(26)),
+        'left_elbow_angle': _angle(lm(11), lm(13), lm(15)),
+        'right_elbow_angle': _angle(lm(12), lm(14), lm(16)),
+        'left_body_angle': _angle(lm(11), lm(23), lm(27)),
+        'right_body_angle': _angle(lm(12), lm(24), lm(28)),
+        'shoulder_width': _dist(lm(11), lm(12)),
+        'hip_width': _dist(lm(23), lm(24)),
+        'torso_length': _dist(lm(11), lm(23)),
+    }
+    f['knee_avg'] = (f['left_knee_angle'] + f['right_knee_angle']) / 2
+    f['hip_avg'] = (f['left_hip_angle'] + f['right_hip_angle']) / 2
+    norm = f['torso_length'] if f['torso_length'] > 0 else 1.0
+
+    spine = 0.0
+    if lm(11) and lm(23):
+        sx, sy = lm(11).x - lm(23).x, lm(11).y - lm(23).y
+        spine = math.degrees(math.acos(max(-1.0, min(1.0, -sy / (math.hypot(sx, sy) + 1e-6)))))
+    f['spine_angle'] = spine
+    f['torso_lean'] = spine / 90.0
+    f['left_knee_lateral'] = (lm(25).x - lm(27).x) / norm if lm(25) and lm(27) else 0.0
+    f['right_knee_lateral'] = (lm(26).x - lm(28).x) / norm if lm(26) and lm(28) else 0.0
+    f['symmetry_score'] = abs(f['left_knee_angle'] - f['right_knee_angle'])
+    f['hip_depth'] = (lm(23).y - lm(25).y) / norm if lm(23) and lm(25) else 0.0
+    return f
+
+
+# ------------------ CHECK ------------------
+def run(poses, seed):
+    rng = np.random.default_rng(seed)
+    # Every feature alone (with its dependencies) and the full set
+    extractors = [FeatureExtractor()] + [FeatureExtractor([name]) for name in FEATURE_NAMES]
+
+    mismatches = {}
+    for _ in range(poses):
+        points = [Landmark(*rng.random(2)) for _ in range(33)]
+        for count in range(1, 34):
+            landmarks = points[:count]
+            expected = reference_features(landmarks)
+            for extractor in extractors:
+                for name, value in extractor.extract_features(landmarks).items():
+                    err = abs(value - expected[name])
+                    if err > 1e-9:
+                        mismatches[(count, name)] = max(err, mismatches.get((count, name), 0.0))
+
+    print(f"{poses} poses x 33 list lengths x {len(extractors)} feature selections")
+    if mismatches:
+        for (count, name), err in sorted(mismatches.items())[:20]:
+            print(f"  {count:>2} landmarks  {name:<20} |Δ| = {err:.3g}")
+        print(f"❌ {len(mismatches)} (length, feature) pairs differ from the reference")
+        sys.exit(1)
+    print("✅ All features match the per-landmark reference")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the vectorized FeatureExtractor against the per-landmark reference")
+    parser.add_argument("--poses", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.poses, args.seed)
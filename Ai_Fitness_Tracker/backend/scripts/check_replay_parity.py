@@ -0,0 +1,87 @@
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from backend.app.core_ai.pose.pose_frame import PoseFrame
+from backend.app.core_ai.replay import EVALUATORS, ReplayRecorder, rescore
+from backend.app.core_ai.warmup import synthetic_pose
+
+WIDTH, HEIGHT = 640, 480
+
+
+# ------------------ SYNTHETIC SESSIONS ------------------
+def fast_squats(t, rate):
+    """Squat `rate` times a second: standing to full depth and back."""
+    return synthetic_pose(0.5 - 0.5 * math.cos(2 * math.pi * rate * t))
+
+
+def high_knees(t, rate):
+    """Alternate knees `rate` times a second, each lifted above its hip for a short moment."""
+    pose = synthetic_pose(0.0)
+    phase = (t * rate) % 2
+    side = 0 if phase < 1 else 1
+    lift = math.sin(math.pi * (phase % 1))
+    # Knee 25/26 goes from below the hip (0.7) to just above it (0.45)
+    pose[25 + side, 1] = 0.7 - 0.25 * lift
+    return pose
+
+
+SESSIONS = {
+    "squat": fast_squats,
+    "high_knees": high_knees,
+}
+
+
+# ------------------ CHECK ------------------
+def live_and_replayed(exercise, rate, seconds, fps, rng):
+    """Runs one synthetic session live (recording it), then rescores the recording."""
+    evaluator = EVALUATORS[exercise]()
+    recorder = ReplayRecorder(exercise, WIDTH, HEIGHT)
+    t, reps = 100.0, 0
+    end = t + seconds
+    while t < end:
+        points = SESSIONS[exercise](t, rate)
+        points[:, :2] += rng.normal(0, 0.002, size=(len(points), 2))
+        pose = PoseFrame(points, WIDTH, HEIGHT, t)
+        reps, _ = evaluator.update(pose)
+        recorder.add(pose)
+        # Jittered frame interval, as from a real camera
+        t += rng.uniform(0.7, 1.3) / fps
+
+    replay_data = recorder.to_json()
+    return reps, rescore(replay_data)["reps"], len(replay_data)
+
+
+def run(seconds, fps, seed):
+    rng = np.random.default_rng(seed)
+    print(f"{seconds:.0f}s synthetic sessions at ~{fps:.0f}fps\n")
+    print(f"{'exercise':<12} {'rate/s':>6} {'live':>6} {'rescored':>9} {'KB':>7}")
+
+    failed = False
+    for exercise in SESSIONS:
+        for rate in (0.5, 1.0, 2.0, 3.0):
+            live, replayed, size = live_and_replayed(exercise, rate, seconds, fps, rng)
+            mark = "" if live == replayed else "  ❌"
+            failed = failed or live != replayed
+            print(f"{exercise:<12} {rate:>6.1f} {live:>6} {replayed:>9} {size / 1024:>7.1f}{mark}")
+
+    if failed:
+        print("\n❌ Rescored reps differ from the live session")
+        sys.exit(1)
+    print("\n✅ Rescored reps match the live session")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that rescoring a recorded replay reproduces the live rep count")
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.seconds, args.fps, args.seed)
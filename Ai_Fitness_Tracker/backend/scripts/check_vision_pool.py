@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import the app
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+def run(pool_size, rounds, endpoint):
+    # Settings are read at import time
+    os.environ["POSE_SESSION_POOL_SIZE"] = str(pool_size)
+    os.environ["POSE_SESSION_ACQUIRE_TIMEOUT"] = "1"
+    os.environ["MODEL_WARMUP"] = "false"
+    os.environ["SERVICE_ROLE"] = "all"
+
+    from fastapi.testclient import TestClient
+    from app.core.config import settings
+    from app.main import app
+
+    connections = pool_size * rounds
+    busy = 0
+    with TestClient(app) as client:
+        for _ in range(connections):
+            with client.websocket_connect(f"{settings.API_V1_STR}{endpoint}") as websocket:
+                if endpoint == "/ws/session":
+                    message = websocket.receive_json()
+                    busy += message.get("type") == "busy"
+            # The endpoint releases its session once it sees the disconnect
+            time.sleep(0.05)
+
+        stats = client.get(f"{settings.API_V1_STR}/vision/stats").json()
+
+    print(f"{connections} connect/disconnect cycles on {endpoint} with a pool of {pool_size}")
+    print(f"  busy replies: {busy}, sessions in use after: {stats.get('sessions_in_use')}")
+    if busy or stats.get("sessions_in_use"):
+        print("❌ Pose sessions leaked on disconnect")
+        sys.exit(1)
+    print("✅ Every session went back to the pool")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Connect and disconnect vision sockets more times than the pool holds")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--endpoint", choices=("/ws/vision", "/ws/session"), default="/ws/vision")
+    args = parser.parse_args()
+
+    run(args.pool_size, args.rounds, args.endpoint)
@@ -0,0 +1,49 @@
+import argparse
+import os
+import pickle
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from backend.app.core_ai.processing.forest_compiler import CompiledForest
+
+PROCESSING_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../app/core_ai/processing"))
+DEFAULT_MODEL = os.path.join(PROCESSING_DIR, "squat_classifier.pkl")
+
+
+def load_model(path):
+    with open(path, "rb") as f:
+        obj = pickle.load(f)
+
+    # train_squat_model.py saves {"model": ..., "features": [...]}
+    if isinstance(obj, dict):
+        model = obj["model"]
+        features = obj.get("features")
+        if features is not None and getattr(model, "feature_names_in_", None) is None:
+            model.feature_names_in_ = list(features)
+        return model
+    return obj
+
+
+def export_forest(model_path, output_path=None):
+    output_path = output_path or os.path.splitext(model_path)[0] + ".npz"
+
+    model = load_model(model_path)
+    forest = CompiledForest.from_sklearn(model)
+    forest.save(output_path)
+
+    print(f"Trees: {forest.n_trees}  Nodes: {len(forest.feature)}  Max depth: {forest.max_depth}")
+    print(f"Classes: {list(forest.classes_)}")
+    print(f"Features: {forest.feature_names}")
+    print(f"✅ Compiled forest written to {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flatten a pickled RandomForest into a .npz tree evaluator")
+    parser.add_argument("model", nargs="?", default=DEFAULT_MODEL)
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args()
+
+    export_forest(args.model, args.output)
@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from backend.app.core_ai.model_assets import (
+    ASSETS, LOCKFILE, MODEL_CACHE_DIR, AssetChecksumError,
+    fetch_asset, import_asset, load_lock, pin_assets, verify_asset,
+)
+
+
+def cmd_list(args):
+    shipped, lock = load_lock(strict=True), load_lock()
+    print(f"Cache: {MODEL_CACHE_DIR}\n")
+    for name, asset in ASSETS.items():
+        path = asset.local_path() or "-"
+        if asset.key in shipped:
+            pinned = "pinned"
+        else:
+            pinned = "local" if asset.key in lock else "unpinned"
+        print(f"{asset.key:<34} {pinned:<9} {path}")
+
+
+def cmd_fetch(args):
+    failed = False
+    for name in args.names or list(ASSETS):
+        try:
+            path = fetch_asset(name, force=args.force, pin=args.trust)
+            print(f"✅ {name}: {path}")
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+            failed = True
+    return 1 if failed else 0
+
+
+def cmd_import(args):
+    try:
+        path = import_asset(args.name, args.path, pin=args.trust)
+    except AssetChecksumError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {args.name}: {path}")
+    return 0
+
+
+def cmd_verify(args):
+    lock = load_lock(args.strict)
+    failed = False
+    for name in args.names or list(ASSETS):
+        try:
+            status = verify_asset(name, lock, args.strict)
+        except AssetChecksumError as e:
+            status = f"MISMATCH ({e})"
+            failed = True
+        print(f"{name}: {status}")
+    return 1 if failed else 0
+
+
+def cmd_pin(args):
+    pinned = pin_assets(args.names or None)
+    for key, digest in pinned.items():
+        print(f"📌 {key}: {digest}")
+    print(f"\nWrote {len(pinned)} hashes to {LOCKFILE}; review and commit it")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-fetch and verify model assets for offline serving")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="Show registered assets and where they are installed")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("fetch", help="Download assets into the versioned cache")
+    p.add_argument("names", nargs="*", help="Asset names (default: all)")
+    p.add_argument("--force", action="store_true", help="Re-download even if cached")
+    p.add_argument("--trust", action="store_true",
+                   help="Record hashes for versions the shipped lockfile doesn't pin (this host only)")
+    p.set_defaults(func=cmd_fetch)
+
+    p = sub.add_parser("import", help="Install a file copied over by hand (air-gapped hosts)")
+    p.add_argument("name")
+    p.add_argument("path")
+    p.add_argument("--trust", action="store_true",
+                   help="Record a hash for a version the shipped lockfile doesn't pin (this host only)")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("verify", help="Check cached files against the lockfile")
+    p.add_argument("names", nargs="*", help="Asset names (default: all)")
+    p.add_argument("--strict", action="store_true", help="Fail on files the shipped lockfile doesn't pin")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("pin", help="Record the installed files' hashes in the shipped lockfile")
+    p.add_argument("names", nargs="*", help="Asset names (default: all installed)")
+    p.set_defaults(func=cmd_pin)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args) or 0)
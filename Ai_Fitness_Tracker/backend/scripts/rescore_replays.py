@@ -0,0 +1,76 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import the app
+sys.path.append(str(Path(__file__).parent.parent))
+from app.core_ai.replay import rescore
+
+
+def stored_replays(user_id=None, limit=None):
+    """(label, stored reps, replay_data) for workouts saved with replay_data, newest first."""
+    from app.db.database import SessionLocal
+    from app.db.models import WorkoutLog
+
+    db = SessionLocal()
+    try:
+        query = db.query(WorkoutLog).filter(WorkoutLog.replay_data.isnot(None))
+        if user_id is not None:
+            query = query.filter(WorkoutLog.user_id == user_id)
+        query = query.order_by(WorkoutLog.created_at.desc())
+        if limit:
+            query = query.limit(limit)
+        return [(f"workout {w.id}", w.reps, w.replay_data) for w in query.all()]
+    finally:
+        db.close()
+
+
+def file_replays(paths):
+    replays = []
+    for path in paths:
+        with open(path) as f:
+            replays.append((path, None, f.read()))
+    return replays
+
+
+def run(replays, exercise=None, as_json=False):
+    total_frames, total_seconds, failed = 0, 0.0, 0
+    for label, stored_reps, replay_data in replays:
+        started = time.perf_counter()
+        try:
+            summary = rescore(replay_data, exercise)
+        except (ValueError, KeyError) as e:
+            print(f"⚠️ {label}: {e}")
+            failed += 1
+            continue
+        elapsed = time.perf_counter() - started
+
+        total_frames += summary["frames"]
+        total_seconds += elapsed
+        summary["stored_reps"] = stored_reps
+        if as_json:
+            print(json.dumps({"source": label, **summary}))
+        else:
+            speedup = summary["duration"] / elapsed if elapsed else float("inf")
+            print(f"{label}: {summary}  ({elapsed * 1000:.1f} ms, {speedup:.0f}x real time)")
+
+    if total_seconds and not as_json:
+        print(f"\n{len(replays) - failed} replays, {total_frames} frames at {total_frames / total_seconds:.0f} frames/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score stored workout replay_data with the current exercise evaluators")
+    parser.add_argument("files", nargs="*", help="replay_data JSON files; reads the database when none are given")
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--exercise", help="score with this evaluator instead of the recorded exercise")
+    parser.add_argument("--json", action="store_true", help="one JSON summary per line")
+    args = parser.parse_args()
+
+    replays = file_replays(args.files) if args.files else stored_replays(args.user_id, args.limit)
+    if not replays:
+        print("No replays found.")
+        sys.exit(0)
+    run(replays, args.exercise, args.json)